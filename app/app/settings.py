@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -20,13 +22,23 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
 
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-cl*bih#f$a4y%ct-ikw(w4ynejbe%5nn$xn=0l(*1#y&#!!vm2'
-
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DEBUG', '0') == '1'
 
-ALLOWED_HOSTS = []
+# SECURITY WARNING: keep the secret key used in production secret!
+# Only development (DEBUG=1) falls back to a key that is not secret
+SECRET_KEY = os.environ.get('SECRET_KEY', '')
+if not SECRET_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured('Set SECRET_KEY or run with DEBUG=1.')
+    SECRET_KEY = 'django-insecure-cl*bih#f$a4y%ct-ikw(w4ynejbe%5nn$xn=0l(*1#y&#!!vm2'
+
+# Comma separated host names served, localhost is allowed with DEBUG=1
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('ALLOWED_HOSTS', '').split(',')
+    if host.strip()
+]
 
 
 # Application definition
@@ -38,6 +50,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'user',
     'core',
     'ethnic_group',
@@ -47,9 +60,11 @@ INSTALLED_APPS = [
     'publisher',
     'sites',
     'artifacts',
+    'search',
     'rest_framework',
     'rest_framework.authtoken',
     'drf_spectacular',
+    'django_filters',
     'corsheaders'
 ]
 
@@ -88,17 +103,88 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
+# DB_POOL_SIZE > 0 borrows connections from an in-process pool holding
+# that many idle connections (at most DB_POOL_MAX_SIZE open), otherwise
+# connections are kept open for DB_CONN_MAX_AGE seconds and reused by
+# the requests of the same thread. DB_CONN_HEALTH_CHECKS tests a reused
+# connection before its first use in a request.
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 0))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': (
+            'core.db.backends.postgresql_pool' if DB_POOL_SIZE
+            else 'core.db.backends.postgresql'),
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASS')
+        'PASSWORD': os.environ.get('DB_PASS'),
+        # pooled connections go back to the pool after each request
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE else int(
+            os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': (
+            os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1'),
+        'POOL_SIZE': DB_POOL_SIZE,
+        'POOL_MAX_SIZE': int(
+            os.environ.get('DB_POOL_MAX_SIZE', DB_POOL_SIZE)),
+        'POOL_TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+# memcached and redis hand OPTIONS to their client, their size is the
+# memory of the cache server
+if not any(server in CACHES['default']['BACKEND']
+           for server in ('memcached', 'redis')):
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 5000)),
+    }
+
+# Cache alias and lifetime (seconds) of cached list responses
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', 300))
+
+# Whether every process of the api uses the same cache. ETags are built
+# from model versions kept in the cache and are only sent when it is
+# shared, local memory only is for a single process such as runserver
+LOCAL_CACHE_BACKENDS = [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+]
+API_CACHE_SHARED = os.environ.get(
+    'API_CACHE_SHARED',
+    '0' if CACHES[API_CACHE_ALIAS]['BACKEND'] in LOCAL_CACHE_BACKENDS
+    else '1') == '1'
+
+# Verified tokens kept in memory by each process and for how long
+# (seconds), and the cache alias sharing them between processes (empty
+# to only keep them in memory)
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get('AUTH_TOKEN_CACHE_SIZE', 10000))
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.environ.get('AUTH_TOKEN_CACHE_TIMEOUT', 60))
+AUTH_TOKEN_CACHE_ALIAS = os.environ.get('AUTH_TOKEN_CACHE_ALIAS', '')
+
+# Tag autocomplete results kept in memory by each process and for how
+# long (seconds), any change to the tags expires them sooner
+TAG_AUTOCOMPLETE_CACHE_SIZE = int(
+    os.environ.get('TAG_AUTOCOMPLETE_CACHE_SIZE', 10000))
+TAG_AUTOCOMPLETE_CACHE_TIMEOUT = int(
+    os.environ.get('TAG_AUTOCOMPLETE_CACHE_TIMEOUT', 60))
+
+# Text search configuration used for the search vectors and queries
+SEARCH_CONFIG = os.environ.get('SEARCH_CONFIG', 'english')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -140,6 +226,14 @@ MEDIA_URL = '/static/media/'
 MEDIA_ROOT = '/vol/web/media'
 STATIC_ROOT = '/vol/web/static'
 
+# Widths (px) of the thumbnails generated for uploaded images and the
+# threads generating them, 0 generates them on the saving thread
+IMAGE_VARIANT_WIDTHS = [
+    int(width) for width in
+    os.environ.get('IMAGE_VARIANT_WIDTHS', '320,640,1280').split(',')
+]
+IMAGE_VARIANT_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', 2))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
@@ -149,8 +243,33 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 50)),
+    # orjson backed, with the same output (but for inf and NaN floats) and
+    # accepted input as DRF's
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Largest page size a client can request with ?page_size=
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 500))
+
+# Rows fetched per server side cursor round trip by the export actions
+API_EXPORT_CHUNK_SIZE = int(os.environ.get('API_EXPORT_CHUNK_SIZE', 2000))
+
+# Largest batch accepted by the bulk create/update endpoints
+API_BULK_MAX_ITEMS = int(os.environ.get('API_BULK_MAX_ITEMS', 5000))
+
+# Serve list responses from .values() rows instead of model instances
+API_LEAN_LISTS = os.environ.get('API_LEAN_LISTS', '1') == '1'
+
 # Allows to upload images through the browsable interface
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
@@ -21,6 +21,7 @@ from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
 )
+from core.views import CacheStatsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -36,6 +37,8 @@ urlpatterns = [
     path('api/publisher/', include('publisher.urls')),
     path('api/sites/', include('sites.urls')),
     path('api/artifacts/', include('artifacts.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
 ]
 
 
@@ -0,0 +1,24 @@
+"""
+Filters for the artifacts api
+"""
+import django_filters
+
+from core.choices import ARTIFACT_TYPE
+from core.models import Artifacts
+
+
+class ArtifactsFilter(django_filters.FilterSet):
+    """Filter artifacts by type, relations and significance ranges"""
+    artifact_type = django_filters.ChoiceFilter(choices=ARTIFACT_TYPE)
+    # ids are compared as they are, without loading the related rows
+    ethnic_group = django_filters.NumberFilter()
+    culture = django_filters.NumberFilter()
+    site = django_filters.NumberFilter()
+    historical_significance = django_filters.RangeFilter()
+    cultural_significance = django_filters.RangeFilter()
+
+    class Meta:
+        model = Artifacts
+        fields = [
+            'artifact_type', 'ethnic_group', 'culture', 'site',
+            'historical_significance', 'cultural_significance']
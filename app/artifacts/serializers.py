@@ -2,11 +2,15 @@
 Serializer for Artifacts
 """
 from rest_framework import serializers
+from core.bulk import BulkListSerializer, BulkPrimaryKeyRelatedField
+from core.images import schedule_variants
+from core.serializers import ImageVariantsField
 from core.models import Artifacts, ArtifactImages
 
 
 class ArtifactImagesSerializer(serializers.ModelSerializer):
     """Serializer for Artifacts Images"""
+    variants = ImageVariantsField(source='images')
 
     class Meta:
         model = ArtifactImages
@@ -35,10 +39,12 @@ class ArtifactsSerializer(serializers.ModelSerializer):
         artifact = Artifacts.objects.create(**validated_data)
 
         if images is not None:
-            ArtifactImages.objects.bulk_create(
+            created = ArtifactImages.objects.bulk_create(
                 [ArtifactImages(artifact=artifact,
                                 images=image_data) for image_data in images]
             )
+            schedule_variants(
+                (image.images.name for image in created), ArtifactImages)
 
         return artifact
 
@@ -58,3 +64,15 @@ class ArtifactsDetailsSerializer(ArtifactsSerializer):
         fields = ArtifactsSerializer.Meta.fields + [
             'description', 'artifact_type',
             'historical_significance', 'cultural_significance']
+
+
+class ArtifactsBulkSerializer(serializers.ModelSerializer):
+    """Serializer for creating or updating artifacts in bulk."""
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
+    class Meta:
+        model = Artifacts
+        fields = ['id', 'artifact_name', 'description', 'artifact_type',
+                  'historical_significance', 'cultural_significance']
+        read_only_fields = ['id']
+        list_serializer_class = BulkListSerializer
@@ -1,4 +1,9 @@
-from django.test import TestCase
+import json
+from base64 import b64encode
+from unittest.mock import patch
+from urllib.parse import urlencode
+from django.db import connections
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -16,6 +21,7 @@ import os
 
 
 ARTIFACTS_URL = reverse('artifacts:artifacts-list')
+BULK_URL = reverse('artifacts:artifacts-bulk-create')
 
 
 def create_artifact(user, **params):
@@ -117,7 +123,32 @@ class PrivateArtifactAPITests(TestCase):
 
         artifacts = Artifacts.objects.all().order_by('-id')
         serializer = ArtifactsSerializer(artifacts, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_list_query_count_is_constant(self):
+        """Test listing artifacts prefetches images in one query"""
+        for count in [2, 10]:
+            for _ in range(count):
+                artifact = create_artifact(user=self.user)
+                ArtifactImages.objects.create(
+                    artifact=artifact, images='uploads/test/artifact.jpg')
+
+            # one query each for the artifacts and images
+            with self.assertNumQueries(2):
+                res = self.client.get(ARTIFACTS_URL)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data['results'][0]['images']), 1)
+
+    def test_filter_by_artifact_type(self):
+        """Test filtering artifacts by type"""
+        tool = create_artifact(user=self.user)
+        create_artifact(user=self.user, artifact_type='jewelry')
+
+        res = self.client.get(ARTIFACTS_URL, {'artifact_type': 'tool'})
+
+        self.assertEqual(
+            [artifact['id'] for artifact in res.data['results']], [tool.id])
 
     def test_create_artifact(self):
         """Tests creating a base artifact"""
@@ -236,6 +267,138 @@ class PrivateArtifactAPITests(TestCase):
         self.assertEqual(payload['artifact_type'], artifact.artifact_type)
 
 
+class ArtifactsFilterTests(TestCase):
+    """Tests for filtering and ordering artifacts"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _ids(self, params):
+        """Return the ids listed with params"""
+        res = self.client.get(ARTIFACTS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        return [artifact['id'] for artifact in res.data['results']]
+
+    def test_filter_by_relations(self):
+        """Test filtering artifacts by ethnic group, culture and site"""
+        artifact = create_artifact(user=self.user)
+        create_artifact(user=self.user)
+
+        for name in ['ethnic_group', 'culture', 'site']:
+            related_id = getattr(artifact, f'{name}_id')
+            self.assertEqual(self._ids({name: related_id}), [artifact.id])
+
+    @override_settings(API_CACHE_SHARED=True)
+    def test_deleted_relation_changes_etag(self):
+        """Test deleting a related site changes the ETag of its artifacts"""
+        artifact = create_artifact(user=self.user)
+        params = {'site': artifact.site_id}
+        etag = self.client.get(ARTIFACTS_URL, params)['ETag']
+
+        # SET_NULL clears the artifacts without saving them
+        artifact.site.delete()
+        res = self.client.get(
+            ARTIFACTS_URL, params, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertNotEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_filter_by_significance_range(self):
+        """Test filtering artifacts by significance ranges"""
+        low = create_artifact(user=self.user, historical_significance=2)
+        high = create_artifact(user=self.user, historical_significance=9)
+
+        self.assertEqual(
+            self._ids({'historical_significance_min': 5}), [high.id])
+        self.assertEqual(
+            self._ids({'historical_significance_max': 5}), [low.id])
+
+    def test_invalid_filter(self):
+        """Test invalid filter values are rejected"""
+        res = self.client.get(ARTIFACTS_URL, {'artifact_type': 'vase'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_by_significance(self):
+        """Test ordering by significance, ties newest first"""
+        artifacts = [
+            create_artifact(user=self.user, cultural_significance=value)
+            for value in [3, 8, None, 8]
+        ]
+
+        self.assertEqual(
+            self._ids({'ordering': '-cultural_significance'}),
+            [artifacts[index].id for index in [3, 1, 0, 2]])
+        self.assertEqual(
+            self._ids({'ordering': 'cultural_significance'}),
+            [artifacts[index].id for index in [2, 0, 1, 3]])
+
+    def test_pages_of_ties(self):
+        """Test walking the pages of an ordering with ties"""
+        self._assert_pages_of_ties()
+
+    def test_pages_of_ties_without_row_values(self):
+        """Test pages compare column by column on other databases"""
+        with patch.object(connections['default'], 'vendor', 'sqlite'):
+            self._assert_pages_of_ties()
+
+    def _assert_pages_of_ties(self):
+        """Assert every page of artifacts with tied significances"""
+        artifacts = [
+            create_artifact(
+                user=self.user, historical_significance=number % 2)
+            for number in range(5)
+        ]
+        expected = [
+            artifact.id for artifact in sorted(
+                artifacts, key=lambda artifact: (
+                    artifact.historical_significance, artifact.id),
+                reverse=True)
+        ]
+
+        ids = []
+        params = {'ordering': '-historical_significance', 'page_size': 2}
+        res = self.client.get(ARTIFACTS_URL, params)
+        while True:
+            ids += [artifact['id'] for artifact in res.data['results']]
+            if res.data['next'] is None:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(ids, expected)
+        previous = self.client.get(res.data['previous'])
+        self.assertEqual(
+            [artifact['id'] for artifact in previous.data['results']],
+            expected[2:4])
+
+    def test_tampered_cursor(self):
+        """Test cursor values that don't fit their column are a 404"""
+        create_artifact(user=self.user)
+        position = urlencode({'p': json.dumps(['abc', '1'])})
+        params = {
+            'ordering': '-historical_significance',
+            'cursor': b64encode(position.encode()).decode(),
+        }
+
+        for vendor in ['postgresql', 'sqlite']:
+            with patch.object(connections['default'], 'vendor', vendor):
+                res = self.client.get(ARTIFACTS_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unknown_ordering(self):
+        """Test ordering by fields that aren't whitelisted is rejected"""
+        res = self.client.get(ARTIFACTS_URL, {'ordering': 'description'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', res.data)
+
+
 class ArtifactImageUploadTests(TestCase):
     """Tests for artifact image upload"""
     def setUp(self):
@@ -278,3 +441,97 @@ class ArtifactImageUploadTests(TestCase):
         res = self.client.patch(url, payload, format='multipart')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class BulkArtifactsAPITests(TestCase):
+    """Tests for bulk create and update of artifacts"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _payload(self, count):
+        """Return a batch of count new artifacts"""
+        return [
+            {'artifact_name': f'Pot {i}', 'artifact_type': 'tool'}
+            for i in range(count)
+        ]
+
+    def test_bulk_create(self):
+        """Test a batch is created in a constant number of queries"""
+        # insert and search vectors inside a savepoint
+        with self.assertNumQueries(4):
+            res = self.client.post(BULK_URL, self._payload(5), format='json')
+        with self.assertNumQueries(4):
+            self.client.post(BULK_URL, self._payload(50), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 5)
+        self.assertEqual(
+            Artifacts.objects.filter(user=self.user).count(), 55)
+        self.assertTrue(
+            Artifacts.objects.filter(search_vector='pot').exists())
+
+    def test_bulk_create_reports_item_errors(self):
+        """Test an invalid item fails the batch with per item errors"""
+        payload = self._payload(3)
+        payload[1]['artifact_type'] = 'spaceship'
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['errors'][0], {})
+        self.assertIn('artifact_type', res.data['errors'][1])
+        self.assertFalse(Artifacts.objects.exists())
+
+    def test_bulk_update(self):
+        """Test a batch of partial updates is written together"""
+        artifacts = [
+            Artifacts.objects.create(
+                user=self.user, artifact_name=f'Pot {i}',
+                artifact_type='tool')
+            for i in range(3)
+        ]
+        payload = [
+            {'id': artifact.id, 'description': f'Clay pot {i}'}
+            for i, artifact in enumerate(artifacts)
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        for i, artifact in enumerate(artifacts):
+            artifact.refresh_from_db()
+            self.assertEqual(artifact.description, f'Clay pot {i}')
+            self.assertEqual(artifact.artifact_name, f'Pot {i}')
+
+    def test_bulk_update_unknown_ids(self):
+        """Test missing, unknown and repeated ids are reported per item"""
+        artifact = Artifacts.objects.create(
+            user=self.user, artifact_name='Pot', artifact_type='tool')
+        payload = [
+            {'id': artifact.id, 'description': 'Clay pot'},
+            {'description': 'No id'},
+            {'id': artifact.id + 100},
+            {'id': artifact.id},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['errors'][0], {})
+        for error in res.data['errors'][1:]:
+            self.assertIn('id', error)
+        artifact.refresh_from_db()
+        self.assertEqual(artifact.description, '')
+
+    def test_bulk_rejects_non_lists(self):
+        """Test a payload that is not a list of items is rejected"""
+        res = self.client.post(
+            BULK_URL, {'artifact_name': 'Pot'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
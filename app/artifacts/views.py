@@ -1,28 +1,82 @@
 """
 View for artifact information
 """
+from django.db.models.functions import Coalesce
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from core.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from core.models import Artifacts
+from core.bulk import BulkMixin
+from core.cache import CachedListMixin
+from core.conditional import ConditionalMixin
+from core.dynamic_fields import DynamicFieldsMixin
+from core.export import ExportMixin
+from core.filters import KeysetOrderingFilter
+from core.lean import LeanListMixin
+from core.models import Artifacts, ArtifactImages, Culture, EthnicGroup, Site
+from core.query_plans import QueryPlanMixin
+from core.search import SearchMixin
 from artifacts import serializers
+from artifacts.filters import ArtifactsFilter
 
+from drf_spectacular.utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes,
+)
 
-class ArtifactsViewSet(viewsets.ModelViewSet):
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                description='Full text search query, results are ordered '
+                            'by relevance'
+            ),
+        ]
+    )
+)
+class ArtifactsViewSet(CachedListMixin,
+                       ConditionalMixin,
+                       QueryPlanMixin,
+                       SearchMixin,
+                       DynamicFieldsMixin,
+                       LeanListMixin,
+                       ExportMixin,
+                       BulkMixin,
+                       viewsets.ModelViewSet):
     """View for managing artifact information"""
+    cache_models = [Artifacts, ArtifactImages, EthnicGroup, Culture, Site]
     serializer_class = serializers.ArtifactsDetailsSerializer
     queryset = Artifacts.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, KeysetOrderingFilter]
+    filterset_class = ArtifactsFilter
+    ordering = '-id'
+    # missing significances sort below every score, see the
+    # artifacts_historical_idx and artifacts_cultural_idx
+    ordering_fields = {
+        'id': None,
+        'historical_significance': Coalesce('historical_significance', -1),
+        'cultural_significance': Coalesce('cultural_significance', -1),
+    }
 
     def get_queryset(self):
         """Returns artifact objects in descending order"""
-        return self.queryset.order_by('-id')
+        queryset = self.search_queryset(self.queryset)
+
+        return self.plan_queryset(queryset.order_by('-id'))
 
     def get_serializer_class(self):
         """Return a serializer class for the request"""
         if self.action == 'list':
             return serializers.ArtifactsSerializer
+        elif self.action in ('bulk_create', 'bulk_update'):
+            return serializers.ArtifactsBulkSerializer
 
         return self.serializer_class
 
@@ -0,0 +1,3 @@
+"""
+Benchmarks run against a configured database
+"""
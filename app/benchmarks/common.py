@@ -0,0 +1,41 @@
+"""
+Helpers shared by the benchmarks
+"""
+import os
+import statistics
+
+BENCH_EMAIL = 'bench@example.com'
+
+
+def setup_django():
+    """Configure django from the app settings."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    import django
+    django.setup()
+
+
+def bench_token():
+    """Return the token of the benchmark user, created if missing."""
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+
+    user = get_user_model().objects.filter(email=BENCH_EMAIL).first()
+    if user is None:
+        user = get_user_model().objects.create_user(
+            email=BENCH_EMAIL, password='benchpassword123')
+
+    return Token.objects.get_or_create(user=user)[0].key
+
+
+def print_header(name):
+    """Print the columns of the result rows."""
+    print(f'{name:<28} {"mean":>8} {"p50":>8} {"p95":>8} {"req/s":>8}')
+
+
+def print_row(name, latencies, elapsed):
+    """Print the latency in ms and throughput of a run."""
+    latencies = sorted(latency * 1000 for latency in latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f'{name:<28} {statistics.mean(latencies):>8.2f} '
+          f'{statistics.median(latencies):>8.2f} {p95:>8.2f} '
+          f'{len(latencies) / elapsed:>8.0f}')
@@ -0,0 +1,111 @@
+"""
+Per request latency of the database connection modes
+
+Run from the app folder against a migrated database:
+
+    python -m benchmarks.db_connections --requests 500 --threads 4
+
+Every mode is run in its own process with the DB_* environment of that
+mode. Requests go through the WSGI handler, so connections are opened and
+given back at request boundaries exactly as under a real server.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.common import (
+    bench_token,
+    print_header,
+    print_row,
+    setup_django)
+
+
+def get_modes(threads):
+    """Return the environment of each connection mode."""
+    return {
+        'new connection per request': {
+            'DB_CONN_MAX_AGE': '0', 'DB_CONN_HEALTH_CHECKS': '0',
+            'DB_POOL_SIZE': '0'},
+        'persistent': {
+            'DB_CONN_MAX_AGE': '600', 'DB_CONN_HEALTH_CHECKS': '0',
+            'DB_POOL_SIZE': '0'},
+        'persistent + health checks': {
+            'DB_CONN_MAX_AGE': '600', 'DB_CONN_HEALTH_CHECKS': '1',
+            'DB_POOL_SIZE': '0'},
+        'pool': {
+            'DB_CONN_HEALTH_CHECKS': '0', 'DB_POOL_SIZE': str(threads)},
+        'pool + health checks': {
+            'DB_CONN_HEALTH_CHECKS': '1', 'DB_POOL_SIZE': str(threads)},
+    }
+
+
+def run(path, requests, threads):
+    """Time requests to path in this process, return the latencies."""
+    setup_django()
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+
+    token = bench_token()
+    connections.close_all()
+    handler = WSGIHandler()
+
+    def request(_number):
+        environ = {
+            'PATH_INFO': path,
+            'HTTP_AUTHORIZATION': f'Token {token}',
+        }
+        setup_testing_defaults(environ)
+        started = time.perf_counter()
+        response = handler(environ, lambda status, headers: None)
+        b''.join(response)
+        # sends request_finished, giving the connection back
+        response.close()
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} answered {response.status_code}')
+
+        return time.perf_counter() - started
+
+    # warm up imports and url resolving
+    request(0)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(request, range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--path', default='/api/chief/chief/')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--worker', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        started = time.perf_counter()
+        latencies = run(args.path, args.requests, args.threads)
+        json.dump({'latencies': latencies,
+                   'elapsed': time.perf_counter() - started}, sys.stdout)
+        return
+
+    print(f'{args.requests} requests to {args.path} on '
+          f'{args.threads} thread(s), latency in ms')
+    print_header('mode')
+    for name, env in get_modes(args.threads).items():
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.db_connections', '--worker',
+             '--path', args.path, '--requests', str(args.requests),
+             '--threads', str(args.threads)],
+            env={**os.environ, **env}, check=True, capture_output=True,
+            text=True).stdout
+        result = json.loads(output)
+        print_row(name, result['latencies'], result['elapsed'])
+
+
+if __name__ == '__main__':
+    main()
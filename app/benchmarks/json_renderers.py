@@ -0,0 +1,90 @@
+"""
+Rendering and parsing time of JSONRenderer against ORJSONRenderer
+
+Run from the app folder, no database is needed:
+
+    python -m benchmarks.json_renderers --items 500
+
+Payloads are pages of artifacts, sites and chiefs as the serializers
+output them, so dates and Decimal coordinates are already strings.
+"""
+import argparse
+import datetime
+import io
+import timeit
+from decimal import Decimal
+
+from benchmarks.common import setup_django
+
+
+def get_payloads(items):
+    """Return a page of each resource as serializer output."""
+    from artifacts.serializers import ArtifactsBulkSerializer
+    from chief.serializers import ChiefDetailsSerializer
+    from core.models import Artifacts, Chief, Site
+    from sites.serializers import SiteBulkSerializer
+
+    artifacts = [
+        Artifacts(
+            id=pk, artifact_name=f'Basket {pk}', artifact_type='tool',
+            description='Woven from mokola palm leaves and dyed ' * 4,
+            historical_significance=pk % 10, cultural_significance=7)
+        for pk in range(items)
+    ]
+    sites = [
+        Site(
+            id=pk, site_name=f'Tsodilo {pk}', site_type='cultural',
+            latitude=Decimal('-18.750000') + Decimal(pk % 50) / 100,
+            longitude=Decimal('21.733333'),
+            description='San rock paintings ' * 4)
+        for pk in range(items)
+    ]
+    chiefs = [
+        Chief(
+            id=pk, name=f'Kgosi {pk}', type='paramount',
+            date_of_birth=datetime.date(1812, 1, 1) + datetime.timedelta(
+                days=pk), bio='Leader of the Bakwena ' * 4)
+        for pk in range(items)
+    ]
+
+    return {
+        'artifacts': ArtifactsBulkSerializer(artifacts, many=True).data,
+        'sites': SiteBulkSerializer(sites, many=True).data,
+        'chiefs': ChiefDetailsSerializer(chiefs, many=True).data,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core.parsers import ORJSONParser
+    from core.renderers import ORJSONRenderer
+
+    print(f'{args.items} items per page, ms per page')
+    print(f'{"payload":<12} {"render":>8} {"orjson":>8} '
+          f'{"parse":>8} {"orjson":>8}')
+    for name, data in get_payloads(args.items).items():
+        body = JSONRenderer().render(data)
+        assert ORJSONRenderer().render(data) == body
+        timings = [
+            timeit.timeit(
+                lambda: renderer().render(data), number=args.repeat)
+            for renderer in (JSONRenderer, ORJSONRenderer)
+        ] + [
+            timeit.timeit(
+                lambda: parser().parse(io.BytesIO(body)), number=args.repeat)
+            for parser in (JSONParser, ORJSONParser)
+        ]
+        print(f'{name:<12} ' + ' '.join(
+            f'{timing * 1000 / args.repeat:>8.2f}' for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
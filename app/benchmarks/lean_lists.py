@@ -0,0 +1,108 @@
+"""
+Serialization time of the list serializers against the lean serializers
+
+Run from the app folder against a migrated database:
+
+    python -m benchmarks.lean_lists --rows 10000
+
+The benchmark user is given --rows ethnic groups, with two tags each, and
+--rows sites when they have fewer. Both paths serialize every row and
+their rendered output is checked to be the same before timing.
+"""
+import argparse
+import time
+
+from benchmarks.common import BENCH_EMAIL, bench_token, setup_django
+
+
+def create_rows(user, rows):
+    """Create the missing ethnic groups and sites of the user."""
+    from core.models import EthnicGroup, Site, Tag
+
+    tags = [
+        Tag.objects.get_or_create(user=user, name=name)[0]
+        for name in ('Dance', 'Pottery')
+    ]
+    missing = rows - EthnicGroup.objects.filter(user=user).count()
+    if missing > 0:
+        groups = EthnicGroup.objects.bulk_create(
+            EthnicGroup(
+                user=user, name=f'Bakwena {number}', language='Setswana',
+                population=number, history='Settled at Molepolole')
+            for number in range(missing))
+        Through = EthnicGroup.tags.through
+        Through.objects.bulk_create(
+            Through(ethnicgroup_id=group.id, tag_id=tag.id)
+            for group in groups for tag in tags)
+
+    missing = rows - Site.objects.filter(user=user).count()
+    if missing > 0:
+        Site.objects.bulk_create(
+            Site(user=user, site_name=f'Tsodilo {number}',
+                 site_type='cultural')
+            for number in range(missing))
+
+
+def run(function, repeat):
+    """Return the best time of a function in ms."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from rest_framework.renderers import JSONRenderer
+
+    from core.lean import LeanSerializer
+    from core.models import EthnicGroup, Site
+    from ethnic_group.serializers import EthnicGroupSerializer
+    from sites.serializers import SiteSerializer
+
+    bench_token()
+    user = get_user_model().objects.get(email=BENCH_EMAIL)
+    create_rows(user, args.rows)
+
+    cases = {
+        'ethnic groups': (
+            EthnicGroupSerializer,
+            EthnicGroup.objects.filter(user=user).prefetch_related('tags')),
+        'sites': (
+            SiteSerializer,
+            Site.objects.filter(user=user).prefetch_related('images')),
+    }
+
+    print(f'{args.rows} rows, best of {args.repeat} in ms')
+    print(f'{"list":<16} {"serializer":>10} {"lean":>10} {"speedup":>8}')
+    for name, (serializer_class, queryset) in cases.items():
+        queryset = queryset.order_by('-id')[:args.rows]
+        lean = LeanSerializer(serializer_class())
+
+        def serializer():
+            return serializer_class(queryset.all(), many=True).data
+
+        def lean_serializer():
+            return lean.to_representation(lean.values(queryset.all()))
+
+        assert (JSONRenderer().render(serializer())
+                == JSONRenderer().render(lean_serializer()))
+        timings = [
+            run(function, args.repeat)
+            for function in (serializer, lean_serializer)
+        ]
+        print(f'{name:<16} {timings[0]:>10.1f} {timings[1]:>10.1f} '
+              f'{timings[0] / timings[1]:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
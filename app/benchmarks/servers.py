@@ -0,0 +1,124 @@
+"""
+Requests per second of runserver and gunicorn
+
+Run from the app folder against a migrated database:
+
+    python -m benchmarks.servers --seconds 20 --clients 16
+
+Each server is started on a local port with the settings of this
+environment, loaded for the given time by clients reusing keep-alive
+connections, then stopped. Both get the same database settings, so the
+difference is the server alone.
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import (
+    bench_token,
+    print_header,
+    print_row,
+    setup_django)
+
+
+def get_servers(port):
+    """Return the command starting each server on a port."""
+    address = f'127.0.0.1:{port}'
+    return {
+        'runserver': [
+            sys.executable, 'manage.py', 'runserver', '--noreload',
+            address],
+        'gunicorn': [
+            sys.executable, '-m', 'gunicorn', 'app.wsgi', '--bind',
+            address],
+    }
+
+
+def _get(connection, path, token):
+    """Send one request and return its status."""
+    connection.request(
+        'GET', path, headers={'Authorization': f'Token {token}'})
+    response = connection.getresponse()
+    response.read()
+
+    return response.status
+
+
+def wait_ready(port, path, token, timeout=30):
+    """Wait until the server answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if _get(http.client.HTTPConnection('127.0.0.1', port),
+                    path, token) == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError(f'Server on port {port} did not start.')
+
+
+def load(port, path, token, clients, seconds):
+    """Send requests from clients threads, return the latencies."""
+    latencies = []
+    deadline = time.monotonic() + seconds
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                status = _get(connection, path, token)
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                continue
+            if status != 200:
+                raise RuntimeError(f'{path} answered {status}')
+            latencies.append(time.perf_counter() - started)
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _client in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--path', default='/api/chief/chief/')
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    setup_django()
+    token = bench_token()
+
+    print(f'{args.clients} clients on {args.path} for {args.seconds}s, '
+          'latency in ms')
+    print_header('server')
+    env = {**os.environ, 'GUNICORN_ACCESS_LOG': ''}
+    for name, command in get_servers(args.port).items():
+        server = subprocess.Popen(
+            command, env=env, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(args.port, args.path, token)
+            started = time.perf_counter()
+            latencies = load(
+                args.port, args.path, token, args.clients, args.seconds)
+            print_row(name, latencies, time.perf_counter() - started)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Query time of the tag filters against joins on the tag links
+
+Run from the app folder against a migrated database:
+
+    python -m benchmarks.tag_filters --rows 100000
+
+The benchmark user is given --rows ethnic groups when it has fewer, and
+the groups are tagged with tags of decreasing frequency (50%, 20%, 5%
+and 0.5% of the groups). Each case times the first page of the list,
+ordered by the newest rows, and the count of every match, after checking
+both queries match the same rows.
+"""
+import argparse
+import random
+
+from benchmarks.common import BENCH_EMAIL, bench_token, setup_django
+from benchmarks.lean_lists import run
+
+# share of the groups linked to each benchmark tag
+TAG_SHARES = {
+    'Common': 0.5,
+    'Frequent': 0.2,
+    'Occasional': 0.05,
+    'Rare': 0.005,
+}
+
+
+def create_rows(user, rows):
+    """Create and tag the missing ethnic groups of the user."""
+    from core.models import EthnicGroup, Tag
+    from core.tags import refresh_tag_counts
+
+    tags = {
+        name: Tag.objects.get_or_create(user=user, name=name)[0]
+        for name in TAG_SHARES
+    }
+    missing = rows - EthnicGroup.objects.filter(user=user).count()
+    if missing > 0:
+        groups = EthnicGroup.objects.bulk_create(
+            (EthnicGroup(user=user, name=f'Bangwato {number}',
+                         population=number)
+             for number in range(missing)), batch_size=5000)
+        # the same tags on every run
+        shuffle = random.Random(0)
+        Through = EthnicGroup.tags.through
+        Through.objects.bulk_create(
+            (Through(ethnicgroup_id=group.id, tag_id=tags[name].id)
+             for group in groups for name, share in TAG_SHARES.items()
+             if shuffle.random() < share), batch_size=5000)
+        refresh_tag_counts(EthnicGroup, [tag.id for tag in tags.values()])
+
+    return tags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+
+    from core.models import EthnicGroup
+    from core.tags import filter_tags_all, filter_tags_any
+
+    bench_token()
+    user = get_user_model().objects.get(email=BENCH_EMAIL)
+    tags = create_rows(user, args.rows)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE core_ethnicgroup, core_ethnicgroup_tags')
+    groups = EthnicGroup.objects.filter(user=user)
+
+    def joined_all(names):
+        queryset = groups
+        for name in names:
+            queryset = queryset.filter(tags=tags[name])
+        return queryset
+
+    cases = {
+        'any Common,Frequent': (
+            groups.filter(tags__in=[tags['Common'], tags['Frequent']])
+            .distinct(),
+            filter_tags_any(groups, [tags['Common'].id,
+                                     tags['Frequent'].id])),
+        'any Occasional,Rare': (
+            groups.filter(tags__in=[tags['Occasional'], tags['Rare']])
+            .distinct(),
+            filter_tags_any(groups, [tags['Occasional'].id,
+                                     tags['Rare'].id])),
+        'all Common,Frequent': (
+            joined_all(['Common', 'Frequent']),
+            filter_tags_all(groups, [tags['Common'].id,
+                                     tags['Frequent'].id])),
+        'all Common,Rare': (
+            joined_all(['Common', 'Rare']),
+            filter_tags_all(groups, [tags['Common'].id, tags['Rare'].id])),
+        'all Common,Frequent,Occ.': (
+            joined_all(['Common', 'Frequent', 'Occasional']),
+            filter_tags_all(groups, [
+                tags[name].id
+                for name in ('Common', 'Frequent', 'Occasional')])),
+    }
+
+    print(f'{args.rows} rows, best of {args.repeat} in ms, join is the '
+          f'join (+ DISTINCT for any), filter the tag filter')
+    print(f'{"case":<26} {"matches":>8} {"page join":>10} '
+          f'{"page filter":>12} {"count join":>11} {"count filter":>13}')
+    for name, (joined, filtered) in cases.items():
+        joined = joined.order_by('-id')
+        filtered = filtered.order_by('-id')
+        assert (list(joined.values_list('id', flat=True))
+                == list(filtered.values_list('id', flat=True)))
+
+        timings = [
+            run(lambda queryset=queryset: list(
+                queryset.values_list('id', flat=True)[:args.page_size]),
+                args.repeat)
+            for queryset in (joined, filtered)
+        ] + [
+            run(queryset.count, args.repeat)
+            for queryset in (joined, filtered)
+        ]
+        print(f'{name:<26} {filtered.count():>8} {timings[0]:>10.1f} '
+              f'{timings[1]:>12.1f} {timings[2]:>11.1f} '
+              f'{timings[3]:>13.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -81,7 +81,19 @@ class PrivateChiefAPITests(TestCase):
         serializer = ChiefSerializer(chief, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_filter_current_chiefs(self):
+        """Test filtering current or former chiefs"""
+        current = create_chief(user=self.user)
+        former = Chief.objects.create(
+            user=self.user, name='Sechele I', is_current=False)
+
+        for value, chief in [('1', current), ('0', former)]:
+            res = self.client.get(CHIEF_URL, {'is_current': value})
+
+            self.assertEqual(
+                [item['id'] for item in res.data['results']], [chief.id])
 
     def test_create_chief(self):
         """Test create chief"""
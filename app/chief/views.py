@@ -2,22 +2,59 @@
 View for chief information
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from core.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from core.models import Chief
+from core.conditional import ConditionalMixin
+from core.dynamic_fields import DynamicFieldsMixin
+from core.export import ExportMixin
+from core.lean import LeanListMixin
+from core.query_plans import QueryPlanMixin
+from core.models import Chief, EthnicGroup, Tag
 from chief import serializers
+from ethnic_group.serializers import EthnicGroupSerializer
 
+from drf_spectacular.utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes,
+)
 
-class ChiefViewSet(viewsets.ModelViewSet):
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'is_current',
+                OpenApiTypes.INT, enum=[0, 1],
+                description='Filter by current or former chiefs'
+            ),
+        ]
+    )
+)
+class ChiefViewSet(ConditionalMixin,
+                   QueryPlanMixin,
+                   DynamicFieldsMixin,
+                   LeanListMixin,
+                   ExportMixin,
+                   viewsets.ModelViewSet):
     """View for managing chief information"""
+    # expanded ethnic groups show their tags
+    cache_models = [Chief, EthnicGroup, Tag]
     serializer_class = serializers.ChiefDetailsSerializer
+    expandable_fields = {'ethnic_group': EthnicGroupSerializer}
     queryset = Chief.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Returns chief objects"""
-        return self.queryset.order_by('-id')
+        queryset = self.queryset
+        is_current = self.request.query_params.get('is_current')
+        if is_current in ('0', '1'):
+            queryset = queryset.filter(is_current=is_current == '1')
+
+        return self.plan_queryset(queryset.order_by('-id'))
 
     def get_serializer_class(self):
         """Returns serializer class for the request"""
@@ -4,3 +4,31 @@ from django.apps import AppConfig # noqa
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        """Connect the core signal receivers to the models they handle."""
+        from django.db.models.signals import (
+            m2m_changed,
+            post_delete,
+            post_save,
+            pre_delete)
+        from core import signals
+
+        for model in self.get_models():
+            post_save.connect(
+                signals.invalidate_cached_responses, sender=model)
+            post_delete.connect(
+                signals.invalidate_cached_responses, sender=model)
+            for field in model._meta.local_many_to_many:
+                m2m_changed.connect(
+                    signals.invalidate_cached_relations,
+                    sender=field.remote_field.through)
+
+        for model in signals.TAGGED_MODELS:
+            m2m_changed.connect(
+                signals.count_tag_usage, sender=model.tags.through)
+            pre_delete.connect(signals.uncount_deleted_tagged, sender=model)
+        for model in signals.IMAGE_FIELDS:
+            post_save.connect(signals.generate_image_variants, sender=model)
+        for model in signals.SEARCHED_MODELS:
+            post_save.connect(signals.update_search_vector, sender=model)
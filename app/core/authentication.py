@@ -0,0 +1,103 @@
+"""
+Token authentication with cached token lookups
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+
+from core.lru import LRUCache
+
+# verified tokens of this process, key -> the values of the lookup
+_local_tokens = LRUCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def _shared_cache():
+    """Return the cache shared between processes, or None."""
+    if not settings.AUTH_TOKEN_CACHE_ALIAS:
+        return None
+
+    return caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+
+
+def _shared_key(key):
+    """Return the shared cache key of a token, not holding the token."""
+    return 'auth:token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def _values(instance, exclude=()):
+    """Return the column values of a model instance by attribute name."""
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in exclude
+    }
+
+
+def _from_values(model, values):
+    """Return a new instance of a model from its column values."""
+    # columns left out are deferred and read from the database on access
+    return model.from_db(DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+
+def invalidate_tokens(keys):
+    """Forget the cached lookups of tokens."""
+    keys = list(keys)
+    for key in keys:
+        _local_tokens.delete(key)
+
+    cache = _shared_cache()
+    if cache is not None and keys:
+        cache.delete_many([_shared_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication remembering verified tokens.
+
+    Lookups are served from a per process LRU, then from the cache named
+    by AUTH_TOKEN_CACHE_ALIAS if set, before the database is queried.
+    They expire AUTH_TOKEN_CACHE_TIMEOUT seconds after the database was
+    read. Deleting a token or saving its user (e.g. to deactivate it)
+    drops the lookup from the shared cache and the LRU of the process
+    doing it, other processes keep theirs until it expires.
+
+    Lookups are cached as column values, without the password hash, and
+    every request gets its own user and token built from them.
+    """
+
+    def _credentials(self, values):
+        """Return a new user and token from the values of a lookup."""
+        user_values, token_values = values
+        user = _from_values(get_user_model(), user_values)
+        token = _from_values(self.get_model(), token_values)
+        token.user = user
+
+        return user, token
+
+    def authenticate_credentials(self, key):
+        values = _local_tokens.get(key)
+        if values is not None:
+            return self._credentials(values)
+
+        cache = _shared_cache()
+        if cache is not None:
+            cached = cache.get(_shared_key(key))
+            if cached is not None:
+                values, expires = cached
+                _local_tokens.set(key, values, expires - time.time())
+                return self._credentials(values)
+
+        user, token = super().authenticate_credentials(key)
+        values = (_values(user, exclude={'password'}), _values(token))
+        timeout = settings.AUTH_TOKEN_CACHE_TIMEOUT
+        _local_tokens.set(key, values, timeout)
+        if cache is not None:
+            cache.set(
+                _shared_key(key), (values, time.time() + timeout), timeout)
+
+        return self._credentials(values)
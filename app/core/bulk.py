@@ -0,0 +1,198 @@
+"""
+Bulk create and update for the api's
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core.cache import invalidate
+from core.search import SEARCH_FIELDS, refresh_search_vectors
+
+# rows written per INSERT/UPDATE statement
+BULK_BATCH_SIZE = 1000
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Look up related rows preloaded by BulkListSerializer."""
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('bulk_related', {}).get(self.field_name)
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        model = self.get_queryset().model
+        try:
+            pk = model._meta.pk.to_python(data)
+        except (TypeError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        if pk not in preloaded:
+            self.fail('does_not_exist', pk_value=data)
+
+        return preloaded[pk]
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validate a batch of items with one query per related model.
+
+    Related rows named by any item are fetched together before the items
+    are validated, instead of one lookup per item and field. Serializers
+    opt in with Meta.list_serializer_class and serializer_related_field.
+    """
+
+    def _preload_related(self, data):
+        """Fetch the related rows referenced by the items."""
+        related = {}
+        for name, field in self.child.fields.items():
+            if field.read_only or not isinstance(
+                    field, BulkPrimaryKeyRelatedField):
+                continue
+
+            pk_field = field.get_queryset().model._meta.pk
+            pks = set()
+            for item in data:
+                if not isinstance(item, dict) or item.get(name) is None:
+                    continue
+                try:
+                    pks.add(pk_field.to_python(item[name]))
+                except (TypeError, DjangoValidationError):
+                    pass
+
+            related[name] = field.get_queryset().in_bulk(pks)
+
+        self.context['bulk_related'] = related
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self._preload_related(data)
+
+        return super().to_internal_value(data)
+
+
+class BulkMixin:
+    """
+    Create or partially update a batch of rows in one request.
+
+    POST .../bulk/ takes a list of items and PATCH .../bulk/ a list of
+    items with ids. The whole batch is validated first and per item
+    errors are returned together, nothing is written unless every item
+    is valid. Valid batches are written with bulk_create/bulk_update in
+    one transaction. Those send no model signals, so the work of the
+    signal receivers is done here once per batch.
+    """
+    # columns set by prepare_bulk_instance, always written on update
+    bulk_derived_fields = []
+
+    def prepare_bulk_instance(self, instance):
+        """Set derived columns of an instance before it is written."""
+
+    def _check_batch(self, data):
+        """Return an error response for malformed batches or None."""
+        if not isinstance(data, list) or not data:
+            return Response(
+                {'non_field_errors': ['Expected a non empty list of items.']},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        if len(data) > settings.API_BULK_MAX_ITEMS:
+            return Response(
+                {'non_field_errors': [
+                    f'At most {settings.API_BULK_MAX_ITEMS} items are '
+                    'accepted per request.']},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        return None
+
+    def _after_bulk_write(self, model, pks):
+        """Do the work of the post_save receivers for written rows."""
+        if model._meta.label_lower in SEARCH_FIELDS:
+            refresh_search_vectors(model.objects.filter(pk__in=pks))
+        invalidate(model)
+
+    @action(methods=['POST'], detail=False, url_path='bulk')
+    def bulk_create(self, request):
+        """Create a batch of rows."""
+        error = self._check_batch(request.data)
+        if error is not None:
+            return error
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(
+                {'errors': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        instances = [
+            model(user=request.user, **attrs)
+            for attrs in serializer.validated_data
+        ]
+        for instance in instances:
+            self.prepare_bulk_instance(instance)
+
+        with transaction.atomic():
+            model.objects.bulk_create(instances, batch_size=BULK_BATCH_SIZE)
+            self._after_bulk_write(
+                model, [instance.pk for instance in instances])
+
+        return Response(
+            self.get_serializer(instances, many=True).data,
+            status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Partially update a batch of rows picked by id."""
+        error = self._check_batch(request.data)
+        if error is not None:
+            return error
+
+        id_errors = [{} for _item in request.data]
+        ids = []
+        for index, item in enumerate(request.data):
+            try:
+                pk = int(item['id'])
+            except (KeyError, TypeError, ValueError):
+                id_errors[index] = {'id': ['A valid id is required.']}
+                pk = None
+            if pk is not None and pk in ids:
+                id_errors[index] = {'id': [f'Duplicate id: {pk}.']}
+            ids.append(pk)
+
+        instances = self.get_queryset().in_bulk(
+            [pk for pk in ids if pk is not None])
+        for index, pk in enumerate(ids):
+            if pk is not None and pk not in instances:
+                id_errors[index] = {'id': [f'Not found: {pk}.']}
+
+        serializer = self.get_serializer(
+            data=request.data, many=True, partial=True)
+        errors = id_errors
+        if not serializer.is_valid():
+            errors = [
+                {**id_error, **item_error}
+                for id_error, item_error in zip(id_errors, serializer.errors)
+            ]
+        if any(errors):
+            return Response(
+                {'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        fields = set(self.bulk_derived_fields)
+        updated = []
+        for pk, attrs in zip(ids, serializer.validated_data):
+            instance = instances[pk]
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+            self.prepare_bulk_instance(instance)
+            updated.append(instance)
+
+        with transaction.atomic():
+            model.objects.bulk_update(
+                updated, fields, batch_size=BULK_BATCH_SIZE)
+            self._after_bulk_write(model, ids)
+
+        return Response(self.get_serializer(updated, many=True).data)
@@ -0,0 +1,157 @@
+"""
+Response cache for read heavy list endpoints
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.conditional import conditional_response
+
+# response headers stored with the cached data
+CACHED_HEADERS = ['ETag']
+
+
+def get_cache():
+    """Return the cache backend used for api responses."""
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _version_key(model):
+    """Return the cache key holding the version of a model."""
+    return f'api:version:{model._meta.label_lower}'
+
+
+def _incr(cache, key, initial=1):
+    """Increment a counter, creating it when it is missing."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, initial, None)
+        return initial
+
+
+def get_versions(models):
+    """Return the current version of each model."""
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # a fresh value so entries cached under an evicted
+            # version can never be served again
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def _bump_version(model):
+    """Move a model to a new version."""
+    _incr(get_cache(), _version_key(model), initial=time.time_ns())
+
+
+def invalidate(model, after_commit=True):
+    """
+    Expire every cached response built from a model.
+
+    Pass after_commit=False outside of database work, e.g. on a worker
+    thread, to only bump the version without touching the connection.
+    """
+    _bump_version(model)
+    if after_commit:
+        # bump again once the change is visible to other connections, so
+        # a response built from the old rows in between is not served
+        transaction.on_commit(lambda: _bump_version(model))
+    _incr(
+        get_cache(), f'api:stats:invalidations:{model._meta.label_lower}')
+
+
+def record(event):
+    """Count a cache hit or miss."""
+    _incr(get_cache(), f'api:stats:{event}')
+
+
+def get_stats(models):
+    """Return hit, miss and invalidation counts for the api cache."""
+    cache = get_cache()
+    labels = [model._meta.label_lower for model in models]
+    keys = ['api:stats:hits', 'api:stats:misses'] + [
+        f'api:stats:invalidations:{label}' for label in labels
+    ]
+    counts = cache.get_many(keys)
+    hits = counts.get('api:stats:hits', 0)
+    misses = counts.get('api:stats:misses', 0)
+    lookups = hits + misses
+
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / lookups if lookups else 0.0,
+        'timeout': settings.API_CACHE_TIMEOUT,
+        'invalidations': {
+            label: counts.get(f'api:stats:invalidations:{label}', 0)
+            for label in labels
+        },
+    }
+
+
+class CachedListMixin:
+    """
+    Serve list responses from the cache until their models change.
+
+    Entries are keyed on the endpoint, user, query params (including the
+    page cursor) and the versions of cache_models. Saving or deleting any
+    of those models bumps its version, see core.signals.
+    """
+    cache_models = []
+
+    def get_cache_key(self, request):
+        """Return the cache key for the list request."""
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        parts = [
+            self.basename,
+            request.get_host(),
+            str(request.user.pk),
+            repr(params),
+            repr(get_versions(self.cache_models)),
+        ]
+        digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+        return f'api:list:{self.basename}:{digest}'
+
+    def list(self, request, *args, **kwargs):
+        """Return the cached list response or build and cache it."""
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+
+        if entry is not None:
+            record('hits')
+            data, headers = entry
+            response = Response(data, headers=headers)
+            response['X-Cache'] = 'HIT'
+            return conditional_response(request, response)
+
+        record('misses')
+        response = super().list(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            headers = {
+                header: response[header]
+                for header in CACHED_HEADERS if header in response
+            }
+            cache.set(
+                key, (response.data, headers), settings.API_CACHE_TIMEOUT)
+
+        response['X-Cache'] = 'MISS'
+        return response
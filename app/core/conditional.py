@@ -0,0 +1,101 @@
+"""
+Conditional GET support for the api's
+"""
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """Return a strong ETag built from parts."""
+    raw = '|'.join(str(part) for part in parts)
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+def set_validators(response, etag):
+    """Add the ETag header to a response."""
+    response['ETag'] = etag
+
+
+def conditional_response(request, response=None, etag=None):
+    """
+    Return a 304 response when the client's copy is still current.
+
+    When a response is given its ETag header is the validator and it is
+    returned unchanged if it does not match. Otherwise None is returned
+    so the caller can build the response.
+    """
+    if response is not None:
+        return get_conditional_response(
+            request, etag=response.get('ETag'), response=response)
+
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        set_validators(not_modified, etag)
+
+    return not_modified
+
+
+class ConditionalMixin:
+    """
+    Send an ETag on list and detail responses.
+
+    If-None-Match is checked before anything is queried or serialized.
+    The ETags are built from the versions of cache_models, the view's
+    model and every model its responses show, which are bumped whenever
+    one of their rows is saved or deleted (see core.cache). Writes that
+    send no signals of the shown model, such as SET_NULL cascades from a
+    deleted relation, still change the version of the deleted model.
+
+    The versions must be shared by every process, so ETags are only sent
+    when API_CACHE_SHARED is set, e.g. with a memcached cache backend.
+
+    No Last-Modified is sent and If-Modified-Since is not supported.
+    """
+    cache_models = []
+
+    def get_validator_versions(self):
+        """Return the versions the responses of the view depend on."""
+        # core.cache imports this module for conditional_response
+        from core.cache import get_versions
+
+        return get_versions(self.cache_models or [self.queryset.model])
+
+    def list(self, request, *args, **kwargs):
+        """List objects unless the client's copy is current."""
+        if not settings.API_CACHE_SHARED:
+            return super().list(request, *args, **kwargs)
+
+        etag = make_etag(
+            self.basename, request.user.pk, request.get_full_path(),
+            *self.get_validator_versions())
+
+        not_modified = conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        set_validators(response, etag)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve an object unless the client's copy is current."""
+        if not settings.API_CACHE_SHARED:
+            return super().retrieve(request, *args, **kwargs)
+
+        # permissions and missing rows are checked before answering 304
+        instance = self.get_object()
+        etag = make_etag(
+            self.basename, request.user.pk, request.get_full_path(),
+            *self.get_validator_versions())
+
+        not_modified = conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        set_validators(response, etag)
+        return response
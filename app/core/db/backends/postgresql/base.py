@@ -0,0 +1,46 @@
+"""
+PostgreSQL backend with health checks for persistent connections
+"""
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Check a reused connection before its first use in a request.
+
+    With CONN_MAX_AGE a connection outlives the request that opened it.
+    When the server drops it in the meantime (restart, failover, idle
+    timeout) the next request would fail on it. With CONN_HEALTH_CHECKS
+    set such connections are tested with a SELECT 1 and replaced. This is
+    the CONN_HEALTH_CHECKS setting of Django 4.1, the key is kept as is.
+    """
+    health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return bool(self.settings_dict.get('CONN_HEALTH_CHECKS'))
+
+    def connect(self):
+        # a new connection needs no check, set first as connect() itself
+        # goes through ensure_connection()
+        self.health_check_done = True
+        super().connect()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # called at request boundaries, check again on the next use
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        """Close the connection if the server no longer answers on it."""
+        if (self.connection is None or not self.health_check_enabled
+                or self.health_check_done or self.in_atomic_block):
+            return
+
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def ensure_connection(self):
+        self.close_if_health_check_failed()
+        super().ensure_connection()
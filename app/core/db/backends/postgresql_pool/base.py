@@ -0,0 +1,140 @@
+"""
+PostgreSQL backend taking its connections from an in-process pool
+"""
+import os
+import threading
+
+import psycopg2
+import psycopg2.extras
+from psycopg2 import pool as psycopg2_pool
+
+from django.db.backends.postgresql import creation
+
+from core.db.backends.postgresql import base
+
+# pools by (process, alias, connection parameters)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of psycopg2 connections.
+
+    Up to size idle connections are kept open, at most max_size are open
+    at once. psycopg2's pool raises as soon as it is exhausted, here the
+    caller waits up to timeout seconds for a connection to come back.
+    """
+
+    def __init__(self, size, max_size, timeout, conn_params):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._pool = psycopg2_pool.ThreadedConnectionPool(
+            size, max_size, **conn_params)
+
+    def getconn(self):
+        """Return an idle or new connection."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise psycopg2.OperationalError(
+                f'No connection available in the pool of {self.max_size} '
+                f'within {self.timeout}s.')
+        try:
+            return self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection, close=False):
+        """Give a connection back, rolling back an open transaction."""
+        try:
+            self._pool.putconn(connection, close=close)
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        """Close the pooled connections."""
+        self._pool.closeall()
+
+
+def get_pool(alias, settings_dict, conn_params):
+    """Return the pool of a database, created on first use."""
+    # a forked worker must not share the sockets of its parent
+    key = (os.getpid(), alias, repr(sorted(conn_params.items())))
+    with _pools_lock:
+        if key not in _pools:
+            size = settings_dict.get('POOL_SIZE', 10)
+            _pools[key] = ConnectionPool(
+                size,
+                max(settings_dict.get('POOL_MAX_SIZE') or size, size),
+                settings_dict.get('POOL_TIMEOUT', 30),
+                conn_params)
+
+        return _pools[key]
+
+
+def close_pools():
+    """Close the connections of every pool of this process."""
+    with _pools_lock:
+        for key in [key for key in _pools if key[0] == os.getpid()]:
+            _pools.pop(key).closeall()
+
+
+def _is_usable(connection):
+    """Return whether the server answers on a connection."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if not connection.autocommit:
+            connection.rollback()
+    except psycopg2.Error:
+        return False
+
+    return True
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # pooled connections would keep the test database in use
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Borrow a pooled connection for each request.
+
+    Use with CONN_MAX_AGE = 0: the connection goes back to the pool when
+    the request ends instead of being closed, and the next request on any
+    thread reuses it without a new handshake. With CONN_HEALTH_CHECKS set
+    an idle connection is tested before it is handed out.
+    """
+    creation_class = DatabaseCreation
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, self.settings_dict, conn_params)
+
+        for _attempt in range(self.pool.max_size + 1):
+            connection = self.pool.getconn()
+            if not self.health_check_enabled or _is_usable(connection):
+                break
+            self.pool.putconn(connection, close=True)
+        else:
+            raise psycopg2.OperationalError(
+                'No usable connection in the pool.')
+
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level)
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x)
+
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,133 @@
+"""
+Sparse fieldsets and expanded relations for the api's
+"""
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes
+from rest_framework.exceptions import ValidationError
+
+from core.models import EthnicGroup
+
+
+def _split_param(value):
+    """Return the names of a comma separated query param."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class DynamicFieldsSchema(AutoSchema):
+    """Document ?fields= and ?expand= on the actions that take them."""
+
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        view = self.view
+        if getattr(view, 'action', None) not in view.dynamic_fields_actions:
+            return parameters
+
+        parameters = parameters + [
+            OpenApiParameter(
+                view.fields_param,
+                OpenApiTypes.STR,
+                description='Comma separated list of the fields to return'
+            ),
+        ]
+        if view.expandable_fields:
+            parameters.append(OpenApiParameter(
+                view.expand_param,
+                OpenApiTypes.STR,
+                description='Comma separated list of the relations to '
+                            'return as objects: '
+                            + ', '.join(view.expandable_fields)
+            ))
+
+        return parameters
+
+
+class DynamicFieldsMixin:
+    """
+    Shape read responses with ?fields= and ?expand=.
+
+    ?fields=id,site_name returns only the named fields, on lists too they
+    may be any field of the detail serializer. ?expand=ethnic_group
+    returns a relation of expandable_fields as an object rather than its
+    id. The serializer is shaped before anything derives from it, so
+    views with a query plan only load the columns and prefetches of the
+    fields returned.
+
+    Expanded rows are prefetched from get_expand_queryset(), relations to
+    rows the user can't see through their own endpoint, e.g. another
+    user's ethnic group, are returned as null.
+    """
+    schema = DynamicFieldsSchema()
+
+    fields_param = 'fields'
+    expand_param = 'expand'
+    dynamic_fields_actions = ['list', 'retrieve']
+    # relations that can be expanded and the serializer class of each
+    expandable_fields = {}
+    # models whose rows are only shown to the user owning them
+    owned_models = [EthnicGroup]
+
+    def _get_names(self, param):
+        """Return the names requested in a query param."""
+        if self.action not in self.dynamic_fields_actions:
+            return []
+
+        return _split_param(self.request.query_params.get(param, ''))
+
+    def get_expand_queryset(self, model):
+        """Return the rows of a model relations may be expanded to."""
+        queryset = model.objects.all()
+        if model in self.owned_models:
+            queryset = queryset.filter(user=self.request.user)
+
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self._get_names(self.fields_param)
+        expand = self._get_names(self.expand_param)
+
+        serializer_class = self.get_serializer_class()
+        if fields and self.action == 'list':
+            # sparse lists pick from the fields of the detail serializer
+            serializer_class = self.serializer_class
+        kwargs.setdefault('context', self.get_serializer_context())
+        serializer = serializer_class(*args, **kwargs)
+
+        if fields or expand:
+            self._shape(getattr(serializer, 'child', serializer),
+                        fields, expand)
+
+        return serializer
+
+    def _shape(self, serializer, fields, expand):
+        """Expand and prune the fields of a serializer in place."""
+        readable = [
+            name for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+
+        unknown = [name for name in expand if name not in
+                   self.expandable_fields or name not in readable]
+        if unknown:
+            raise ValidationError({self.expand_param: (
+                f'Unknown relations: {", ".join(unknown)}. Expected any '
+                f'of: {", ".join(self.expandable_fields)}.')})
+
+        unknown = [name for name in fields if name not in readable]
+        if unknown:
+            raise ValidationError({self.fields_param: (
+                f'Unknown fields: {", ".join(unknown)}. Expected any '
+                f'of: {", ".join(readable)}.')})
+
+        for name in expand:
+            field = self.expandable_fields[name](read_only=True)
+            # read by the query plan, see core.query_plans
+            field.expand_queryset = self.get_expand_queryset(
+                field.Meta.model)
+            serializer.fields[name] = field
+
+        if fields:
+            # expanded relations are returned without being listed
+            keep = set(fields) | set(expand)
+            for name in list(serializer.fields):
+                if name not in keep:
+                    serializer.fields.pop(name)
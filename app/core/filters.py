@@ -0,0 +1,72 @@
+"""
+Filter backends shared by the api's
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+
+
+class KeysetOrderingFilter(OrderingFilter):
+    """
+    Order lists with ?ordering= on one whitelisted field.
+
+    ordering_fields maps each name clients may order by to the
+    expression rows are sorted on, or None for the column of that name.
+    The id breaks ties in the same direction, so KeysetPagination pages
+    on (value, id) rows and an index on the same expressions serves it.
+    Other names are rejected rather than ignored.
+    """
+    tie_breaker = 'id'
+
+    def _get_alias(self, name, view):
+        """Return the name rows are sorted on for an ordering field."""
+        if view.ordering_fields[name] is None:
+            return name
+
+        return f'{name}_order'
+
+    def get_ordering(self, request, queryset, view):
+        value = request.query_params.get(self.ordering_param, '').strip()
+        if not value:
+            return self.get_default_ordering(view)
+
+        name = value.lstrip('-')
+        if name not in view.ordering_fields or value.count('-') > 1:
+            allowed = ', '.join(view.ordering_fields)
+            raise ValidationError(
+                {self.ordering_param: f'Expected one of: {allowed}, '
+                                      f'optionally prefixed with "-".'})
+
+        prefix = '-' if value.startswith('-') else ''
+        alias = self._get_alias(name, view)
+        if alias == self.tie_breaker:
+            return (prefix + alias,)
+
+        return (prefix + alias, prefix + self.tie_breaker)
+
+    def filter_queryset(self, request, queryset, view):
+        annotations = {
+            self._get_alias(name, view): expression
+            for name, expression in view.ordering_fields.items()
+            if expression is not None
+        }
+        ordering = self.get_ordering(request, queryset, view)
+        used = {name.lstrip('-') for name in ordering}
+
+        return queryset.annotate(**{
+            alias: expression for alias, expression in annotations.items()
+            if alias in used
+        }).order_by(*ordering)
+
+    def get_schema_operation_parameters(self, view):
+        names = [
+            prefix + name
+            for name in view.ordering_fields for prefix in ('', '-')
+        ]
+        return [{
+            'name': self.ordering_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Field to order by, prefixed with "-" for '
+                           'descending order',
+            'schema': {'type': 'string', 'enum': names},
+        }]
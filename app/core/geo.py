@@ -0,0 +1,119 @@
+"""
+Geographic helpers for latitude/longitude columns
+"""
+import math
+
+from django.db.models import FloatField
+from django.db.models.functions import (
+    ASin,
+    Cast,
+    Cos,
+    Power,
+    Radians,
+    Sin,
+    Sqrt)
+
+# mean earth radius
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 2 * math.pi * EARTH_RADIUS_KM / 360
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+# stored geohash length, cells of roughly 4cm
+GEOHASH_PRECISION = 12
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return (min_lat, min_lng, max_lat, max_lng) around a circle."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    lng_delta = 180.0
+    if cos_lat > 1e-9:
+        lng_delta = min(lng_delta, radius_km / (KM_PER_DEGREE * cos_lat))
+
+    return (
+        max(latitude - lat_delta, -90.0),
+        max(longitude - lng_delta, -180.0),
+        min(latitude + lat_delta, 90.0),
+        min(longitude + lng_delta, 180.0),
+    )
+
+
+def within_bbox(queryset, min_lat, min_lng, max_lat, max_lng):
+    """Filter rows inside a box, using the (latitude, longitude) index."""
+    return queryset.filter(
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng)
+
+
+def haversine_km(latitude, longitude):
+    """Return an expression for the distance of each row to a point."""
+    lat1 = math.radians(latitude)
+    lng1 = math.radians(longitude)
+    lat2 = Radians(Cast('latitude', FloatField()))
+    lng2 = Radians(Cast('longitude', FloatField()))
+
+    a = (Power(Sin((lat2 - lat1) / 2), 2)
+         + math.cos(lat1) * Cos(lat2) * Power(Sin((lng2 - lng1) / 2), 2))
+
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Filter rows within radius_km of a point.
+
+    The bounding box narrows the rows through the index, the haversine
+    distance then drops the corners of the box.
+    """
+    queryset = within_bbox(
+        queryset, *bounding_box(latitude, longitude, radius_km))
+
+    return queryset.alias(
+        distance_km=haversine_km(latitude, longitude)
+    ).filter(distance_km__lte=radius_km)
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a point, or '' without coordinates."""
+    if latitude is None or longitude is None:
+        return ''
+
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        # bits alternate between longitude and latitude
+        value, bounds = (
+            (float(longitude), lng_range) if even
+            else (float(latitude), lat_range))
+        middle = (bounds[0] + bounds[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            bounds[0] = middle
+        else:
+            bits = bits * 2
+            bounds[1] = middle
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def zoom_to_precision(zoom):
+    """
+    Return the geohash length used to cluster a map zoom level.
+
+    A tile at zoom z spans 360 / 2**z degrees of longitude and a geohash
+    of length p spans 360 / 2**ceil(5p / 2), so this picks cells about a
+    quarter of a tile wide.
+    """
+    return min(max(math.ceil(2 * (zoom + 2) / 5), 1), GEOHASH_PRECISION)
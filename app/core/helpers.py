@@ -5,6 +5,7 @@ Helper functions
 import uuid
 import os
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from core import models
 import datetime
 from PIL import Image
@@ -16,19 +17,41 @@ def create_user(email, password):
     return get_user_model().objects.create_user(email, password)
 
 
-def _params_to_ints(qs):
-    """Convert a list of stings to integers"""
-    return [int(x) for x in qs.split(',')]
+def _get_or_create_tags(user, tags):
+    """Return the user's tags named in tags, creating missing ones."""
+    names = list(dict.fromkeys(tag['name'] for tag in tags))
+    if not names:
+        return []
 
+    tag_objects = list(models.Tag.objects.filter(user=user, name__in=names))
+    found = {tag.name for tag in tag_objects}
+    missing = [name for name in names if name not in found]
 
-def _get_or_create(user, tags, instance):
-    """Get or create a new tag."""
-    for tag in tags:
-        tag_object, created = models.Tag.objects.get_or_create(
-            user=user,
-            **tag
+    if missing:
+        # another request may create the same tags, the unique
+        # constraint on (user, name) makes those rows a no-op
+        models.Tag.objects.bulk_create(
+            [models.Tag(user=user, name=name) for name in missing],
+            ignore_conflicts=True
         )
-        instance.tags.add(tag_object)
+        tag_objects += models.Tag.objects.filter(
+            user=user, name__in=missing)
+
+    return tag_objects
+
+
+def _get_or_create(user, tags, instance):
+    """Get or create tags and add them to the instance."""
+    instance.tags.add(*_get_or_create_tags(user, tags))
+    return instance
+
+
+def _set_tags(user, tags, instance):
+    """Replace the instance tags, writing only the rows that changed."""
+    with transaction.atomic():
+        # set() diffs against the current tags and only removes and
+        # adds the difference, so resending the same tags writes nothing
+        instance.tags.set(_get_or_create_tags(user, tags))
     return instance
 
 
@@ -0,0 +1,181 @@
+"""
+Thumbnails and responsive variants of uploaded images
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+from core.cache import get_cache, invalidate
+
+logger = logging.getLogger(__name__)
+
+# variant file extension and the Pillow options used to write it
+VARIANT_FORMATS = {
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_formats():
+    """Return the variant extensions this Pillow build can write."""
+    return [
+        ext for ext in VARIANT_FORMATS
+        if ext != 'webp' or features.check('webp')
+    ]
+
+
+def variant_name(name, width, ext):
+    """Return the storage name of a variant of an image."""
+    stem = os.path.splitext(name)[0]
+    return f'{stem}_w{width}.{ext}'
+
+
+def _variants_key(name):
+    """Return the cache key recording the stored variants of an image."""
+    return 'api:variants:' + hashlib.md5(name.encode()).hexdigest()
+
+
+def _all_variants():
+    """Return the (width, extension) of every variant of an image."""
+    return [
+        (width, ext)
+        for width in settings.IMAGE_VARIANT_WIDTHS
+        for ext in get_formats()
+    ]
+
+
+def generate_variants(name, storage=default_storage):
+    """
+    Write the fixed width variants of a stored image.
+
+    Images are never upscaled, so variants wider than the original are
+    copies of it at its own size. Existing variants are kept, so running
+    this again for the same file is cheap. The stored variants are
+    recorded in the api cache for variant_urls.
+    """
+    wanted = [
+        (width, ext) for width, ext in _all_variants()
+        if not storage.exists(variant_name(name, width, ext))
+    ]
+    if not wanted:
+        get_cache().set(_variants_key(name), _all_variants(), None)
+        return []
+
+    with storage.open(name) as source:
+        original = ImageOps.exif_transpose(Image.open(source))
+        original.load()
+
+    written = []
+    for width, ext in wanted:
+        image = original.copy()
+        image.thumbnail((width, width * 100), Image.LANCZOS)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands()
+                                  else 'RGB')
+        if ext == 'jpg' and image.mode == 'RGBA':
+            image = image.convert('RGB')
+
+        image_format, options = VARIANT_FORMATS[ext]
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+        written.append(storage.save(
+            variant_name(name, width, ext), ContentFile(buffer.getvalue())))
+
+    get_cache().set(_variants_key(name), _all_variants(), None)
+    return written
+
+
+def _generate(name, model):
+    """Generate variants, logging instead of raising on bad files."""
+    try:
+        written = generate_variants(name)
+    except Exception:
+        logger.exception('Could not generate variants of %s', name)
+        return []
+
+    if written:
+        # responses built before listed the image without these variants,
+        # this thread writes no rows and must not hold a db connection
+        invalidate(model, after_commit=False)
+    return written
+
+
+def _get_executor():
+    """Return the shared worker pool, starting it on first use."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_VARIANT_WORKERS,
+                thread_name_prefix='image-variants')
+        return _executor
+
+
+def schedule_variants(names, model):
+    """Generate the variants of images of a model after the commit."""
+    names = [name for name in names if name]
+    if not names:
+        return
+
+    def submit():
+        if settings.IMAGE_VARIANT_WORKERS == 0:
+            for name in names:
+                _generate(name, model)
+            return
+
+        executor = _get_executor()
+        for name in names:
+            executor.submit(_generate, name, model)
+
+    transaction.on_commit(submit)
+
+
+def variant_urls(field_file, request=None):
+    """
+    Return the urls of a stored image's variants by width and format.
+
+    Variants are written after the upload commits, only those already
+    stored are listed so no url points to a missing file. They are read
+    from the record of generate_variants, the storage is only checked
+    for images it hasn't recorded (yet) and the answer kept for
+    API_CACHE_TIMEOUT seconds, or until the variants are generated.
+    """
+    if not field_file:
+        return None
+
+    storage = field_file.storage
+    key = _variants_key(field_file.name)
+    stored = get_cache().get(key)
+    if stored is None:
+        stored = [
+            (width, ext) for width, ext in _all_variants()
+            if storage.exists(variant_name(field_file.name, width, ext))
+        ]
+        # add, a record written meanwhile by the generator is newer
+        get_cache().add(key, stored, settings.API_CACHE_TIMEOUT)
+
+    stored = set(stored)
+    urls = {}
+    for width, ext in _all_variants():
+        if (width, ext) not in stored:
+            continue
+
+        url = storage.url(variant_name(field_file.name, width, ext))
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        urls.setdefault(str(width), {})[ext] = url
+
+    return urls
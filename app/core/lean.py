@@ -0,0 +1,201 @@
+"""
+Lean read path for list responses
+"""
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, FileField
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# fields whose to_representation returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+)
+
+# alias of the parent id selected with nested rows
+PARENT = 'lean_parent'
+
+
+class UnsupportedField(Exception):
+    """A serializer field the lean path can't produce."""
+
+
+def _convert(field, model_field):
+    """Return a function turning a column value into the field output."""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None
+    if isinstance(model_field, FileField):
+        # file fields read the FieldFile the model would hold
+        def convert(value):
+            return field.to_representation(
+                model_field.attr_class(None, model_field, value))
+
+        return convert
+    if type(field) in IDENTITY_FIELDS:
+        return None
+
+    return field.to_representation
+
+
+def _getter(column, convert):
+    """Return a function reading a field's output from a row."""
+    get = itemgetter(column)
+    if convert is None:
+        return get
+
+    def getter(row):
+        value = get(row)
+        return None if value is None else convert(value)
+
+    return getter
+
+
+class LeanSerializer:
+    """
+    Serialize .values() rows the way a ModelSerializer serializes rows.
+
+    The fields of the serializer are resolved once into the columns they
+    read and a function per field. Plain columns are copied, others go
+    through the field's own to_representation, so the output is the
+    same. Nested list serializers are compiled too and their rows are
+    fetched with one query per page. Fields with another source (methods,
+    dotted paths, '*') raise UnsupportedField.
+    """
+
+    def __init__(self, serializer):
+        self.model = serializer.Meta.model
+        self.pk = self.model._meta.pk.attname
+        self.columns = [self.pk]
+        self.getters = []
+        self.nested = []
+
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            self._compile(field)
+
+    def _compile(self, field):
+        if field.source == '*' or '.' in field.source:
+            raise UnsupportedField(field.field_name)
+        try:
+            model_field = self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise UnsupportedField(field.field_name)
+
+        if isinstance(field, serializers.ListSerializer):
+            if not isinstance(field.child, serializers.ModelSerializer):
+                raise UnsupportedField(field.field_name)
+            if model_field.many_to_many and model_field.concrete:
+                link = model_field.related_query_name()
+            elif model_field.many_to_many or model_field.one_to_many:
+                link = model_field.field.name
+            else:
+                raise UnsupportedField(field.field_name)
+            self.nested.append(
+                (field.field_name, LeanSerializer(field.child), link))
+            self.getters.append((field.field_name, None))
+            return
+
+        if (isinstance(field, serializers.BaseSerializer)
+                or not model_field.concrete or model_field.many_to_many):
+            raise UnsupportedField(field.field_name)
+
+        column = model_field.attname
+        if column not in self.columns:
+            self.columns.append(column)
+        self.getters.append(
+            (field.field_name, _getter(column, _convert(field, model_field))))
+
+    def _fetch_nested(self, link, parent_ids):
+        """Return the serialized rows of each parent."""
+        rows = list(self.model._default_manager.filter(
+            **{f'{link}__in': parent_ids}
+        ).values(*self.columns, **{PARENT: F(link)}))
+        items = self.to_representation(rows)
+
+        children = {}
+        for row, item in zip(rows, items):
+            children.setdefault(row[PARENT], []).append(item)
+
+        return children
+
+    def values(self, queryset, extra_columns=()):
+        """Return the queryset as rows of the columns read."""
+        return queryset.prefetch_related(None).values(
+            *self.columns,
+            *[column for column in extra_columns
+              if column not in self.columns])
+
+    def to_representation(self, rows):
+        """Serialize a list of rows."""
+        rows = list(rows)
+        nested = {}
+        if self.nested and rows:
+            parent_ids = [row[self.pk] for row in rows]
+            for key, lean, link in self.nested:
+                nested[key] = self._nested_getter(
+                    lean._fetch_nested(link, parent_ids))
+
+        getters = [
+            (key, nested.get(key, get)) for key, get in self.getters]
+
+        return [{key: get(row) for key, get in getters} for row in rows]
+
+    def _nested_getter(self, children):
+        """Return a function reading the nested rows of a row."""
+        pk = itemgetter(self.pk)
+
+        def getter(row):
+            return children.get(pk(row), [])
+
+        return getter
+
+
+class LeanListMixin:
+    """
+    Serve list actions from .values() rows and a LeanSerializer.
+
+    Model instances and the per field serializer machinery are skipped,
+    the response is the same as the list serializer's. Views whose list
+    serializer can't be compiled, or with API_LEAN_LISTS off, use the
+    regular list.
+    """
+
+    def get_lean_serializer(self):
+        """Return the compiled list serializer or None."""
+        if not settings.API_LEAN_LISTS:
+            return None
+        try:
+            return LeanSerializer(self.get_serializer())
+        except UnsupportedField:
+            return None
+
+    def _get_ordering_columns(self, queryset):
+        """Return the columns the paginator orders and cursors on."""
+        paginator = self.paginator
+        if paginator is None or not hasattr(paginator, 'get_ordering'):
+            return []
+
+        ordering = paginator.get_ordering(self.request, queryset, self)
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        return [column.lstrip('-') for column in ordering]
+
+    def list(self, request, *args, **kwargs):
+        lean = self.get_lean_serializer()
+        if lean is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = lean.values(queryset, self._get_ordering_columns(queryset))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(lean.to_representation(page))
+
+        return Response(lean.to_representation(rows))
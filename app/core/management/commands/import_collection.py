@@ -0,0 +1,337 @@
+"""
+Django command to import a collection from a manifest and image folder
+"""
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.cache import invalidate
+from core.helpers import _get_or_create_tags
+from core.images import generate_variants
+from core.models import (
+    ArtifactImages,
+    Artifacts,
+    Culture,
+    EthnicGroup,
+    Site,
+    SiteImages)
+from core.search import SEARCH_FIELDS, refresh_search_vectors
+from core.tags import refresh_tag_counts
+
+# row types in the order they are loaded, so references resolve
+ROW_TYPES = {
+    'ethnic_group': EthnicGroup,
+    'culture': Culture,
+    'site': Site,
+    'artifact': Artifacts,
+}
+
+# columns holding the ref of a row loaded earlier
+REFERENCES = {
+    'culture': ['ethnic_group'],
+    'site': ['ethnic_group', 'culture'],
+    'artifact': ['ethnic_group', 'culture', 'site'],
+}
+
+# image model and its link for types with a list of images
+IMAGE_MODELS = {
+    'site': (SiteImages, 'site'),
+    'artifact': (ArtifactImages, 'artifact'),
+}
+
+# manifest columns that are not model fields
+SPECIAL_COLUMNS = {'type', 'ref', 'tags', 'image', 'images'}
+
+
+def read_manifest(path):
+    """Yield the rows of a CSV or JSONL manifest as dicts."""
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as manifest:
+            yield from csv.DictReader(manifest)
+        return
+
+    with open(path, encoding='utf-8') as manifest:
+        for line in manifest:
+            if line.strip():
+                yield json.loads(line)
+
+
+def ingest_image(source, name):
+    """Copy an image into storage and generate its variants."""
+    with open(source, 'rb') as image:
+        name = default_storage.save(name, File(image))
+    generate_variants(name)
+
+    return name
+
+
+def _split(value):
+    """Return the items of a | separated column."""
+    if isinstance(value, list):
+        return value
+
+    return [item.strip() for item in (value or '').split('|')
+            if item.strip()]
+
+
+def _image_field(row_type):
+    """Return the model field storing the images of a row type."""
+    if row_type in IMAGE_MODELS:
+        return IMAGE_MODELS[row_type][0]._meta.get_field('images')
+
+    return ROW_TYPES[row_type]._meta.get_field('image')
+
+
+def _image_files(row_type, row):
+    """Return the image file names of a manifest row."""
+    if row_type in IMAGE_MODELS:
+        return _split(row.get('images'))
+
+    return _split(row.get('image'))[:1]
+
+
+class Command(BaseCommand):
+    """Django command to import a collection"""
+
+    help = (
+        'Import a CSV or JSONL manifest with a `type` column '
+        f'({", ".join(ROW_TYPES)}), an optional `ref` other rows refer to '
+        'and `image`/`images` file names relative to the images folder.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('manifest', help='CSV or JSONL manifest')
+        parser.add_argument(
+            '--images', default='.',
+            help='Folder the image file names are relative to')
+        parser.add_argument(
+            '--user', required=True,
+            help='Email of the user owning the imported rows')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows written per transaction')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Processes copying images, 0 copies them inline')
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file, defaults to <manifest>.checkpoint')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Skip the rows recorded in the checkpoint')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        try:
+            self.user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Unknown user {options["user"]}.')
+
+        self.manifest = options['manifest']
+        self.images = options['images']
+        self.batch_size = options['batch_size']
+        self.checkpoint_path = (
+            options['checkpoint'] or f'{self.manifest}.checkpoint')
+        self.state = self._load_checkpoint(options['resume'])
+
+        self.pool = None
+        if options['workers'] > 0:
+            self.pool = ProcessPoolExecutor(max_workers=options['workers'])
+
+        self.started = time.monotonic()
+        self.loaded = 0
+        try:
+            for row_type in ROW_TYPES:
+                self._import_type(row_type)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {self.loaded} rows in {elapsed:.1f}s '
+            f'({self.loaded / max(elapsed, 1e-9):.0f} rows/s)'))
+
+    def _load_checkpoint(self, resume):
+        """Return the saved progress, or a fresh one."""
+        state = {
+            'done': {row_type: 0 for row_type in ROW_TYPES},
+            'refs': {row_type: {} for row_type in ROW_TYPES},
+        }
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as checkpoint:
+                state = json.load(checkpoint)
+            self.stdout.write(
+                f'Resuming after {sum(state["done"].values())} rows')
+
+        return state
+
+    def _save_checkpoint(self):
+        """Record the progress once a batch is committed."""
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as checkpoint:
+            json.dump(self.state, checkpoint)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _import_type(self, row_type):
+        """Load the rows of one type in batches."""
+        skip = self.state['done'][row_type]
+        batch = []
+        seen = 0
+
+        for number, row in enumerate(read_manifest(self.manifest), start=1):
+            if row.get('type') not in ROW_TYPES:
+                raise CommandError(
+                    f'Row {number}: unknown type {row.get("type")}.')
+            if row['type'] != row_type:
+                continue
+            seen += 1
+            if seen <= skip:
+                continue
+
+            batch.append((number, row))
+            if len(batch) >= self.batch_size:
+                self._import_batch(row_type, batch)
+                batch = []
+
+        if batch:
+            self._import_batch(row_type, batch)
+
+    def _build(self, row_type, number, row):
+        """Return an unsaved instance for a manifest row."""
+        model = ROW_TYPES[row_type]
+        refs = self.state['refs']
+        attrs = {}
+
+        for column, value in row.items():
+            if column in SPECIAL_COLUMNS or value in ('', None):
+                continue
+            if column in REFERENCES.get(row_type, []):
+                if str(value) not in refs[column]:
+                    raise CommandError(
+                        f'Row {number}: unknown {column} ref {value}.')
+                attrs[f'{column}_id'] = refs[column][str(value)]
+            else:
+                attrs[column] = value
+
+        try:
+            instance = model(user=self.user, **attrs)
+            instance.full_clean(
+                exclude=['user', 'image', 'tags', *REFERENCES.get(
+                    row_type, [])],
+                validate_unique=False)
+        except (TypeError, ValidationError) as error:
+            raise CommandError(f'Row {number}: {error}')
+
+        if row_type == 'site':
+            instance.update_geohash()
+
+        return instance
+
+    def _ingest(self, jobs):
+        """Copy images on the pool, return the stored names in order."""
+        for source, _name in jobs:
+            if not os.path.isfile(source):
+                raise CommandError(f'Missing image {source}.')
+
+        if self.pool is None:
+            return [ingest_image(source, name) for source, name in jobs]
+
+        return list(self.pool.map(
+            ingest_image, *zip(*jobs), chunksize=8)) if jobs else []
+
+    def _import_batch(self, row_type, batch):
+        """Write one batch of rows and its images in a transaction."""
+        model = ROW_TYPES[row_type]
+        instances = [self._build(row_type, number, row)
+                     for number, row in batch]
+
+        # images are stored before the rows that point at them
+        field = _image_field(row_type)
+        files = [_image_files(row_type, row) for _number, row in batch]
+        jobs = [
+            (os.path.join(self.images, filename),
+             field.generate_filename(instance, filename))
+            for instance, filenames in zip(instances, files)
+            for filename in filenames
+        ]
+        names = iter(self._ingest(jobs))
+
+        image_rows = []
+        for instance, filenames in zip(instances, files):
+            stored = [next(names) for _filename in filenames]
+            if row_type in IMAGE_MODELS:
+                image_rows.append(stored)
+            elif stored:
+                instance.image = stored[0]
+
+        with transaction.atomic():
+            model.objects.bulk_create(instances)
+            self._write_images(row_type, instances, image_rows)
+            self._write_tags(model, instances, batch)
+            if model._meta.label_lower in SEARCH_FIELDS:
+                refresh_search_vectors(model.objects.filter(
+                    pk__in=[instance.pk for instance in instances]))
+
+        for instance, (_number, row) in zip(instances, batch):
+            if row.get('ref') not in ('', None):
+                self.state['refs'][row_type][str(row['ref'])] = instance.pk
+        self.state['done'][row_type] += len(batch)
+        self._save_checkpoint()
+        invalidate(model)
+
+        self.loaded += len(batch)
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            f'{row_type}: {self.state["done"][row_type]} rows '
+            f'({self.loaded / max(elapsed, 1e-9):.0f} rows/s)')
+
+    def _write_images(self, row_type, instances, image_rows):
+        """Create the image rows of sites and artifacts."""
+        if row_type not in IMAGE_MODELS:
+            return
+
+        image_model, link = IMAGE_MODELS[row_type]
+        image_model.objects.bulk_create([
+            image_model(**{link: instance, 'images': name})
+            for instance, names in zip(instances, image_rows)
+            for name in names
+        ])
+
+    def _write_tags(self, model, instances, batch):
+        """Tag ethnic groups and cultures with the `tags` column."""
+        if model not in (EthnicGroup, Culture):
+            return
+
+        names = {
+            instance.pk: _split(row.get('tags'))
+            for instance, (_number, row) in zip(instances, batch)
+        }
+        tags = {
+            tag.name: tag
+            for tag in _get_or_create_tags(self.user, [
+                {'name': name}
+                for row_names in names.values() for name in row_names
+            ])
+        }
+
+        through = model.tags.through
+        link = f'{model._meta.model_name}_id'
+        through.objects.bulk_create([
+            through(**{link: pk, 'tag_id': tags[name].pk})
+            for pk, row_names in names.items() for name in row_names
+        ], ignore_conflicts=True)
+        # bulk_create sends no m2m_changed, repeated names are skipped
+        refresh_tag_counts(model, [tag.pk for tag in tags.values()])
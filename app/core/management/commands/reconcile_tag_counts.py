@@ -0,0 +1,27 @@
+"""
+Django command to recount the usage of tags
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.tags import TAG_COUNT_FIELDS, refresh_tag_counts
+
+
+class Command(BaseCommand):
+    """Django command to repair drifted tag usage counts"""
+    help = 'Recount how many ethnic groups and cultures use each tag.'
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        for model in TAG_COUNT_FIELDS:
+            through = model._meta.get_field('tags').remote_field.through
+            with transaction.atomic(), connection.cursor() as cursor:
+                # links can't change while they are counted, tags can
+                cursor.execute(
+                    f'LOCK TABLE {through._meta.db_table} IN SHARE MODE')
+                fixed = refresh_tag_counts(model)
+
+            self.stdout.write(
+                f'{model._meta.verbose_name}: {fixed} tag counts fixed')
+
+        self.stdout.write(self.style.SUCCESS('Tag counts are reconciled'))
@@ -0,0 +1,39 @@
+# Generated by Django 4.0.10 on 2026-10-18 13:37
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    """Merge tags sharing a (user, name) pair into the oldest one."""
+    Tag = apps.get_model('core', 'Tag')
+    tagged_models = [
+        apps.get_model('core', 'EthnicGroup'),
+        apps.get_model('core', 'Culture'),
+    ]
+
+    duplicates = Tag.objects.values('user', 'name').annotate(
+        count=Count('id'), keep=Min('id')).filter(count__gt=1)
+
+    for duplicate in duplicates:
+        extra = Tag.objects.filter(
+            user=duplicate['user'],
+            name=duplicate['name']).exclude(id=duplicate['keep'])
+
+        for model in tagged_models:
+            for instance in model.objects.filter(tags__in=extra).distinct():
+                instance.tags.add(duplicate['keep'])
+
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_artifactimages'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_tags,
+                             migrations.RunPython.noop),
+    ]
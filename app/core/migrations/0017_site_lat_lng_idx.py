@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='site',
+            index=models.Index(fields=['latitude', 'longitude'], name='site_lat_lng_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.0.10 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+# a frozen copy of core.geo.geohash_encode, later changes to it must not
+# change what this migration writes
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 12
+
+
+def geohash_encode(latitude, longitude):
+    """Return the geohash of a point, or '' without coordinates."""
+    if latitude is None or longitude is None:
+        return ''
+
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < GEOHASH_PRECISION:
+        # bits alternate between longitude and latitude
+        value, bounds = (
+            (float(longitude), lng_range) if even
+            else (float(latitude), lat_range))
+        middle = (bounds[0] + bounds[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            bounds[0] = middle
+        else:
+            bits = bits * 2
+            bounds[1] = middle
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def backfill_geohash(apps, schema_editor):
+    """Compute the geohash of existing sites."""
+    Site = apps.get_model('core', 'Site')
+
+    sites = list(Site.objects.only('id', 'latitude', 'longitude'))
+    for site in sites:
+        site.geohash = geohash_encode(site.latitude, site.longitude)
+
+    Site.objects.bulk_update(sites, ['geohash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_site_lat_lng_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='site',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(backfill_geohash,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.0.10 on 2026-10-18 13:54
+
+import operator
+from functools import reduce
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# a frozen copy of core.search.SEARCH_FIELDS, later changes to it must
+# not change what this migration writes
+SEARCH_FIELDS = {
+    'core.ethnicgroup': [
+        ('name', 'A'), ('description', 'B'), ('history', 'C'),
+        ('language', 'D'), ('geography', 'D'),
+    ],
+    'core.culture': [('name', 'A'), ('description', 'B')],
+    'core.event': [('name', 'A'), ('description', 'B')],
+    'core.artifacts': [('artifact_name', 'A'), ('description', 'B')],
+}
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Compute the search vectors of existing rows."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for label, fields in SEARCH_FIELDS.items():
+        model = apps.get_model(label)
+        model.objects.using(schema_editor.connection.alias).update(
+            search_vector=reduce(operator.add, [
+                SearchVector(
+                    column, weight=weight, config=settings.SEARCH_CONFIG)
+                for column, weight in fields
+            ]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_site_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artifacts',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='culture',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ethnicgroup',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_search_vectors,
+                             migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='artifacts',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='artifacts_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='culture',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='culture_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ethnicgroup',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ethnicgroup_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.0.10 on 2026-10-18 14:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ethnicgroup',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='artifacts',
+            index=models.Index(fields=['artifact_type', '-id'], name='artifacts_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chief',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['-id'], name='chief_current_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ethnicgroup',
+            index=models.Index(fields=['user', '-id'], name='ethnicgroup_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_type', '-id'], name='event_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='site',
+            index=models.Index(fields=['site_type', '-id'], name='site_type_idx'),
+        ),
+    ]
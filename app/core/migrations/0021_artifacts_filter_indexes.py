@@ -0,0 +1,51 @@
+# Generated by Django 4.0.10 on 2026-10-18 14:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artifacts',
+            name='culture',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.culture'),
+        ),
+        migrations.AlterField(
+            model_name='artifacts',
+            name='ethnic_group',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.ethnicgroup'),
+        ),
+        migrations.AlterField(
+            model_name='artifacts',
+            name='site',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.site'),
+        ),
+        migrations.AddIndex(
+            model_name='artifacts',
+            index=models.Index(fields=['ethnic_group', '-id'], name='artifacts_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artifacts',
+            index=models.Index(fields=['culture', '-id'], name='artifacts_culture_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artifacts',
+            index=models.Index(fields=['site', '-id'], name='artifacts_site_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artifacts',
+            index=models.Index(django.db.models.expressions.OrderBy(django.db.models.functions.comparison.Coalesce('historical_significance', -1), descending=True), django.db.models.expressions.OrderBy(django.db.models.expressions.F('id'), descending=True), name='artifacts_historical_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artifacts',
+            index=models.Index(django.db.models.expressions.OrderBy(django.db.models.functions.comparison.Coalesce('cultural_significance', -1), descending=True), django.db.models.expressions.OrderBy(django.db.models.expressions.F('id'), descending=True), name='artifacts_cultural_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.0.10 on 2026-10-18 14:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tag_usage(apps, schema_editor):
+    """Fill the usage counts of the existing tags."""
+    Tag = apps.get_model('core', 'Tag')
+    counted = {
+        'ethnic_group_count': apps.get_model('core', 'EthnicGroup'),
+        'culture_count': apps.get_model('core', 'Culture'),
+    }
+
+    for column, model in counted.items():
+        through = model.tags.through
+        Tag.objects.update(**{column: Coalesce(Subquery(
+            through.objects.filter(tag=OuterRef('pk'))
+            .values('tag').annotate(count=Count('*')).values('count')), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_artifacts_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='culture_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='ethnic_group_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(condition=models.Q(('ethnic_group_count__gt', 0)), fields=['-name'], name='tag_group_assigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(condition=models.Q(('culture_count__gt', 0)), fields=['-name'], name='tag_culture_assigned_idx'),
+        ),
+        migrations.RunPython(count_tag_usage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.0.10 on 2026-10-18 14:49
+
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+# text_pattern_ops is an operator class of Postgres, other databases
+# only record the index in the migration state
+PREFIX_INDEX = models.Index(
+    models.F('user'), OpClass(Upper('name'), name='text_pattern_ops'),
+    name='tag_name_prefix_idx')
+
+
+def add_prefix_index(apps, schema_editor):
+    """Create the name prefix index on Postgres."""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('core', 'Tag'), PREFIX_INDEX)
+
+
+def remove_prefix_index(apps, schema_editor):
+    """Drop the name prefix index on Postgres."""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(
+            apps.get_model('core', 'Tag'), PREFIX_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_tag_usage_counts'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_prefix_index, remove_prefix_index),
+            ],
+            state_operations=[
+                migrations.AddIndex(model_name='tag', index=PREFIX_INDEX),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.0.10 on 2026-10-18 16:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_tag_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='artifacts',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='chief',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='culture',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='ethnicgroup',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='event',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='publisher',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='site',
+            name='updated_at',
+        ),
+    ]
@@ -1,11 +1,15 @@
 from django.db import models
+from django.db.models.functions import Coalesce, Upper
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import (
     AbstractBaseUser,
     PermissionsMixin
 )
 from .managers import UserManager
 from core.helpers import image_path, document_path
+from core.geo import geohash_encode, GEOHASH_PRECISION
 from .choices import (
     EVENT_TYPE_CHOICES,
     CHIEF_TYPE,
@@ -34,7 +38,9 @@ class User(AbstractBaseUser, PermissionsMixin):
 class EthnicGroup(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        # ethnicgroup_user_id_idx leads with the user
+        db_index=False
     )
     name = models.CharField(max_length=100)
     description = models.TextField()
@@ -44,9 +50,18 @@ class EthnicGroup(models.Model):
     history = models.TextField(blank=True)
     tags = models.ManyToManyField('Tag')
     image = models.ImageField(null=True, upload_to=image_path)
+    # maintained by core.signals, see core.search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name_plural = "Ethnic Groups"
+        indexes = [
+            GinIndex(fields=['search_vector'],
+                     name='ethnicgroup_search_idx'),
+            # lists are the user's groups, newest first
+            models.Index(fields=['user', '-id'],
+                         name='ethnicgroup_user_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -54,15 +69,52 @@ class EthnicGroup(models.Model):
 
 class Tag(models.Model):
     """Class representing tags"""
+    # usage counters are only changed with F() updates, see core.tags
+    COUNT_FIELDS = ['ethnic_group_count', 'culture_count']
+
     name = models.CharField(max_length=100)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
+    ethnic_group_count = models.PositiveIntegerField(default=0)
+    culture_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'],
+                name='unique_tag_name_per_user'),
+        ]
+        indexes = [
+            # ?assigned_only=1 lists, ordered by name
+            models.Index(fields=['-name'],
+                         condition=models.Q(ethnic_group_count__gt=0),
+                         name='tag_group_assigned_idx'),
+            models.Index(fields=['-name'],
+                         condition=models.Q(culture_count__gt=0),
+                         name='tag_culture_assigned_idx'),
+            # autocomplete of a user's tags, the operator class only
+            # exists on Postgres so migration 0023 skips it elsewhere
+            models.Index(models.F('user'),
+                         OpClass(Upper('name'), name='text_pattern_ops'),
+                         name='tag_name_prefix_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Save a tag without writing back stale usage counts."""
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNT_FIELDS
+            ]
+
+        super().save(*args, **kwargs)
+
 
 # Culture model
 class Culture(models.Model):
@@ -81,6 +133,12 @@ class Culture(models.Model):
     )
     tags = models.ManyToManyField('Tag')
     image = models.ImageField(null=True, upload_to=image_path)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='culture_search_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -100,6 +158,15 @@ class Event(models.Model):
         max_length=100,
         blank=True,
         choices=EVENT_TYPE_CHOICES)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='event_search_idx'),
+            # ?event_type= lists, newest first
+            models.Index(fields=['event_type', '-id'],
+                         name='event_type_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -139,6 +206,14 @@ class Chief(models.Model):
     is_current = models.BooleanField(default=True)
     bio = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            # ?is_current=1 lists, only a few chiefs of each group are
+            # current so the index stays small
+            models.Index(fields=['-id'], condition=models.Q(is_current=True),
+                         name='chief_current_idx'),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
@@ -184,10 +259,39 @@ class Site(models.Model):
         max_digits=9, decimal_places=6,
         default=1, blank=True, null=True)
     description = models.TextField(blank=True)
+    # prefixes of the geohash are the grid cells used to cluster sites
+    geohash = models.CharField(
+        max_length=GEOHASH_PRECISION, blank=True,
+        editable=False, db_index=True)
+
+    class Meta:
+        indexes = [
+            # bounding box and radius searches range over both columns
+            models.Index(fields=['latitude', 'longitude'],
+                         name='site_lat_lng_idx'),
+            # ?site_type= lists, newest first
+            models.Index(fields=['site_type', '-id'],
+                         name='site_type_idx'),
+        ]
 
     def __str__(self):
         return self.site_name
 
+    def update_geohash(self):
+        """Recompute the geohash from the coordinates."""
+        self.geohash = geohash_encode(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        """Keep the geohash in step with the coordinates."""
+        self.update_geohash()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and (
+                {'latitude', 'longitude'} & set(update_fields)):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+
+        super().save(*args, **kwargs)
+
 
 class SiteImages(models.Model):
     """Class representing site images"""
@@ -216,16 +320,41 @@ class Artifacts(models.Model):
         default=1, blank=True, null=True)
     cultural_significance = models.PositiveIntegerField(
         default=1, blank=True, null=True)
+    # the relations are indexed with the id, see Meta.indexes
     ethnic_group = models.ForeignKey(
         EthnicGroup,
-        on_delete=models.SET_NULL, null=True, blank=True)
+        on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
     culture = models.ForeignKey(
         Culture,
-        on_delete=models.SET_NULL, null=True, blank=True)
+        on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
     site = models.ForeignKey(
         Site,
-        on_delete=models.SET_NULL, null=True, blank=True
+        on_delete=models.SET_NULL, null=True, blank=True, db_index=False
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='artifacts_search_idx'),
+            # ?artifact_type= lists, newest first
+            models.Index(fields=['artifact_type', '-id'],
+                         name='artifacts_type_idx'),
+            # ?ethnic_group=, ?culture= and ?site= lists, newest first
+            models.Index(fields=['ethnic_group', '-id'],
+                         name='artifacts_group_idx'),
+            models.Index(fields=['culture', '-id'],
+                         name='artifacts_culture_idx'),
+            models.Index(fields=['site', '-id'],
+                         name='artifacts_site_idx'),
+            # ?ordering= by significance, the expressions ArtifactsViewSet
+            # orders on
+            models.Index(Coalesce('historical_significance', -1).desc(),
+                         models.F('id').desc(),
+                         name='artifacts_historical_idx'),
+            models.Index(Coalesce('cultural_significance', -1).desc(),
+                         models.F('id').desc(),
+                         name='artifacts_cultural_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.artifact_name
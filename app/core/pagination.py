@@ -0,0 +1,176 @@
+"""
+Pagination for the api's
+"""
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Field, Func, Q, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def _row(*expressions):
+    """Return a row value of expressions, compared column by column."""
+    return Func(*expressions, function='ROW', output_field=Field())
+
+
+def _expanded_row_condition(names, values, lookup_name):
+    """Return a row comparison spelled out column by column."""
+    # (a, b) < (x, y) is a < x OR (a = x AND b < y)
+    condition = Q()
+    for index, name in enumerate(names):
+        condition |= Q(**dict(zip(names[:index], values[:index])),
+                       **{f'{name}__{lookup_name}': values[index]})
+
+    return condition
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination on the descending primary key.
+
+    Pages are fetched with `WHERE id < <cursor>` instead of an OFFSET, so
+    deep pages cost the same as the first one. Cursors are opaque and the
+    page size can be set by the client up to API_MAX_PAGE_SIZE.
+
+    Orderings on several columns in the same direction, e.g. a score
+    with the id as tie breaker, keep the values of every column in the
+    cursor and compare them as a row, `WHERE (score, id) < (<cursor>)`,
+    which an index on the same columns answers directly. Databases
+    other than Postgres compare the columns one by one instead. These
+    pages are read and linked here, CursorPagination only positions
+    rows on their first column.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        """Return the view's own page ordering, e.g. by search rank."""
+        get_ordering = getattr(view, 'get_pagination_ordering', None)
+        ordering = get_ordering() if get_ordering is not None else None
+        if ordering:
+            return ordering
+
+        return super().get_ordering(request, queryset, view)
+
+    def _is_row_ordering(self, ordering):
+        """Return whether an ordering is paged on row positions."""
+        directions = {name.startswith('-') for name in ordering}
+        return len(ordering) > 1 and len(directions) == 1
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_ordering(request, queryset, view)
+        self.row_ordering = self._is_row_ordering(ordering)
+        if not self.row_ordering:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = ordering
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor and self.cursor.position
+
+        if reverse:
+            ordering = [
+                name[1:] if name.startswith('-') else f'-{name}'
+                for name in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after_row_position(
+                queryset, self.ordering, self.cursor))
+
+        # row orderings end with the id, positions are unique and pages
+        # need no offsets
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+        has_preceding = position is not None
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = has_preceding, has_following
+        else:
+            self.has_next, self.has_previous = has_following, has_preceding
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.row_ordering:
+            return super().get_next_link()
+
+        return self._row_link(self.has_next, -1, reverse=False)
+
+    def get_previous_link(self):
+        if not self.row_ordering:
+            return super().get_previous_link()
+
+        return self._row_link(self.has_previous, 0, reverse=True)
+
+    def _row_link(self, has_page, index, reverse):
+        """Return the link to the page after or before a row of the page."""
+        if not has_page:
+            return None
+
+        if self.page:
+            position = self._row_position(self.page[index])
+        else:
+            position = self.cursor.position
+
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=reverse, position=position))
+
+    def _row_position(self, row):
+        """Return the cursor position of a row, its ordering values."""
+        return json.dumps([
+            str(row[name] if isinstance(row, dict) else getattr(row, name))
+            for name in (name.lstrip('-') for name in self.ordering)
+        ])
+
+    def _ordering_field(self, queryset, name):
+        """Return the field of a column or annotation rows are ordered on."""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+
+        return queryset.model._meta.get_field(name)
+
+    def _after_row_position(self, queryset, ordering, cursor):
+        """Return the condition for rows following a row position."""
+        try:
+            values = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        names = [name.lstrip('-') for name in ordering]
+        try:
+            # cursors come from clients, values must fit their columns
+            values = [
+                self._ordering_field(queryset, name).to_python(value)
+                for name, value in zip(names, values)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+        lookup = LessThan
+        if cursor.reverse == ordering[0].startswith('-'):
+            lookup = GreaterThan
+
+        if connections[queryset.db].vendor != 'postgresql':
+            return _expanded_row_condition(names, values, lookup.lookup_name)
+
+        return lookup(
+            _row(*[F(name) for name in names]),
+            _row(*[Value(value) for value in values]))
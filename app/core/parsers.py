@@ -0,0 +1,43 @@
+"""
+Fast JSON parsing for the api's
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+from core.renderers import orjson, ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parse JSON with orjson, accepting what JSONParser accepts.
+
+    orjson is strict, documents it rejects are parsed again with the
+    standard library, so NaN (unless STRICT_JSON is set) and integers
+    over 64 bits still load and errors read the same as before.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read().decode(encoding)
+        except UnicodeDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(data, parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,82 @@
+"""
+Query plans derived from serializers
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _get_model_field(model, name):
+    """Return the model field called name or None."""
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def get_query_plan(serializer):
+    """Return the columns and prefetches a serializer reads."""
+    model = serializer.Meta.model
+    columns = [model._meta.pk.name]
+    prefetches = []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        name = field.source.split('.')[0]
+        model_field = _get_model_field(model, name)
+        if model_field is None:
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+            child_queryset = child.Meta.model.objects.all()
+            link = []
+            if model_field.one_to_many:
+                # reverse foreign keys are grouped on the link column
+                link = [model_field.field.name]
+            prefetches.append(Prefetch(
+                name,
+                queryset=apply_query_plan(child_queryset, child, link)))
+        elif isinstance(field, serializers.ModelSerializer):
+            # expanded relations load the columns their serializer reads,
+            # relations to rows outside expand_queryset are left as None
+            columns.append(name)
+            queryset = getattr(field, 'expand_queryset', None)
+            if queryset is None:
+                queryset = field.Meta.model.objects.all()
+            prefetches.append(Prefetch(
+                name, queryset=apply_query_plan(queryset, field)))
+        elif model_field.many_to_many or model_field.one_to_many:
+            prefetches.append(Prefetch(
+                name,
+                queryset=model_field.related_model.objects.only('pk')))
+        elif model_field.concrete:
+            columns.append(name)
+
+    return columns, prefetches
+
+
+def apply_query_plan(queryset, serializer, extra_columns=()):
+    """Load only the columns and relations a serializer reads."""
+    columns, prefetches = get_query_plan(serializer)
+
+    return queryset.only(
+        *columns, *extra_columns).prefetch_related(*prefetches)
+
+
+class QueryPlanMixin:
+    """Trim the querysets of read actions to what they serialize."""
+
+    query_plan_actions = ['list', 'retrieve']
+    # columns read outside the serializer, e.g. for validators
+    query_plan_columns = []
+
+    def plan_queryset(self, queryset):
+        """Apply the serializer query plan for the current action."""
+        if self.action not in self.query_plan_actions:
+            return queryset
+
+        return apply_query_plan(
+            queryset, self.get_serializer(), self.query_plan_columns)
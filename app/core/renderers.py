@@ -0,0 +1,64 @@
+"""
+Fast JSON rendering for the api's
+"""
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# UTF-8 of U+2028 and U+2029
+LINE_SEPARATOR = b'\xe2\x80\xa8'
+PARAGRAPH_SEPARATOR = b'\xe2\x80\xa9'
+
+# a number in exponent notation, orjson writes 1e16 where json writes 1e+16
+EXPONENT = re.compile(rb'[:\[,]-?\d+(?:\.\d+)?e')
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Render JSON with orjson, output matching JSONRenderer.
+
+    Dates and times are handed to DRF's encoder, so they are formatted
+    the same, as are Decimals and the other types orjson doesn't know.
+    Indented output, floats in exponent notation and data orjson rejects
+    (e.g. integers over 64 bits) go through JSONRenderer, as does
+    everything without orjson installed. Infinite and NaN floats are the
+    exception: orjson renders them as null where JSONRenderer raises.
+    """
+    encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (orjson is None or indent is not None or self.ensure_ascii
+                or not self.compact):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder.default,
+                option=(orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_PASSTHROUGH_DATETIME
+                        | orjson.OPT_PASSTHROUGH_DATACLASS))
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context)
+
+        if EXPONENT.search(ret):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+
+        # JSONRenderer escapes these to output a strict javascript subset
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(
+                PARAGRAPH_SEPARATOR, b'\\u2029')
+
+        return ret
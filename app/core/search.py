@@ -0,0 +1,135 @@
+"""
+Full text search for the api's
+"""
+import operator
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector)
+from django.db import connections
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast
+
+# searched columns of each model and their weight in the ranking
+SEARCH_FIELDS = {
+    'core.ethnicgroup': [
+        ('name', 'A'), ('description', 'B'), ('history', 'C'),
+        ('language', 'D'), ('geography', 'D'),
+    ],
+    'core.culture': [('name', 'A'), ('description', 'B')],
+    'core.event': [('name', 'A'), ('description', 'B')],
+    'core.artifacts': [('artifact_name', 'A'), ('description', 'B')],
+}
+
+# default weights of ts_rank, used to rank the fallback search as well
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+
+def get_search_fields(model):
+    """Return the (column, weight) pairs searched for a model."""
+    return SEARCH_FIELDS[model._meta.label_lower]
+
+
+def search_vector(model):
+    """Return the expression computing the search vector of a model."""
+    return reduce(operator.add, [
+        SearchVector(column, weight=weight, config=settings.SEARCH_CONFIG)
+        for column, weight in get_search_fields(model)
+    ])
+
+
+def refresh_search_vectors(queryset):
+    """Recompute the search vector of the rows in a queryset."""
+    if connections[queryset.db].vendor == 'postgresql':
+        queryset.update(search_vector=search_vector(queryset.model))
+
+
+class PostgresSearchEngine:
+    """Match the indexed search vector and rank with ts_rank."""
+
+    def search(self, queryset, query):
+        search_query = SearchQuery(
+            query, search_type='websearch', config=settings.SEARCH_CONFIG)
+
+        # ts_rank is a real, as a double the rank in a page cursor
+        # compares equal to the row it was read from
+        return queryset.annotate(search_rank=Cast(
+            SearchRank(F('search_vector'), search_query), FloatField()
+        )).filter(search_vector=search_query)
+
+
+class SimpleSearchEngine:
+    """
+    Match every word with icontains, for databases without full text
+    search. Rows are ranked by the weight of the best matching column.
+    """
+
+    def search(self, queryset, query):
+        fields = get_search_fields(queryset.model)
+
+        for word in query.split():
+            queryset = queryset.filter(reduce(operator.or_, [
+                Q(**{f'{column}__icontains': word})
+                for column, _weight in fields
+            ]))
+
+        return queryset.annotate(search_rank=Case(
+            *[
+                When(**{f'{column}__icontains': query},
+                     then=Value(WEIGHTS[weight]))
+                for column, weight in sorted(
+                    fields, key=lambda field: field[1])
+            ],
+            default=Value(WEIGHTS['D'] / 2),
+            output_field=FloatField(),
+        ))
+
+
+def get_search_engine(using='default'):
+    """Return the search engine for a database."""
+    if connections[using].vendor == 'postgresql':
+        return PostgresSearchEngine()
+
+    return SimpleSearchEngine()
+
+
+def search(queryset, query):
+    """Filter a queryset by a search query and annotate search_rank."""
+    return get_search_engine(queryset.db).search(queryset, query)
+
+
+class SearchMixin:
+    """
+    Filter list results with ?q= and order them by relevance.
+
+    Views call search_queryset() from get_queryset. While a search is
+    active the paginator orders pages by get_pagination_ordering().
+    """
+    search_param = 'q'
+
+    def get_search_query(self):
+        """Return the search query of a list request or ''."""
+        if self.action != 'list':
+            return ''
+
+        return self.request.query_params.get(self.search_param, '').strip()
+
+    def search_queryset(self, queryset):
+        """Apply the search query to a queryset."""
+        # the vectors are only read by the database
+        queryset = queryset.defer('search_vector')
+        query = self.get_search_query()
+        if not query:
+            return queryset
+
+        return search(queryset, query)
+
+    def get_pagination_ordering(self):
+        """Return the page ordering of searches, best matches first."""
+        if self.get_search_query():
+            return ('-search_rank', '-id')
+
+        return None
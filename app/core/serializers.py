@@ -0,0 +1,27 @@
+"""
+Serializer fields shared by the api's
+"""
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from core.images import variant_urls
+
+
+@extend_schema_field({
+    'type': 'object',
+    'nullable': True,
+    'description': 'Variant urls by width, then by file extension',
+    'additionalProperties': {
+        'type': 'object',
+        'additionalProperties': {'type': 'string', 'format': 'uri'},
+    },
+})
+class ImageVariantsField(serializers.Field):
+    """Read only urls of the thumbnails generated for an image field."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return variant_urls(value, self.context.get('request'))
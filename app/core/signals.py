@@ -0,0 +1,105 @@
+"""
+Signal receivers for the core models
+
+Receivers without a sender below are connected by CoreConfig.ready() to
+the models they handle only, so deletes of other models (sessions,
+tokens) and their cascades stay fast deletes.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core.authentication import invalidate_tokens
+from core.cache import invalidate
+from core.images import schedule_variants
+from core.search import get_search_fields, refresh_search_vectors
+from core.tags import change_tag_counts, linked_tags
+from core.models import (
+    ArtifactImages,
+    Artifacts,
+    Culture,
+    EthnicGroup,
+    Event,
+    EventImages,
+    SiteImages,
+    User)
+
+TAGGED_MODELS = [EthnicGroup, Culture]
+
+SEARCHED_MODELS = [EthnicGroup, Culture, Event, Artifacts]
+
+# image field of each model whose uploads get thumbnails
+IMAGE_FIELDS = {
+    EthnicGroup: 'image',
+    Culture: 'image',
+    EventImages: 'images',
+    SiteImages: 'images',
+    ArtifactImages: 'images',
+}
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    """Expire cached responses built from a saved or deleted model."""
+    invalidate(sender)
+
+
+def invalidate_cached_relations(sender, instance, model, action, **kwargs):
+    """Expire cached responses on both sides of a changed relation."""
+    if action.startswith('post_'):
+        invalidate(type(instance))
+        invalidate(model)
+
+
+def count_tag_usage(sender, instance, model, action, reverse, pk_set,
+                    **kwargs):
+    """Keep the usage counts of tags in step with their links."""
+    tagged = model if reverse else type(instance)
+    if action == 'post_add' and pk_set:
+        # pk_set holds only the links that were inserted
+        counts = {instance.pk: len(pk_set)} if reverse else {
+            tag_id: 1 for tag_id in pk_set}
+        change_tag_counts(tagged, counts)
+    elif action in ('pre_remove', 'pre_clear'):
+        # pk_set may name rows that aren't linked, count the links that
+        # are about to be deleted instead
+        if reverse:
+            counts = linked_tags(
+                tagged, tagged_ids=pk_set, tag_ids=[instance.pk])
+        else:
+            counts = linked_tags(
+                tagged, tagged_ids=[instance.pk], tag_ids=pk_set)
+        change_tag_counts(tagged, counts, sign=-1)
+
+
+def uncount_deleted_tagged(sender, instance, **kwargs):
+    """Release the tags of a deleted row, its links go without signals."""
+    change_tag_counts(
+        sender, linked_tags(sender, tagged_ids=[instance.pk]), sign=-1)
+
+
+def generate_image_variants(sender, instance, update_fields, **kwargs):
+    """Generate thumbnails of a saved image off the request thread."""
+    field = IMAGE_FIELDS[sender]
+    if update_fields is None or field in update_fields:
+        schedule_variants([getattr(instance, field).name], sender)
+
+
+def update_search_vector(sender, instance, update_fields, **kwargs):
+    """Recompute the search vector of a saved row."""
+    columns = {column for column, _weight in get_search_fields(sender)}
+    if update_fields is None or columns & set(update_fields):
+        refresh_search_vectors(sender.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """Stop accepting a deleted token from the lookup cache."""
+    invalidate_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, created, **kwargs):
+    """Drop cached lookups holding a stale or deactivated user."""
+    if not created:
+        invalidate_tokens(Token.objects.filter(
+            user=instance).values_list('key', flat=True))
@@ -0,0 +1,159 @@
+"""
+Usage counts, autocomplete and filters of tags
+"""
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import Count, Exists, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+
+from core.cache import get_versions, invalidate
+from core.lru import LRUCache
+from core.models import Culture, EthnicGroup, Tag
+
+# counter column of each tagged model
+TAG_COUNT_FIELDS = {
+    EthnicGroup: 'ethnic_group_count',
+    Culture: 'culture_count',
+}
+
+# tag ids a filter takes, tags_all adds a subquery per tag
+MAX_FILTER_TAGS = 20
+
+# autocomplete results of this process, keyed with the version of the
+# tags so any change to them is never served
+_autocomplete_results = LRUCache(settings.TAG_AUTOCOMPLETE_CACHE_SIZE)
+
+
+def _links(model):
+    """Return the through model and its links to the tagged row and tag."""
+    field = model._meta.get_field('tags')
+    return (field.remote_field.through,
+            field.m2m_field_name(),
+            field.m2m_reverse_field_name())
+
+
+def linked_tags(model, tagged_ids=None, tag_ids=None):
+    """Return how often each tag is linked to the given rows of a model."""
+    through, tagged_link, tag_link = _links(model)
+    links = through.objects.all()
+    if tagged_ids is not None:
+        links = links.filter(**{f'{tagged_link}__in': tagged_ids})
+    if tag_ids is not None:
+        links = links.filter(**{f'{tag_link}__in': tag_ids})
+
+    return Counter(links.values_list(tag_link, flat=True))
+
+
+def change_tag_counts(model, counts, sign=1):
+    """Add counts of links to a model to the usage counts of tags."""
+    column = TAG_COUNT_FIELDS[model]
+    tags_by_delta = defaultdict(list)
+    for tag_id, count in counts.items():
+        tags_by_delta[sign * count].append(tag_id)
+
+    for delta, tag_ids in tags_by_delta.items():
+        Tag.objects.filter(pk__in=tag_ids).update(
+            **{column: F(column) + delta})
+    if tags_by_delta:
+        invalidate(Tag)
+
+
+def refresh_tag_counts(model, tag_ids=None):
+    """Recount the usage of tags by a model, return the tags fixed."""
+    column = TAG_COUNT_FIELDS[model]
+    through, _tagged_link, tag_link = _links(model)
+    actual = Coalesce(Subquery(
+        through.objects.filter(**{tag_link: OuterRef('pk')})
+        .values(tag_link).annotate(count=Count('*')).values('count')), 0)
+
+    tags = Tag.objects.all()
+    if tag_ids is not None:
+        tags = tags.filter(pk__in=tag_ids)
+    drifted = tags.annotate(actual=actual).exclude(**{column: F('actual')})
+
+    return Tag.objects.filter(pk__in=drifted.values('pk')).update(
+        **{column: actual})
+
+
+def autocomplete_tags(model, user, prefix, limit):
+    """Return the tags of a user starting with prefix most used by a model."""
+    column = TAG_COUNT_FIELDS[model]
+    prefix = prefix.upper()
+    key = (column, user.pk, prefix, limit, *get_versions([Tag]))
+    tags = _autocomplete_results.get(key)
+    if tags is None:
+        # served by the UPPER(name) text_pattern_ops index
+        tags = list(
+            Tag.objects.filter(user=user, name__istartswith=prefix)
+            .order_by(f'-{column}', 'name')
+            .values('id', 'name', column)[:limit])
+        _autocomplete_results.set(
+            key, tags, settings.TAG_AUTOCOMPLETE_CACHE_TIMEOUT)
+
+    return tags
+
+
+def filter_tags_all(queryset, tag_ids):
+    """Return the rows of a queryset linked to every tag."""
+    through, tagged_link, tag_link = _links(queryset.model)
+
+    # a semi join per tag rather than grouping the links of the tags,
+    # so pages of the newest rows stop reading once they are full
+    return queryset.filter(*[
+        Exists(through.objects.filter(**{
+            tagged_link: OuterRef('pk'), tag_link: tag_id}))
+        for tag_id in tag_ids
+    ])
+
+
+def filter_tags_any(queryset, tag_ids):
+    """Return the rows of a queryset linked to any of the tags, once."""
+    through, tagged_link, tag_link = _links(queryset.model)
+
+    return queryset.filter(Exists(through.objects.filter(**{
+        tagged_link: OuterRef('pk'), f'{tag_link}__in': tag_ids})))
+
+
+class TagFilterMixin:
+    """
+    Filter tagged rows with ?tags_all= and ?tags_any=.
+
+    Both take comma separated tag ids. tags_all keeps rows having every
+    tag and tags_any rows having at least one, ?tags= is kept as an
+    alias of tags_any. Both filter with a subquery on the link table, so
+    rows are not repeated by a join and need no DISTINCT. At most
+    MAX_FILTER_TAGS distinct ids are taken per param.
+    """
+    tag_filters = {
+        'tags_all': filter_tags_all,
+        'tags_any': filter_tags_any,
+        'tags': filter_tags_any,
+    }
+
+    def _get_tag_ids(self, param):
+        """Return the tag ids of a filter param or None."""
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+
+        try:
+            tag_ids = {int(tag_id) for tag_id in value.split(',')}
+        except ValueError:
+            raise ValidationError(
+                {param: 'Expected comma separated tag ids.'})
+        if len(tag_ids) > MAX_FILTER_TAGS:
+            raise ValidationError(
+                {param: f'Expected at most {MAX_FILTER_TAGS} tag ids.'})
+
+        return sorted(tag_ids)
+
+    def tag_queryset(self, queryset):
+        """Apply the tag filters of the request to a queryset."""
+        for param, tag_filter in self.tag_filters.items():
+            tag_ids = self._get_tag_ids(param)
+            if tag_ids is not None:
+                queryset = tag_filter(queryset, tag_ids)
+
+        return queryset
@@ -0,0 +1,148 @@
+"""
+Tests for the cached token authentication
+"""
+import pickle
+import time
+
+from django.core.cache import cache
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from core import authentication
+from core.authentication import CachedTokenAuthentication
+from core.helpers import create_user
+from core.lru import LRUCache
+
+
+ARTIFACTS_URL = reverse('artifacts:artifacts-list')
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Tests for the in-process LRU cache"""
+
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used entry is dropped when full"""
+        lru = LRUCache(2)
+        lru.set('a', 1, 60)
+        lru.set('b', 2, 60)
+        lru.get('a')
+        lru.set('c', 3, 60)
+
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('c'), 3)
+
+    def test_entries_expire(self):
+        """Test entries are gone after their timeout"""
+        lru = LRUCache(2)
+        lru.set('a', 1, 0.01)
+        time.sleep(0.02)
+
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(len(lru), 0)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Tests for CachedTokenAuthentication"""
+
+    def setUp(self):
+        authentication._local_tokens.clear()
+        cache.clear()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_lookup_cached(self):
+        """Test a verified token is not looked up again"""
+        with self.assertNumQueries(1):
+            self.auth.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+
+    def test_lookup_copied_per_request(self):
+        """Test cached lookups don't share a user between requests"""
+        first, _token = self.auth.authenticate_credentials(self.token.key)
+        first.name = 'Changed'
+
+        user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertIsNot(user, first)
+        self.assertEqual(user.name, self.user.name)
+        self.assertIs(token.user, user)
+
+    def test_invalid_token_not_cached(self):
+        """Test an unknown token is rejected every time"""
+        for _attempt in range(2):
+            with self.assertRaises(AuthenticationFailed):
+                self.auth.authenticate_credentials('unknown')
+
+    def test_deleted_token_rejected(self):
+        """Test a deleted token is no longer accepted"""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_deactivated_user_rejected(self):
+        """Test the token of a deactivated user is no longer accepted"""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    @override_settings(AUTH_TOKEN_CACHE_ALIAS='default')
+    def test_shared_cache(self):
+        """Test a lookup cached by another process is used"""
+        self.auth.authenticate_credentials(self.token.key)
+        authentication._local_tokens.clear()
+
+        with self.assertNumQueries(0):
+            user, _token = self.auth.authenticate_credentials(
+                self.token.key)
+
+        self.assertEqual(user, self.user)
+
+    @override_settings(AUTH_TOKEN_CACHE_ALIAS='default')
+    def test_shared_cache_without_password(self):
+        """Test the password hash is not stored in the shared cache"""
+        self.auth.authenticate_credentials(self.token.key)
+
+        cached = cache.get(authentication._shared_key(self.token.key))
+
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(cached))
+
+    @override_settings(AUTH_TOKEN_CACHE_ALIAS='default')
+    def test_shared_cache_invalidated(self):
+        """Test a deleted token is dropped from the shared cache"""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        self.token.delete()
+        authentication._local_tokens.clear()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_cached_response_without_queries(self):
+        """Test a cached list is served without touching the database"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        client.get(ARTIFACTS_URL)
+
+        with self.assertNumQueries(0):
+            res = client.get(ARTIFACTS_URL)
+
+        self.assertEqual(res.status_code, 200)
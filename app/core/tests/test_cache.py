@@ -0,0 +1,150 @@
+"""
+Tests for the list response cache
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db.models.deletion import Collector
+from django.db.models.signals import pre_delete
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core.cache import get_cache
+from core.helpers import create_user
+from core.models import EthnicGroup, Site, SiteImages, Tag
+
+
+ETHNIC_GROUP_URL = reverse('ethnic_group:ethnic_group-list')
+SITES_URL = reverse('sites:sites-list')
+CACHE_STATS_URL = reverse('cache-stats')
+
+
+def create_ethnic_group(user, **params):
+    """Create and return an ethnic group"""
+    defaults = {
+        'name': 'Tswana',
+        'description': 'The Tswana are a Bantu-speaking ethnic group',
+        'population': 100,
+    }
+    defaults.update(params)
+
+    return EthnicGroup.objects.create(user=user, **defaults)
+
+
+class CachedListTests(TestCase):
+    """Tests for caching list responses"""
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_second_request_is_served_from_cache(self):
+        """Test a repeated list request does not touch the database"""
+        create_ethnic_group(user=self.user)
+
+        res = self.client.get(ETHNIC_GROUP_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(ETHNIC_GROUP_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached.data, res.data)
+
+    def test_query_params_are_cached_separately(self):
+        """Test a different page size builds a new response"""
+        self.client.get(SITES_URL)
+
+        res = self.client.get(SITES_URL, {'page_size': 1})
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+    def test_users_are_cached_separately(self):
+        """Test one user's cached list is not served to another"""
+        create_ethnic_group(user=self.user)
+        self.client.get(ETHNIC_GROUP_URL)
+
+        other_user = create_user(
+            email='other@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(other_user)
+        res = self.client.get(ETHNIC_GROUP_URL)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'], [])
+
+    def test_save_invalidates_cache(self):
+        """Test saving a model expires its cached lists"""
+        ethnic_group = create_ethnic_group(user=self.user)
+        self.client.get(ETHNIC_GROUP_URL)
+
+        ethnic_group.name = 'Bakalanga'
+        ethnic_group.save()
+        res = self.client.get(ETHNIC_GROUP_URL)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['name'], 'Bakalanga')
+
+    def test_delete_invalidates_cache(self):
+        """Test deleting a related image expires the site list"""
+        site = Site.objects.create(
+            user=self.user, site_name='Tsodilo', site_type='cultural')
+        image = SiteImages.objects.create(
+            site=site, images='uploads/test/site.jpg')
+        self.client.get(SITES_URL)
+
+        image.delete()
+        res = self.client.get(SITES_URL)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['images'], [])
+
+    def test_m2m_change_invalidates_cache(self):
+        """Test adding a tag expires the ethnic group list"""
+        ethnic_group = create_ethnic_group(user=self.user)
+        self.client.get(ETHNIC_GROUP_URL)
+
+        ethnic_group.tags.add(Tag.objects.create(user=self.user, name='t1'))
+        res = self.client.get(ETHNIC_GROUP_URL)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results'][0]['tags']), 1)
+
+    def test_cache_stats(self):
+        """Test admins can read hit rate and invalidation counts"""
+        create_ethnic_group(user=self.user)
+        self.client.get(ETHNIC_GROUP_URL)
+        self.client.get(ETHNIC_GROUP_URL)
+
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpassword123')
+        self.client.force_authenticate(admin)
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['hits'], 1)
+        self.assertEqual(res.data['misses'], 1)
+        self.assertEqual(res.data['hit_rate'], 0.5)
+        self.assertGreaterEqual(
+            res.data['invalidations']['core.ethnicgroup'], 1)
+
+    def test_cache_stats_admin_only(self):
+        """Test regular users cannot read cache statistics"""
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_other_models_keep_fast_deletes(self):
+        """Test receivers aren't connected to models they don't handle"""
+        collector = Collector(using='default')
+
+        self.assertTrue(collector.can_fast_delete(Session.objects.all()))
+        self.assertFalse(pre_delete.has_listeners(Token))
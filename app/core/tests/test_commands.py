@@ -1,10 +1,19 @@
 """Test custom django management commands."""
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from psycopg2 import OperationalError as Psycopg2OpError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+from core.helpers import create_user
+from core.models import Artifacts, Culture, EthnicGroup, Site, Tag
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -31,3 +40,157 @@ class CommandTests(SimpleTestCase):
         self.assertEqual(patched_check.call_count, 6)
 
         patched_check.assert_called_with(databases=['default'])
+
+
+class ImportCollectionTests(TestCase):
+    """Test the import_collection command."""
+
+    def setUp(self):
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.images = os.path.join(self.dir, 'images')
+        os.mkdir(self.images)
+        for name in ['a.jpg', 'b.jpg']:
+            Image.new('RGB', (40, 20)).save(os.path.join(self.images, name))
+
+        media = override_settings(
+            MEDIA_ROOT=os.path.join(self.dir, 'media'),
+            IMAGE_VARIANT_WIDTHS=[16])
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def _write_manifest(self, name, rows):
+        """Write rows as JSONL and return the manifest path"""
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as manifest:
+            for row in rows:
+                manifest.write(json.dumps(row) + '\n')
+        return path
+
+    def _import(self, manifest, **options):
+        """Run the command and return its output"""
+        out = StringIO()
+        options.setdefault('workers', 0)
+        call_command(
+            'import_collection', manifest, user=self.user.email,
+            images=self.images, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_csv_manifest(self):
+        """Test rows, references, images and tags are imported"""
+        rows = [
+            {'type': 'ethnic_group', 'ref': 'g1', 'name': 'Bakalanga',
+             'description': 'Kalanga people', 'population': '1000',
+             'tags': 'oral|dance', 'image': 'a.jpg'},
+            {'type': 'culture', 'ref': 'c1', 'name': 'Hosana',
+             'ethnic_group': 'g1', 'tags': 'dance'},
+            {'type': 'site', 'ref': 's1', 'site_name': 'Domboshaba',
+             'site_type': 'cultural', 'ethnic_group': 'g1',
+             'latitude': '-20.5', 'longitude': '27.2',
+             'images': 'a.jpg|b.jpg'},
+            {'type': 'artifact', 'artifact_name': 'Drum',
+             'artifact_type': 'tool', 'site': 's1', 'images': 'b.jpg'},
+        ]
+        path = os.path.join(self.dir, 'manifest.csv')
+        with open(path, 'w', newline='') as manifest:
+            writer = csv.DictWriter(manifest, fieldnames=sorted(
+                {column for row in rows for column in row}))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        out = self._import(path)
+
+        group = EthnicGroup.objects.get(name='Bakalanga')
+        site = Site.objects.get(site_name='Domboshaba')
+        artifact = Artifacts.objects.get(artifact_name='Drum')
+        self.assertIn('rows/s', out)
+        self.assertEqual(
+            sorted(tag.name for tag in group.tags.all()), ['dance', 'oral'])
+        dance = Tag.objects.get(name='dance')
+        self.assertEqual(
+            (dance.ethnic_group_count, dance.culture_count), (1, 1))
+        self.assertEqual(
+            Culture.objects.get(name='Hosana').ethnic_group, group)
+        self.assertTrue(os.path.exists(group.image.path))
+        self.assertEqual(site.images.count(), 2)
+        self.assertNotEqual(site.geohash, '')
+        self.assertEqual(artifact.site, site)
+        self.assertEqual(artifact.images.count(), 1)
+        self.assertTrue(
+            Artifacts.objects.filter(search_vector='drum').exists())
+
+    def test_resume_from_checkpoint(self):
+        """Test a failed import resumes after the committed batches"""
+        rows = [
+            {'type': 'artifact', 'artifact_name': f'Pot {i}',
+             'artifact_type': 'tool'}
+            for i in range(5)
+        ]
+        rows[3]['artifact_type'] = 'spaceship'
+        path = self._write_manifest('manifest.jsonl', rows)
+
+        with self.assertRaisesMessage(CommandError, 'Row 4'):
+            self._import(path, batch_size=2)
+        self.assertEqual(Artifacts.objects.count(), 2)
+
+        rows[3]['artifact_type'] = 'tool'
+        self._write_manifest('manifest.jsonl', rows)
+        self._import(path, batch_size=2, resume=True)
+
+        self.assertEqual(
+            sorted(Artifacts.objects.values_list(
+                'artifact_name', flat=True)),
+            [f'Pot {i}' for i in range(5)])
+
+    def test_unknown_reference(self):
+        """Test a reference to a missing row fails the import"""
+        path = self._write_manifest('manifest.jsonl', [
+            {'type': 'culture', 'name': 'Hosana', 'ethnic_group': 'g9'},
+        ])
+
+        with self.assertRaisesMessage(CommandError, 'unknown ethnic_group'):
+            self._import(path)
+
+    def test_images_on_process_pool(self):
+        """Test images are copied by worker processes"""
+        path = self._write_manifest('manifest.jsonl', [
+            {'type': 'site', 'site_name': 'Tsodilo', 'site_type': 'cultural',
+             'images': ['a.jpg', 'b.jpg']},
+        ])
+
+        self._import(path, workers=2)
+
+        for image in Site.objects.get().images.all():
+            self.assertTrue(os.path.exists(image.images.path))
+
+
+class ReconcileTagCountsTests(TestCase):
+    """Test the reconcile_tag_counts command."""
+
+    def test_reconcile_drifted_counts(self):
+        """Test drifted usage counts are recounted from the links"""
+        user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        tag = Tag.objects.create(user=user, name='dance')
+        unused = Tag.objects.create(user=user, name='oral')
+        for number in range(2):
+            EthnicGroup.objects.create(
+                user=user, name=f'Group {number}', population=1).tags.add(tag)
+        Tag.objects.update(ethnic_group_count=7, culture_count=0)
+
+        out = StringIO()
+        call_command('reconcile_tag_counts', stdout=out)
+
+        tag.refresh_from_db()
+        unused.refresh_from_db()
+        self.assertEqual(tag.ethnic_group_count, 2)
+        self.assertEqual(unused.ethnic_group_count, 0)
+        self.assertIn('ethnic group: 2 tag counts fixed', out.getvalue())
+        self.assertIn('culture: 0 tag counts fixed', out.getvalue())
@@ -0,0 +1,156 @@
+"""
+Tests for conditional GET support
+"""
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.cache import get_cache
+from core.helpers import create_user
+from core.models import Chief, EthnicGroup, Event, EventImages, Site
+
+
+CHIEF_URL = reverse('chief:chief-list')
+SITES_URL = reverse('sites:sites-list')
+
+
+def event_detail_url(event_id):
+    """Return the event detail url"""
+    return reverse('event:event-detail', args=[event_id])
+
+
+def site_detail_url(site_id):
+    """Return the site detail url"""
+    return reverse('sites:sites-detail', args=[site_id])
+
+
+@override_settings(API_CACHE_SHARED=True)
+class ConditionalGetTests(TestCase):
+    """Tests for ETag validators"""
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_sends_validators(self):
+        """Test list responses carry an ETag and no Last-Modified"""
+        Chief.objects.create(user=self.user, name='Khama')
+
+        res = self.client.get(CHIEF_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', res)
+        self.assertNotIn('Last-Modified', res)
+
+    @override_settings(API_CACHE_SHARED=False)
+    def test_no_validators_without_shared_cache(self):
+        """Test no ETag is sent when other processes can't see versions"""
+        chief = Chief.objects.create(user=self.user, name='Khama')
+
+        res = self.client.get(CHIEF_URL)
+        detail = self.client.get(
+            reverse('chief:chief-detail', args=[chief.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', res)
+        self.assertNotIn('ETag', detail)
+
+    def test_list_if_none_match(self):
+        """Test a matching ETag returns 304 without serializing"""
+        Chief.objects.create(user=self.user, name='Khama')
+        etag = self.client.get(CHIEF_URL)['ETag']
+
+        # the validators are versions kept in the cache
+        with self.assertNumQueries(0):
+            res = self.client.get(CHIEF_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], etag)
+
+    def test_list_etag_changes_on_write(self):
+        """Test updating or deleting a row changes the list ETag"""
+        chief = Chief.objects.create(user=self.user, name='Khama')
+        first = self.client.get(CHIEF_URL)['ETag']
+
+        chief.name = 'Sekgoma'
+        chief.save()
+        second = self.client.get(CHIEF_URL)['ETag']
+
+        chief.delete()
+        res = self.client.get(CHIEF_URL, HTTP_IF_NONE_MATCH=second)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], second)
+
+    def test_list_etag_changes_on_older_delete(self):
+        """Test deleting a row that isn't the newest changes the ETag"""
+        older = Chief.objects.create(user=self.user, name='Khama')
+        Chief.objects.create(user=self.user, name='Sekgoma')
+        etag = self.client.get(CHIEF_URL)['ETag']
+        since = http_date(timezone.now().timestamp() + 60)
+
+        older.delete()
+        res = self.client.get(
+            CHIEF_URL, HTTP_IF_NONE_MATCH=etag,
+            HTTP_IF_MODIFIED_SINCE=since)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_cached_list_if_none_match(self):
+        """Test a cached list answers conditional requests without SQL"""
+        Site.objects.create(
+            user=self.user, site_name='Tsodilo', site_type='cultural')
+        etag = self.client.get(SITES_URL)['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(SITES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_if_none_match(self):
+        """Test a matching ETag on a detail view returns 304"""
+        event = Event.objects.create(user=self.user, name='Dithubaruba')
+        url = event_detail_url(event.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_image_changes_detail_etag(self):
+        """Test adding an image marks the parent event as modified"""
+        event = Event.objects.create(user=self.user, name='Dithubaruba')
+        url = event_detail_url(event.id)
+        etag = self.client.get(url)['ETag']
+
+        EventImages.objects.create(event=event, images='uploads/test/e.jpg')
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['images']), 1)
+
+    def test_deleted_relation_changes_detail_etag(self):
+        """Test a relation cleared by SET_NULL changes the detail ETag"""
+        group = EthnicGroup.objects.create(
+            user=self.user, name='Bakwena', population=100)
+        site = Site.objects.create(
+            user=self.user, site_name='Tsodilo', site_type='cultural',
+            ethnic_group=group)
+        url = site_detail_url(site.id)
+        etag = self.client.get(url)['ETag']
+
+        group.delete()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data['ethnic_group'])
@@ -0,0 +1,113 @@
+"""
+Tests for the database backends
+"""
+from django.db import connection, OperationalError
+from django.test import SimpleTestCase
+
+from core.db.backends.postgresql.base import (
+    DatabaseWrapper as HealthCheckWrapper)
+from core.db.backends.postgresql_pool.base import (
+    close_pools,
+    DatabaseWrapper as PoolWrapper)
+
+# a pool of one connection given back after each request
+SINGLE_POOL = {'POOL_SIZE': 1, 'POOL_MAX_SIZE': 1, 'CONN_MAX_AGE': 0}
+
+
+def _wrapper(wrapper_class, **settings):
+    """Return a new connection to the test database."""
+    # own connection parameters, so the pools are not shared with the
+    # connection of the test run
+    options = {'application_name': 'backend_test'}
+
+    return wrapper_class(
+        {**connection.settings_dict, 'OPTIONS': options, **settings},
+        alias=connection.alias)
+
+
+def _terminate(wrapper):
+    """Drop a connection on the server side."""
+    with wrapper.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        pid = cursor.fetchone()[0]
+    other = _wrapper(HealthCheckWrapper)
+    with other.cursor() as cursor:
+        cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+    other.close()
+
+
+def _query(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        return cursor.fetchone()[0]
+
+
+class ConnectionTests(SimpleTestCase):
+    """Tests for persistent and pooled connections"""
+    # the tests open their own connections, outside any test transaction
+    databases = {'default'}
+
+    def setUp(self):
+        # runs after the cleanups giving connections back
+        self.addCleanup(close_pools)
+
+    def test_dropped_connection_replaced(self):
+        """Test a connection dropped between requests is replaced"""
+        wrapper = _wrapper(
+            HealthCheckWrapper, CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True)
+        self.addCleanup(wrapper.close)
+        _query(wrapper)
+        dropped = wrapper.connection
+        _terminate(wrapper)
+
+        wrapper.close_if_unusable_or_obsolete()
+
+        self.assertEqual(_query(wrapper), 1)
+        self.assertIsNot(wrapper.connection, dropped)
+
+    def test_dropped_connection_without_health_checks(self):
+        """Test the next query fails on a dropped connection"""
+        wrapper = _wrapper(
+            HealthCheckWrapper, CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=False)
+        self.addCleanup(wrapper.close)
+        _query(wrapper)
+        _terminate(wrapper)
+
+        wrapper.close_if_unusable_or_obsolete()
+
+        with self.assertRaises(OperationalError):
+            _query(wrapper)
+
+    def test_pool_reuses_connection(self):
+        """Test a closed pooled connection is handed out again"""
+        wrapper = _wrapper(PoolWrapper, **SINGLE_POOL)
+        _query(wrapper)
+        first = wrapper.connection
+        wrapper.close()
+
+        _query(wrapper)
+        self.addCleanup(wrapper.close)
+
+        self.assertIs(wrapper.connection, first)
+
+    def test_pool_replaces_dropped_connection(self):
+        """Test a pooled connection dropped while idle is replaced"""
+        wrapper = _wrapper(PoolWrapper, CONN_HEALTH_CHECKS=True, **SINGLE_POOL)
+        _query(wrapper)
+        dropped = wrapper.connection
+        _terminate(wrapper)
+        wrapper.close()
+
+        self.assertEqual(_query(wrapper), 1)
+        self.addCleanup(wrapper.close)
+        self.assertIsNot(wrapper.connection, dropped)
+
+    def test_pool_exhausted(self):
+        """Test borrowing from an exhausted pool times out"""
+        first = _wrapper(PoolWrapper, POOL_TIMEOUT=0.01, **SINGLE_POOL)
+        second = _wrapper(PoolWrapper, POOL_TIMEOUT=0.01, **SINGLE_POOL)
+        _query(first)
+        self.addCleanup(first.close)
+
+        with self.assertRaises(OperationalError):
+            _query(second)
@@ -0,0 +1,161 @@
+"""
+Tests for sparse fieldsets and expanded relations
+"""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import get_cache
+from core.helpers import create_user
+from core.models import Chief, EthnicGroup, Site, SiteImages, Tag
+
+
+CHIEF_URL = reverse('chief:chief-list')
+SITES_URL = reverse('sites:sites-list')
+
+
+def site_detail_url(site_id):
+    """Return the url of a site"""
+    return reverse('sites:sites-detail', args=[site_id])
+
+
+class DynamicFieldsTests(TestCase):
+    """Tests for the ?fields= and ?expand= params"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+        get_cache().clear()
+
+        self.group = EthnicGroup.objects.create(
+            user=self.user, name='Bakwena', language='Setswana',
+            population=90000)
+        self.group.tags.add(Tag.objects.create(user=self.user, name='Dance'))
+        self.site = Site.objects.create(
+            user=self.user, site_name='Tsodilo', site_type='cultural',
+            description='San rock paintings', ethnic_group=self.group)
+        SiteImages.objects.create(
+            site=self.site, images='uploads/site/tsodilo.jpg')
+
+    def test_sparse_list(self):
+        """Test a list returns only the fields asked for"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(SITES_URL, {'fields': 'id,site_name'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'],
+            [{'id': self.site.id, 'site_name': 'Tsodilo'}])
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('core_siteimages', sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_sparse_list_detail_fields(self):
+        """Test a list can return fields of the detail serializer"""
+        res = self.client.get(SITES_URL, {'fields': 'site_name,description'})
+
+        self.assertEqual(
+            res.data['results'],
+            [{'site_name': 'Tsodilo', 'description': 'San rock paintings'}])
+
+    def test_sparse_retrieve(self):
+        """Test a detail response returns only the fields asked for"""
+        res = self.client.get(
+            site_detail_url(self.site.id), {'fields': 'images'})
+
+        self.assertEqual(list(res.data), ['images'])
+        self.assertEqual(len(res.data['images']), 1)
+
+    def test_unknown_field(self):
+        """Test unknown fields are rejected"""
+        res = self.client.get(SITES_URL, {'fields': 'id,password'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', res.data['fields'])
+
+    def test_expand(self):
+        """Test expanded relations are returned as objects"""
+        Chief.objects.create(
+            user=self.user, name='Sechele', ethnic_group=self.group)
+
+        res = self.client.get(CHIEF_URL, {'expand': 'ethnic_group'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        group = res.data['results'][0]['ethnic_group']
+        self.assertEqual(group['name'], 'Bakwena')
+        self.assertEqual(group['tags'][0]['name'], 'Dance')
+
+    def test_expand_queries(self):
+        """Test expanding a relation doesn't query once per row"""
+        for number in range(3):
+            Chief.objects.create(
+                user=self.user, name=f'Kgosi {number}',
+                ethnic_group=self.group)
+
+        # the page, the groups and their tags
+        with self.assertNumQueries(3):
+            self.client.get(CHIEF_URL, {'expand': 'ethnic_group'})
+
+    def test_expand_with_fields(self):
+        """Test expanded relations are kept by a sparse fieldset"""
+        res = self.client.get(
+            SITES_URL, {'fields': 'site_name', 'expand': 'ethnic_group'})
+
+        site = res.data['results'][0]
+        self.assertEqual(list(site), ['site_name', 'ethnic_group'])
+        self.assertEqual(site['ethnic_group']['id'], self.group.id)
+
+    def test_unknown_relation(self):
+        """Test relations that can't be expanded are rejected"""
+        res = self.client.get(SITES_URL, {'expand': 'images'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('expand', res.data)
+
+    def test_expand_other_users_relation(self):
+        """Test relations to another user's ethnic group expand to null"""
+        other = create_user(
+            email='other@example.com', password='testpassword123')
+        group = EthnicGroup.objects.create(
+            user=other, name='Bangwaketse', history='Private notes',
+            population=1000)
+        site = Site.objects.create(
+            user=other, site_name='Kanye', site_type='cultural',
+            ethnic_group=group)
+
+        listed = self.client.get(
+            SITES_URL, {'fields': 'id', 'expand': 'ethnic_group'})
+        detail = self.client.get(
+            site_detail_url(site.id), {'expand': 'ethnic_group'})
+
+        self.assertIsNone(detail.data['ethnic_group'])
+        groups = {
+            item['id']: item['ethnic_group']
+            for item in listed.data['results']
+        }
+        self.assertIsNone(groups[site.id])
+        self.assertEqual(groups[self.site.id]['name'], 'Bakwena')
+
+    @override_settings(API_CACHE_SHARED=True)
+    def test_expanded_rows_change_etag(self):
+        """Test changing an expanded row changes the ETag"""
+        chief = Chief.objects.create(
+            user=self.user, name='Sechele', ethnic_group=self.group)
+        url = reverse('chief:chief-detail', args=[chief.id])
+        params = {'expand': 'ethnic_group'}
+        etag = self.client.get(url, params)['ETag']
+
+        self.group.name = 'Bakwena ba Sechele'
+        self.group.save()
+        res = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['ethnic_group']['name'], 'Bakwena ba Sechele')
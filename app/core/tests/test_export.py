@@ -0,0 +1,93 @@
+"""
+Tests for the streaming export actions
+"""
+import csv
+import io
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.helpers import create_user
+from core.models import Chief, EthnicGroup
+
+
+CHIEF_EXPORT_URL = reverse('chief:chief-export')
+ETHNIC_GROUP_EXPORT_URL = reverse('ethnic_group:ethnic_group-export')
+
+
+@override_settings(API_EXPORT_CHUNK_SIZE=2)
+class ExportTests(TestCase):
+    """Tests for NDJSON and CSV exports"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _content(self, res):
+        """Return the streamed body of a response"""
+        return b''.join(res.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        """Test rows are streamed as one JSON document per line"""
+        for name in ['Khama', 'Sechele', 'Bathoen']:
+            Chief.objects.create(user=self.user, name=name)
+
+        res = self.client.get(CHIEF_EXPORT_URL)
+        lines = self._content(res).splitlines()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(
+            [json.loads(line)['name'] for line in lines],
+            ['Bathoen', 'Sechele', 'Khama'])
+        self.assertEqual(json.loads(lines[0])['user_id'], self.user.id)
+
+    def test_export_csv(self):
+        """Test rows are streamed as CSV with a header"""
+        Chief.objects.create(user=self.user, name='Khama, the Great')
+
+        res = self.client.get(CHIEF_EXPORT_URL, {'file_format': 'csv'})
+        rows = list(csv.DictReader(io.StringIO(self._content(res))))
+
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertIn('chief.csv', res['Content-Disposition'])
+        self.assertEqual(rows[0]['name'], 'Khama, the Great')
+
+    def test_export_query_count_is_constant(self):
+        """Test the export reads rows without per row queries"""
+        for i in range(10):
+            EthnicGroup.objects.create(
+                user=self.user, name=f'Group {i}', population=100)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ETHNIC_GROUP_EXPORT_URL)
+            lines = self._content(res).splitlines()
+
+        self.assertEqual(len(lines), 10)
+        self.assertNotIn('search_vector', json.loads(lines[0]))
+
+    def test_export_is_limited_to_listed_rows(self):
+        """Test other users' ethnic groups are not exported"""
+        other_user = create_user(
+            email='other@example.com',
+            password='testpassword123'
+        )
+        EthnicGroup.objects.create(
+            user=other_user, name='Bakalanga', population=100)
+
+        res = self.client.get(ETHNIC_GROUP_EXPORT_URL)
+
+        self.assertEqual(self._content(res), '')
+
+    def test_invalid_format(self):
+        """Test an unknown export format is rejected"""
+        res = self.client.get(CHIEF_EXPORT_URL, {'file_format': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
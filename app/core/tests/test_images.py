@@ -0,0 +1,174 @@
+"""
+Tests for image variant generation
+"""
+import io
+import threading
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.cache import get_cache, get_versions
+from core.helpers import create_user
+from core.images import (
+    _generate,
+    generate_variants,
+    get_formats,
+    schedule_variants,
+    variant_name,
+    variant_urls,
+)
+from core.models import EthnicGroup
+
+
+def store_image(size, name='uploads/test/variants.jpg'):
+    """Store a JPEG of size and return its storage name"""
+    buffer = io.BytesIO()
+    Image.new('RGB', size).save(buffer, format='JPEG')
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+@override_settings(IMAGE_VARIANT_WIDTHS=[320, 640], IMAGE_VARIANT_WORKERS=0)
+class ImageVariantTests(TestCase):
+    """Tests for thumbnails of uploaded images"""
+
+    def setUp(self):
+        self.names = []
+        get_cache().clear()
+
+    def tearDown(self):
+        for name in self.names:
+            for width in [320, 640]:
+                for ext in get_formats():
+                    default_storage.delete(variant_name(name, width, ext))
+            default_storage.delete(name)
+
+    def test_generate_variants(self):
+        """Test fixed width variants keep the aspect ratio"""
+        name = store_image((1000, 500))
+        self.names.append(name)
+
+        written = generate_variants(name)
+
+        self.assertEqual(len(written), 2 * len(get_formats()))
+        with default_storage.open(variant_name(name, 320, 'jpg')) as file:
+            self.assertEqual(Image.open(file).size, (320, 160))
+
+    def test_small_images_are_not_upscaled(self):
+        """Test variants wider than the original keep its size"""
+        name = store_image((100, 50))
+        self.names.append(name)
+
+        generate_variants(name)
+
+        with default_storage.open(variant_name(name, 640, 'jpg')) as file:
+            self.assertEqual(Image.open(file).size, (100, 50))
+
+    def test_existing_variants_are_kept(self):
+        """Test generating again for the same file writes nothing"""
+        name = store_image((1000, 500))
+        self.names.append(name)
+        generate_variants(name)
+
+        self.assertEqual(generate_variants(name), [])
+
+    def test_variant_urls_read_the_record(self):
+        """Test listing the variants of a generated image reads no files"""
+        name = store_image((1000, 500))
+        self.names.append(name)
+        image = EthnicGroup(image=name).image
+        self.assertEqual(variant_urls(image), {})
+
+        generate_variants(name)
+        with patch.object(FileSystemStorage, 'exists') as exists:
+            urls = variant_urls(image)
+
+        exists.assert_not_called()
+        self.assertEqual(
+            {width: sorted(formats) for width, formats in urls.items()},
+            {'320': sorted(get_formats()), '640': sorted(get_formats())})
+        self.assertTrue(
+            urls['320']['jpg'].endswith(variant_name(name, 320, 'jpg')))
+
+    def test_variant_urls_without_record(self):
+        """Test variants not recorded in the cache are found in storage"""
+        name = store_image((1000, 500))
+        self.names.append(name)
+        generate_variants(name)
+        get_cache().clear()
+
+        urls = variant_urls(EthnicGroup(image=name).image)
+
+        self.assertEqual(set(urls), {'320', '640'})
+
+    def test_new_variants_expire_responses(self):
+        """Test writing variants changes the version of the model"""
+        name = store_image((1000, 500))
+        self.names.append(name)
+        versions = get_versions([EthnicGroup])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule_variants([name], EthnicGroup)
+
+        self.assertNotEqual(get_versions([EthnicGroup]), versions)
+
+    def test_worker_opens_no_connection(self):
+        """Test generating on a worker thread opens no db connection"""
+        name = store_image((1000, 500))
+        self.names.append(name)
+        connected = []
+
+        def work():
+            _generate(name, EthnicGroup)
+            connected.append(connection.connection is not None)
+            connection.close()
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        worker.join()
+
+        self.assertEqual(connected, [False])
+
+    def test_upload_generates_variants(self):
+        """Test uploading an image exposes and generates its variants"""
+        client = APIClient()
+        user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        client.force_authenticate(user)
+        ethnic_group = EthnicGroup.objects.create(
+            user=user, name='Tswana', population=100)
+        url = reverse(
+            'ethnic_group:ethnic_group-upload-image', args=[ethnic_group.id])
+
+        detail = reverse(
+            'ethnic_group:ethnic_group-detail', args=[ethnic_group.id])
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 400)).save(buffer, format='JPEG')
+        buffer.name = 'upload.jpg'
+        buffer.seek(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = client.post(url, {'image': buffer}, format='multipart')
+
+        ethnic_group.refresh_from_db()
+        name = ethnic_group.image.name
+        self.names.append(name)
+
+        # variants are only listed once they are written
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['image_variants'], {})
+        self.assertTrue(
+            default_storage.exists(variant_name(name, 320, 'jpg')))
+
+        res = client.get(detail)
+
+        self.assertTrue(
+            res.data['image_variants']['320']['jpg'].endswith(
+                variant_name(name, 320, 'jpg')))
@@ -0,0 +1,182 @@
+"""
+Tests the list endpoints are planned on their indexes
+"""
+from unittest import skipUnless
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.cache import get_cache
+from core.helpers import create_user
+from core.models import Artifacts, Chief, EthnicGroup, Event, Site, Tag
+
+# rows of the common value, enough for the planner to prefer an index
+# over reading the table
+ROWS = 2000
+
+
+class IndexUsageTests(TestCase):
+    """Tests for the indexes of the list query patterns"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+        get_cache().clear()
+
+    def _analyze(self, model):
+        """Refresh the planner statistics of a table"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+    def _explain_list(self, url, params, marker='LIMIT'):
+        """Return the plan of the query reading a list page"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200)
+
+        sql = next(
+            query['sql'] for query in queries if marker in query['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}')
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def test_ethnic_groups_of_user(self):
+        """Test a user's groups are read from (user_id, id DESC)"""
+        # rows of many users are interleaved as they are created
+        users = [self.user] + get_user_model().objects.bulk_create(
+            get_user_model()(email=f'user{number}@example.com')
+            for number in range(49))
+        EthnicGroup.objects.bulk_create(
+            EthnicGroup(user=users[number % len(users)],
+                        name=f'Group {number}', population=1)
+            for number in range(ROWS))
+        self._analyze(EthnicGroup)
+
+        plan = self._explain_list(
+            reverse('ethnic_group:ethnic_group-list'), {'page_size': 10})
+
+        self.assertIn('ethnicgroup_user_id_idx', plan)
+
+    def test_current_chiefs(self):
+        """Test current chiefs are read from the partial index"""
+        Chief.objects.bulk_create(
+            Chief(name=f'Kgosi {number}', is_current=number < 20)
+            for number in range(ROWS))
+        self._analyze(Chief)
+
+        plan = self._explain_list(
+            reverse('chief:chief-list'), {'is_current': '1'})
+
+        self.assertIn('chief_current_idx', plan)
+
+    def test_events_by_type(self):
+        """Test events of a type are read from (event_type, id DESC)"""
+        Event.objects.bulk_create(
+            Event(name=f'Event {number}',
+                  event_type='ritual' if number < 20 else 'festive')
+            for number in range(ROWS))
+        self._analyze(Event)
+
+        plan = self._explain_list(
+            reverse('event:event-list'), {'event_type': 'ritual'})
+
+        self.assertIn('event_type_idx', plan)
+
+    def test_sites_by_type(self):
+        """Test sites of a type are read from (site_type, id DESC)"""
+        Site.objects.bulk_create(
+            Site(site_name=f'Site {number}',
+                 site_type='natural' if number < 20 else 'cultural')
+            for number in range(ROWS))
+        self._analyze(Site)
+
+        plan = self._explain_list(
+            reverse('sites:sites-list'), {'site_type': 'natural'})
+
+        self.assertIn('site_type_idx', plan)
+
+    def test_artifacts_by_type(self):
+        """Test artifacts of a type are read from (artifact_type, id DESC)"""
+        Artifacts.objects.bulk_create(
+            Artifacts(artifact_name=f'Artifact {number}',
+                      artifact_type='jewelry' if number < 20 else 'tool')
+            for number in range(ROWS))
+        self._analyze(Artifacts)
+
+        plan = self._explain_list(
+            reverse('artifacts:artifacts-list'), {'artifact_type': 'jewelry'})
+
+        self.assertIn('artifacts_type_idx', plan)
+
+    def test_artifacts_by_ethnic_group(self):
+        """Test a group's artifacts are read from (ethnic_group_id, id DESC)"""
+        groups = EthnicGroup.objects.bulk_create(
+            EthnicGroup(user=self.user, name=f'Group {number}', population=1)
+            for number in range(50))
+        Artifacts.objects.bulk_create(
+            Artifacts(artifact_name=f'Artifact {number}',
+                      ethnic_group=groups[number % len(groups)])
+            for number in range(ROWS))
+        self._analyze(Artifacts)
+
+        plan = self._explain_list(
+            reverse('artifacts:artifacts-list'),
+            {'ethnic_group': groups[0].id, 'page_size': 10})
+
+        self.assertIn('artifacts_group_idx', plan)
+
+    def test_artifacts_by_significance(self):
+        """Test every page by significance is read from its index"""
+        Artifacts.objects.bulk_create(
+            Artifacts(artifact_name=f'Artifact {number}',
+                      historical_significance=number % 10 or None)
+            for number in range(ROWS))
+        self._analyze(Artifacts)
+        url = reverse('artifacts:artifacts-list')
+        params = {'ordering': '-historical_significance', 'page_size': 10}
+
+        plan = self._explain_list(url, params)
+        self.assertIn('artifacts_historical_idx', plan)
+
+        res = self.client.get(url, params)
+        cursor = parse_qs(urlparse(res.data['next']).query)['cursor'][0]
+        plan = self._explain_list(url, {**params, 'cursor': cursor})
+        self.assertIn('artifacts_historical_idx', plan)
+
+    def test_assigned_tags(self):
+        """Test assigned tags are read from an index, without a join"""
+        Tag.objects.bulk_create(
+            Tag(user=self.user, name=f'Tag {number}',
+                ethnic_group_count=int(number < 20))
+            for number in range(ROWS))
+        self._analyze(Tag)
+
+        plan = self._explain_list(
+            reverse('ethnic_group:tag-list'), {'assigned_only': 1},
+            marker='core_tag')
+
+        self.assertIn('tag_group_assigned_idx', plan)
+        self.assertNotIn('Join', plan)
+
+    @skipUnless(connection.vendor == 'postgresql',
+                'text_pattern_ops indexes are Postgres only')
+    def test_tag_autocomplete(self):
+        """Test tag prefixes are matched on (user_id, UPPER(name))"""
+        Tag.objects.bulk_create(
+            Tag(user=self.user, name=f'Tag {number}')
+            for number in range(ROWS))
+        self._analyze(Tag)
+
+        plan = self._explain_list(
+            reverse('ethnic_group:tag-autocomplete'), {'prefix': 'tag 123'})
+
+        self.assertIn('tag_name_prefix_idx', plan)
@@ -0,0 +1,166 @@
+"""
+Tests for the orjson renderer and parser
+"""
+import datetime
+import io
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.helpers import create_user
+from core.models import Chief, Site
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from sites.serializers import SiteDetailsSerializer
+
+
+CHIEF_URL = reverse('chief:chief-list')
+
+PAYLOAD = {
+    'id': 1,
+    'name': 'Kgosi\u2028Sechele\u2029\xe9',
+    'latitude': Decimal('-24.658700'),
+    'date_of_birth': datetime.date(1810, 1, 1),
+    'updated_at': datetime.datetime(
+        2022, 5, 1, 10, 30, 5, 120, tzinfo=datetime.timezone.utc),
+    'local': datetime.datetime(2022, 5, 1, 10, 30),
+    'time': datetime.time(8, 15),
+    'duration': datetime.timedelta(minutes=90),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'label': gettext_lazy('This field is required.'),
+    'nested': [OrderedDict([('b', 1.5), ('a', None)]), (True, False)],
+    7: 'int key',
+}
+
+
+class RendererTests(SimpleTestCase):
+    """Tests for ORJSONRenderer"""
+
+    def test_same_output_as_json_renderer(self):
+        """Test the output is byte for byte that of JSONRenderer"""
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD),
+            JSONRenderer().render(PAYLOAD))
+
+    def test_indent_falls_back(self):
+        """Test indented output is rendered by JSONRenderer"""
+        media_type = 'application/json; indent=4'
+
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD, media_type),
+            JSONRenderer().render(PAYLOAD, media_type))
+
+    def test_big_integer_falls_back(self):
+        """Test data orjson rejects is rendered by JSONRenderer"""
+        data = {'value': 2 ** 70}
+
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_exponent_falls_back(self):
+        """Test floats in exponent notation render as with JSONRenderer"""
+        data = {'big': 1e16, 'small': [-1.5e-7, 2.5e-05], 'text': 'x:1e'}
+
+        self.assertEqual(ORJSONRenderer().render(data),
+                         b'{"big":1e+16,"small":[-1.5e-07,2.5e-05],'
+                         b'"text":"x:1e"}')
+
+    def test_non_finite_floats_render_null(self):
+        """Test infinite and NaN floats render as null"""
+        data = {'inf': float('inf'), 'nan': float('nan')}
+
+        self.assertEqual(ORJSONRenderer().render(data),
+                         b'{"inf":null,"nan":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_none_renders_empty(self):
+        """Test no data renders an empty body"""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ParserTests(SimpleTestCase):
+    """Tests for ORJSONParser"""
+
+    def _parse(self, body, encoding='utf-8'):
+        return ORJSONParser().parse(
+            io.BytesIO(body), parser_context={'encoding': encoding})
+
+    def test_same_result_as_json_parser(self):
+        """Test documents parse as with JSONParser"""
+        body = JSONRenderer().render(PAYLOAD)
+
+        self.assertEqual(
+            self._parse(body), JSONParser().parse(io.BytesIO(body)))
+
+    def test_big_integer(self):
+        """Test integers over 64 bits are parsed"""
+        self.assertEqual(self._parse(b'{"value": %d}' % 2 ** 70),
+                         {'value': 2 ** 70})
+
+    def test_nan_rejected(self):
+        """Test NaN is rejected as by the strict JSONParser"""
+        with self.assertRaises(ParseError):
+            self._parse(b'{"value": NaN}')
+
+    def test_malformed(self):
+        """Test malformed documents raise a parse error"""
+        with self.assertRaisesMessage(ParseError, 'JSON parse error'):
+            self._parse(b'{"value": ')
+
+    def test_request_encoding(self):
+        """Test bodies are decoded with the request charset"""
+        body = '{"name": "Tswana \xe9"}'.encode('latin-1')
+
+        self.assertEqual(self._parse(body, 'latin-1'),
+                         {'name': 'Tswana \xe9'})
+
+
+class JSONApiTests(TestCase):
+    """Tests for the api responses rendered with orjson"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_chief_dates(self):
+        """Test chief dates are rendered as ISO dates"""
+        chief = Chief.objects.create(
+            user=self.user, name='Sechele',
+            date_of_birth=datetime.date(1812, 1, 1))
+
+        res = self.client.get(reverse('chief:chief-detail', args=[chief.id]))
+
+        self.assertEqual(res.json()['date_of_birth'], '1812-01-01')
+        self.assertEqual(res.content, JSONRenderer().render(res.data))
+
+    def test_site_coordinates(self):
+        """Test site coordinates render as with JSONRenderer"""
+        site = Site.objects.create(
+            user=self.user, site_name='Tsodilo',
+            latitude=Decimal('-18.750000'), longitude=Decimal('21.733333'))
+        data = SiteDetailsSerializer(site).data
+
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_json_request(self):
+        """Test a JSON body is parsed"""
+        res = self.client.post(
+            CHIEF_URL, {'name': 'Khama', 'date_of_birth': '1837-01-01'},
+            format='json')
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.json()['date_of_birth'], '1837-01-01')
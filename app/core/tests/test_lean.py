@@ -0,0 +1,140 @@
+"""
+Tests for the lean list serializers
+"""
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from core.cache import get_cache
+from core.helpers import create_user
+from core.lean import LeanSerializer, UnsupportedField
+from core.models import (
+    Artifacts,
+    ArtifactImages,
+    Chief,
+    Culture,
+    EthnicGroup,
+    Event,
+    EventImages,
+    Publisher,
+    Site,
+    SiteImages,
+    Tag,
+)
+
+
+LIST_URLS = [
+    reverse('ethnic_group:ethnic_group-list'),
+    reverse('culture:culture-list'),
+    reverse('event:event-list'),
+    reverse('chief:chief-list'),
+    reverse('publisher:publisher-list'),
+    reverse('sites:sites-list'),
+    reverse('artifacts:artifacts-list'),
+]
+
+
+class SiteNameSerializer(serializers.ModelSerializer):
+    """Serializer with a computed field"""
+    title = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Site
+        fields = ['id', 'title']
+
+    def get_title(self, site):
+        return site.site_name.title()
+
+
+class LeanListTests(TestCase):
+    """Tests the lean lists match the serializer output"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+        dance = Tag.objects.create(user=self.user, name='Dance')
+        pottery = Tag.objects.create(user=self.user, name='Pottery')
+        for number in range(3):
+            group = EthnicGroup.objects.create(
+                user=self.user, name=f'Bakwena {number}',
+                language='Setswana', population=1000 * number,
+                history='Settled at Molepolole' if number else '')
+            group.tags.add(dance, *[pottery] * (number % 2))
+            culture = Culture.objects.create(
+                user=self.user, name=f'Setapa dance {number}',
+                ethnic_group=group if number else None)
+            culture.tags.add(pottery)
+            Chief.objects.create(
+                user=self.user, name=f'Sechele {number}',
+                ethnic_group=group)
+            event = Event.objects.create(
+                user=self.user, name=f'Dance festival {number}')
+            EventImages.objects.create(
+                event=event, images=f'uploads/event/{number}.jpg')
+            Publisher.objects.create(
+                user=self.user,
+                document=f'uploads/publisher/{number}.pdf' if number else '')
+            site = Site.objects.create(
+                user=self.user, site_name=f'Tsodilo {number}')
+            for image in range(number):
+                SiteImages.objects.create(
+                    site=site, images=f'uploads/site/{image}.jpg')
+            artifact = Artifacts.objects.create(
+                user=self.user, artifact_name=f'Basket {number}')
+            ArtifactImages.objects.create(artifact=artifact)
+
+    def _get(self, url, params, lean):
+        """Return the response body with lean lists on or off"""
+        get_cache().clear()
+        with override_settings(API_LEAN_LISTS=lean):
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200)
+
+        return res.content
+
+    def test_same_output(self):
+        """Test every list renders byte for byte as before"""
+        for url in LIST_URLS:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self._get(url, {}, lean=True),
+                    self._get(url, {}, lean=False))
+
+    def test_same_pages(self):
+        """Test pages and cursors are the same"""
+        for url in LIST_URLS:
+            params = {'page_size': 2}
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self._get(url, params, lean=True),
+                    self._get(url, params, lean=False))
+
+    def test_same_search_results(self):
+        """Test searches are ranked and paged the same"""
+        url = reverse('event:event-list')
+        params = {'q': 'festival', 'page_size': 2}
+
+        first = self._get(url, params, lean=True)
+
+        self.assertEqual(first, self._get(url, params, lean=False))
+        self.assertIn(b'cursor=', first)
+
+    def test_queries(self):
+        """Test a page with nested rows takes one query per relation"""
+        get_cache().clear()
+        url = reverse('ethnic_group:ethnic_group-list')
+
+        # the page and the tags of its rows
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+    def test_unsupported_fields(self):
+        """Test serializers with computed fields aren't compiled"""
+        with self.assertRaises(UnsupportedField):
+            LeanSerializer(SiteNameSerializer())
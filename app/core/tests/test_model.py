@@ -1,6 +1,7 @@
 """
 Tests for models
 """
+from django.db import IntegrityError
 from django.test import TestCase, tag
 from unittest.mock import patch
 from core import models
@@ -96,6 +97,20 @@ class ModelTests(TestCase):
 
         self.assertEqual(str(tag), tag.name)
 
+    def test_tag_name_unique_per_user(self):
+        """Test a user cannot have two tags with the same name"""
+        user = create_user(
+            email='test@example.com',
+            password='testpassword123')
+        other_user = create_user(
+            email='other@example.com',
+            password='testpassword123')
+        models.Tag.objects.create(user=user, name='testtag')
+        models.Tag.objects.create(user=other_user, name='testtag')
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(user=user, name='testtag')
+
 # Culture model tests
     def test_creating_culture_success(self):
         """Test creating culture success"""
@@ -0,0 +1,61 @@
+"""
+Tests for keyset pagination
+"""
+from unittest.mock import patch
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.helpers import create_user
+from core.models import Event
+from core.pagination import KeysetPagination
+
+
+EVENT_URL = reverse('event:event-list')
+
+
+class KeysetPaginationTests(TestCase):
+    """Tests for paginating list endpoints on -id"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+        self.events = [
+            Event.objects.create(user=self.user, name=f'Event {i}')
+            for i in range(5)
+        ]
+
+    def test_pages_follow_descending_ids(self):
+        """Test walking the cursors returns every row once in order"""
+        ids = []
+        url = EVENT_URL
+        params = {'page_size': 2}
+
+        while url:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in res.data['results']]
+            url, params = res.data['next'], {}
+
+        expected = sorted([event.id for event in self.events], reverse=True)
+        self.assertEqual(ids, expected)
+
+    def test_cursor_is_opaque(self):
+        """Test the next link does not expose ids or offsets"""
+        res = self.client.get(EVENT_URL, {'page_size': 2})
+
+        self.assertIn('cursor=', res.data['next'])
+        self.assertNotIn('offset', res.data['next'])
+        self.assertIsNone(res.data['previous'])
+
+    @patch.object(KeysetPagination, 'max_page_size', 3)
+    def test_page_size_is_capped(self):
+        """Test clients cannot request more than the max page size"""
+        res = self.client.get(EVENT_URL, {'page_size': 100})
+
+        self.assertEqual(len(res.data['results']), 3)
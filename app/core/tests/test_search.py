@@ -0,0 +1,70 @@
+"""
+Tests for full text search
+"""
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from core.helpers import create_user
+from core.models import Culture, Event
+from core.search import PostgresSearchEngine, SimpleSearchEngine
+
+postgres_only = skipUnless(
+    connection.vendor == 'postgresql', 'full text search needs Postgres')
+
+
+class SearchEngineTests(TestCase):
+    """Tests for the search vectors and engines"""
+
+    def setUp(self):
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.dance = Culture.objects.create(
+            user=self.user, name='Setapa dance',
+            description='A dance of the Bangwaketse')
+        self.pottery = Culture.objects.create(
+            user=self.user, name='Pottery',
+            description='Clay pots are decorated after the dance season')
+
+    def _names(self, engine, query):
+        """Return the names matched by an engine, best first"""
+        queryset = engine.search(Culture.objects.all(), query)
+        return [
+            culture.name for culture in queryset.order_by('-search_rank')
+        ]
+
+    @postgres_only
+    def test_vector_is_kept_in_step(self):
+        """Test saving a row updates its search vector"""
+        event = Event.objects.create(user=self.user, name='Dithubaruba')
+        event.name = 'Domboshaba festival'
+        event.save()
+
+        matches = PostgresSearchEngine().search(
+            Event.objects.all(), 'festival')
+
+        self.assertEqual(list(matches), [event])
+
+    @postgres_only
+    def test_postgres_engine_ranks_by_weight(self):
+        """Test name matches rank above description matches"""
+        self.assertEqual(
+            self._names(PostgresSearchEngine(), 'dances'),
+            ['Setapa dance', 'Pottery'])
+
+    @postgres_only
+    def test_postgres_engine_websearch_syntax(self):
+        """Test excluded words drop rows"""
+        self.assertEqual(
+            self._names(PostgresSearchEngine(), 'dance -clay'),
+            ['Setapa dance'])
+
+    def test_simple_engine_matches_every_word(self):
+        """Test the fallback engine ranks and requires all words"""
+        self.assertEqual(
+            self._names(SimpleSearchEngine(), 'dance'),
+            ['Setapa dance', 'Pottery'])
+        self.assertEqual(
+            self._names(SimpleSearchEngine(), 'clay dance'), ['Pottery'])
@@ -0,0 +1,24 @@
+"""
+Views for the core app
+"""
+from django.apps import apps
+from core.authentication import CachedTokenAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.cache import get_stats
+
+from drf_spectacular.utils import extend_schema, OpenApiTypes
+
+
+class CacheStatsView(APIView):
+    """Report the hit rate and invalidations of the response cache."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        """Return the cache statistics."""
+        models = apps.get_app_config('core').get_models()
+        return Response(get_stats(models))
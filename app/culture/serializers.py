@@ -3,9 +3,19 @@ Serializer for Culture Api's
 """
 
 from rest_framework import serializers
+from core.serializers import ImageVariantsField
 from core.models import Culture
 from ethnic_group.serializers import TagsSerializer
-from core.helpers import _get_or_create
+from core.helpers import _get_or_create, _set_tags
+
+
+class CultureTagSerializer(TagsSerializer):
+    """Serializer for tags with the number of cultures using them"""
+    usage_count = serializers.IntegerField(
+        source='culture_count', read_only=True)
+
+    class Meta(TagsSerializer.Meta):
+        fields = TagsSerializer.Meta.fields + ['usage_count']
 
 
 class CultureSerializer(serializers.ModelSerializer):
@@ -35,8 +45,7 @@ class CultureSerializer(serializers.ModelSerializer):
         auth_user = self.context['request'].user
 
         if tags is not None:
-            instance.tags.clear()
-            _get_or_create(auth_user, tags, instance)
+            _set_tags(auth_user, tags, instance)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -48,15 +57,19 @@ class CultureSerializer(serializers.ModelSerializer):
 class CultureDetailsSerializer(CultureSerializer):
     """Serializer for culture details view"""
 
+    image_variants = ImageVariantsField(source='image')
+
     class Meta(CultureSerializer.Meta):
-        fields = CultureSerializer.Meta.fields + ['description', 'image']
+        fields = CultureSerializer.Meta.fields + [
+            'description', 'image', 'image_variants']
 
 
 class CultureImageSerializer(serializers.ModelSerializer):
     """Serializer for culture image view"""
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Culture
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'image_variants']
         read_only_fields = ['id']
         extra_kwargs = {'image': {'required': True}}
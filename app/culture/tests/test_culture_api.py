@@ -2,6 +2,8 @@
 Test culture api's
 """
 from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 import tempfile
 import os
@@ -107,7 +109,7 @@ class PrivateCultureTests(TestCase):
         serializer = CultureSerializer(cultures, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_create_culture(self):
         """Test for creating culture information"""
@@ -267,6 +269,27 @@ class PrivateCultureTests(TestCase):
         culture = Culture.objects.get(id=culture.id)
         self.assertIn(new_tag, culture.tags.all())
 
+    def test_update_with_same_tags_skips_m2m_writes(self):
+        """Test resending the current tags does not rewrite them"""
+        culture = create_culture(user=self.user)
+        culture.tags.add(
+            Tag.objects.create(name='tag1', user=self.user),
+            Tag.objects.create(name='tag2', user=self.user))
+        payload = {'tags': [{'name': 'tag1'}, {'name': 'tag2'}]}
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.patch(
+                details_url(culture.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        through_table = Culture.tags.through._meta.db_table
+        writes = [
+            query['sql'] for query in queries
+            if through_table in query['sql']
+            and query['sql'].startswith(('INSERT', 'DELETE'))
+        ]
+        self.assertEqual(writes, [])
+
     def test_clear_culture_tags(self):
         """Test clearing culture tags"""
         tag = Tag.objects.create(name='tag1 test', user=self.user)
@@ -303,9 +326,23 @@ class PrivateCultureTests(TestCase):
         s2 = CultureSerializer(culture2)
         s3 = CultureSerializer(culture3)
 
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        self.assertIn(s1.data, res.data['results'])
+        self.assertIn(s2.data, res.data['results'])
+        self.assertNotIn(s3.data, res.data['results'])
+
+    def test_filter_culture_tags_once(self):
+        """Test cultures having several of the tags are listed once"""
+        tag1 = Tag.objects.create(user=self.user, name='tag1')
+        tag2 = Tag.objects.create(user=self.user, name='tag2')
+        culture = create_culture(user=self.user)
+        culture.tags.add(tag1, tag2)
+        tag_ids = f'{tag1.id},{tag2.id}'
+
+        for param in ['tags', 'tags_any', 'tags_all']:
+            res = self.client.get(CULTURE_URL, {param: tag_ids})
+
+            self.assertEqual(
+                [item['id'] for item in res.data['results']], [culture.id])
 
 
 class CultureImageUploadTests(TestCase):
@@ -7,7 +7,7 @@ from rest_framework.test import APIClient
 from django.test import TestCase
 from django.urls import reverse
 from culture.tests.test_culture_api import create_culture
-from ethnic_group.serializers import TagsSerializer
+from culture.serializers import CultureTagSerializer
 
 from core.models import Tag
 
@@ -37,8 +37,9 @@ class PrivateCultureTags(TestCase):
 
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
-        s1 = TagsSerializer(tag)
-        s2 = TagsSerializer(tag2)
+        tag.refresh_from_db()
+        s1 = CultureTagSerializer(tag)
+        s2 = CultureTagSerializer(tag2)
 
         self.assertIn(s1.data, res.data)
         self.assertNotIn(s2.data, res.data)
@@ -4,15 +4,22 @@ View for culture information
 from rest_framework import (
     viewsets,
     status)
-from rest_framework.authentication import TokenAuthentication
+from core.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from culture import serializers
-from core.models import Culture, Tag
-from core.helpers import _params_to_ints
+from core.cache import CachedListMixin
+from core.conditional import ConditionalMixin
+from core.dynamic_fields import DynamicFieldsMixin
+from core.export import ExportMixin
+from core.lean import LeanListMixin
+from core.query_plans import QueryPlanMixin
+from core.models import Culture, EthnicGroup, Tag
+from core.search import SearchMixin
+from core.tags import TagFilterMixin
 from ethnic_group.views import BaseAttrViewSet
-from ethnic_group.serializers import TagsSerializer
+from ethnic_group.serializers import EthnicGroupSerializer
 
 from drf_spectacular.utils import (
     extend_schema_view,
@@ -25,34 +32,54 @@ from drf_spectacular.utils import (
 @extend_schema_view(
     list=extend_schema(
         parameters=[
+            OpenApiParameter(
+                'tags_all',
+                OpenApiTypes.STR,
+                description='Comma separated list of tag IDs, only cultures '
+                            'with all of them are returned'
+            ),
+            OpenApiParameter(
+                'tags_any',
+                OpenApiTypes.STR,
+                description='Comma separated list of tag IDs, only cultures '
+                            'with at least one of them are returned'
+            ),
             OpenApiParameter(
                 'tags',
                 OpenApiTypes.STR,
-                description='Comma separated list of tag IDs to filter'
+                description='Same as tags_any'
+            ),
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                description='Full text search query, results are ordered '
+                            'by relevance'
             ),
         ]
     )
 )
-class CultureViewSet(viewsets.ModelViewSet):
+class CultureViewSet(CachedListMixin,
+                     ConditionalMixin,
+                     QueryPlanMixin,
+                     SearchMixin,
+                     TagFilterMixin,
+                     DynamicFieldsMixin,
+                     LeanListMixin,
+                     ExportMixin,
+                     viewsets.ModelViewSet):
     """View for managing cultures"""
+    cache_models = [Culture, Tag, EthnicGroup]
     serializer_class = serializers.CultureDetailsSerializer
+    expandable_fields = {'ethnic_group': EthnicGroupSerializer}
     queryset = Culture.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Retrieve culture objects for authenticated users"""
+        queryset = self.search_queryset(self.tag_queryset(self.queryset))
 
-        # filter by tags
-        tags = self.request.query_params.get('tags')
-        queryset = self.queryset
-
-        if tags:
-            # get tag ids
-            tag_ids = _params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tag_ids)
-
-        return queryset.order_by('-id')
+        return self.plan_queryset(queryset.order_by('-id'))
 
     def get_serializer_class(self):
         """Return a serializer class for the request"""
@@ -93,7 +120,7 @@ class CultureViewSet(viewsets.ModelViewSet):
 )
 class TagsViewSet(BaseAttrViewSet):
     """View set for tags"""
-    serializer_class = TagsSerializer
+    serializer_class = serializers.CultureTagSerializer
     queryset = Tag.objects.all()
 
     def get_queryset(self):
@@ -105,5 +132,6 @@ class TagsViewSet(BaseAttrViewSet):
 
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(culture__isnull=False)
-        return queryset.order_by('-name').distinct()
+            # the counter is kept by core.signals, no join to the cultures
+            queryset = queryset.filter(culture_count__gt=0)
+        return queryset.order_by('-name')
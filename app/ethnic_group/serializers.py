@@ -2,7 +2,9 @@
 Serializer for EthnicGroup Api's
 """
 from rest_framework import serializers
+from core.serializers import ImageVariantsField
 from core.models import EthnicGroup, Tag
+from core.helpers import _get_or_create, _set_tags
 
 
 class TagsSerializer(serializers.ModelSerializer):
@@ -12,6 +14,26 @@ class TagsSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
         read_only_fields = ['id']
 
+    def validate_name(self, value):
+        """Reject renaming a tag to another tag of the same user."""
+        # nested tags are looked up by name, see core.helpers
+        if self.instance is not None and Tag.objects.filter(
+                user=self.instance.user_id, name=value).exclude(
+                pk=self.instance.pk).exists():
+            raise serializers.ValidationError(
+                'A tag with this name already exists.')
+
+        return value
+
+
+class TagUsageSerializer(TagsSerializer):
+    """Serializer for tags with the number of groups using them"""
+    usage_count = serializers.IntegerField(
+        source='ethnic_group_count', read_only=True)
+
+    class Meta(TagsSerializer.Meta):
+        fields = TagsSerializer.Meta.fields + ['usage_count']
+
 
 class EthnicGroupSerializer(serializers.ModelSerializer):
     """Serializer for the ethnic group."""
@@ -28,14 +50,7 @@ class EthnicGroupSerializer(serializers.ModelSerializer):
         """Get or create a new tag."""
         auth_user = self.context['request'].user
 
-        for tag in tags:
-            tag_object, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,)
-
-            ethnic_group.tags.add(tag_object)
-
-        return ethnic_group
+        return _get_or_create(auth_user, tags, ethnic_group)
 
     def create(self, validated_data):
         """Create ethnic group override"""
@@ -50,8 +65,7 @@ class EthnicGroupSerializer(serializers.ModelSerializer):
         tags = validated_data.pop('tags', None)
 
         if tags is not None:
-            instance.tags.clear()
-            self._get_or_create(tags, instance)
+            _set_tags(self.context['request'].user, tags, instance)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -62,15 +76,19 @@ class EthnicGroupSerializer(serializers.ModelSerializer):
 
 class EthnicGroupDetailSerializer(EthnicGroupSerializer):
     """Serializer for ethnic group detail view."""
+    image_variants = ImageVariantsField(source='image')
 
     class Meta(EthnicGroupSerializer.Meta):
-        fields = EthnicGroupSerializer.Meta.fields + ['description', 'image']
+        fields = EthnicGroupSerializer.Meta.fields + [
+            'description', 'image', 'image_variants']
 
 
 class EthnicGroupImageSerializer(serializers.ModelSerializer):
     """Serializer for uploading images to ethnic group."""
+    image_variants = ImageVariantsField(source='image')
+
     class Meta:
         model = EthnicGroup
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'image_variants']
         read_only_fields = ['id']
         extra_kwargs = {'image': {'required': True}}
@@ -2,6 +2,8 @@
 Test ethnic group api's
 """
 from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 import tempfile
 import os
@@ -13,6 +15,7 @@ from rest_framework.test import APIClient
 
 from django.contrib.auth import get_user_model
 from core.models import EthnicGroup, Tag
+from core.tags import MAX_FILTER_TAGS
 
 from ethnic_group.serializers import (
     EthnicGroupSerializer,
@@ -94,7 +97,7 @@ class PrivateEthnicGroupTests(TestCase):
         serializer = EthnicGroupSerializer(ethnic_groups, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_create_ethnic_group(self):
         """
@@ -187,6 +190,32 @@ class PrivateEthnicGroupTests(TestCase):
                 name=tag['name']).exists()
             self.assertTrue(exist)
 
+    def test_create_with_many_tags_query_count(self):
+        """Test tag creation runs a fixed number of queries"""
+        Tag.objects.create(user=self.user, name='tag0')
+        payload = {
+            'name': 'Bakalanga',
+            'description': 'The Kalanga are a Bantu-speaking ethnic group.',
+            'language': 'Kalanga',
+            'population': 100,
+        }
+        query_counts = []
+
+        for count in [5, 50]:
+            payload['tags'] = [
+                {'name': f'tag{i}'} for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(
+                    ETHNIC_GROUP_URL, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(res.data['tags']), count)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 50)
+
     def test_create_tag_on_group_update(self):
         """Test creating a new tag on group update"""
 
@@ -202,6 +231,44 @@ class PrivateEthnicGroupTests(TestCase):
         new_tag = Tag.objects.get(user=self.user, name='tag3')
         self.assertIn(new_tag, ethnic_group[0].tags.all())
 
+    def test_update_tags_writes_only_changes(self):
+        """Test updating tags only inserts and deletes changed rows"""
+        ethnic_group = create_ethnic_group(user=self.user)
+        kept = Tag.objects.create(user=self.user, name='kept')
+        removed = Tag.objects.create(user=self.user, name='removed')
+        ethnic_group.tags.add(kept, removed)
+        through = EthnicGroup.tags.through
+        kept_row = through.objects.get(ethnicgroup=ethnic_group, tag=kept)
+
+        payload = {'tags': [{'name': 'kept'}, {'name': 'added'}]}
+        res = self.client.patch(
+            detail_url(ethnic_group.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(tag['name'] for tag in res.data['tags']),
+            ['added', 'kept'])
+        self.assertTrue(through.objects.filter(id=kept_row.id).exists())
+
+    def test_update_with_same_tags_skips_m2m_writes(self):
+        """Test resending the current tags does not rewrite them"""
+        ethnic_group = create_ethnic_group(user=self.user)
+        ethnic_group.tags.add(Tag.objects.create(user=self.user, name='t1'))
+        payload = {'tags': [{'name': 't1'}]}
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.patch(
+                detail_url(ethnic_group.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        through_table = EthnicGroup.tags.through._meta.db_table
+        writes = [
+            query['sql'] for query in queries
+            if through_table in query['sql']
+            and query['sql'].startswith(('INSERT', 'DELETE'))
+        ]
+        self.assertEqual(writes, [])
+
     def test_clear_tag(self):
         """Test clearing a tag"""
 
@@ -218,6 +285,33 @@ class PrivateEthnicGroupTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertNotIn(tag, ethnic_group.tags.all())
 
+    def test_list_query_count_is_constant(self):
+        """Test listing groups runs a fixed number of queries"""
+        tag = Tag.objects.create(user=self.user, name='tag1')
+
+        for count in [2, 10]:
+            for _ in range(count):
+                ethnic_group = create_ethnic_group(user=self.user)
+                ethnic_group.tags.add(tag)
+
+            # one query each for the groups and tags
+            with self.assertNumQueries(2):
+                res = self.client.get(ETHNIC_GROUP_URL)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_get_ethnic_group_details_query_count(self):
+        """Test group details prefetch tags in a single query"""
+        ethnic_group = create_ethnic_group(user=self.user)
+        ethnic_group.tags.add(
+            Tag.objects.create(user=self.user, name='tag1'),
+            Tag.objects.create(user=self.user, name='tag2'))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(ethnic_group.id))
+
+        self.assertEqual(len(res.data['tags']), 2)
+
     def test_filter_by_tag(self):
         """Test filtering groups by tag"""
         group1 = create_ethnic_group(user=self.user, name='Group 1')
@@ -237,9 +331,72 @@ class PrivateEthnicGroupTests(TestCase):
         s2 = EthnicGroupSerializer(group2)
         s3 = EthnicGroupSerializer(group3)
 
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        self.assertIn(s1.data, res.data['results'])
+        self.assertIn(s2.data, res.data['results'])
+        self.assertNotIn(s3.data, res.data['results'])
+
+    def test_filter_by_all_or_any_tags(self):
+        """Test filtering groups having all or any of the tags"""
+        tag1 = Tag.objects.create(user=self.user, name='tag1')
+        tag2 = Tag.objects.create(user=self.user, name='tag2')
+        both = create_ethnic_group(user=self.user, name='Both')
+        both.tags.add(tag1, tag2)
+        one = create_ethnic_group(user=self.user, name='One')
+        one.tags.add(tag1)
+        create_ethnic_group(user=self.user, name='None')
+        tag_ids = f'{tag1.id},{tag2.id}'
+
+        res_all = self.client.get(ETHNIC_GROUP_URL, {'tags_all': tag_ids})
+        res_any = self.client.get(ETHNIC_GROUP_URL, {'tags_any': tag_ids})
+
+        self.assertEqual(
+            [group['id'] for group in res_all.data['results']], [both.id])
+        self.assertEqual(
+            [group['id'] for group in res_any.data['results']],
+            [one.id, both.id])
+
+    def test_filter_by_invalid_tags(self):
+        """Test tag filters that aren't tag ids are rejected"""
+        res = self.client.get(ETHNIC_GROUP_URL, {'tags_all': '1,dance'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('tags_all', res.data)
+
+    def test_filter_by_too_many_tags(self):
+        """Test tag filters with more ids than the cap are rejected"""
+        tag_ids = ','.join(str(i) for i in range(1, MAX_FILTER_TAGS + 2))
+
+        res = self.client.get(ETHNIC_GROUP_URL, {'tags_all': tag_ids})
+        res_repeated = self.client.get(
+            ETHNIC_GROUP_URL, {'tags_all': ','.join(['1'] * 50)})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('tags_all', res.data)
+        self.assertEqual(res_repeated.status_code, status.HTTP_200_OK)
+
+    def test_search_orders_by_rank(self):
+        """Test ?q= returns matches best first across pages"""
+        create_ethnic_group(
+            user=self.user, name='Bakalanga',
+            description='Kalanga speaking people', history='')
+        create_ethnic_group(
+            user=self.user, name='Basarwa',
+            description='Hunter gatherers', history='Met the Bakalanga')
+        create_ethnic_group(
+            user=self.user, name='Bakalanga ba Mangwe',
+            description='Bakalanga of Mangwe')
+        create_ethnic_group(user=self.user, name='Bakgatla')
+
+        first = self.client.get(
+            ETHNIC_GROUP_URL, {'q': 'bakalanga', 'page_size': 2})
+        second = self.client.get(first.data['next'])
+
+        names = [
+            group['name']
+            for group in first.data['results'] + second.data['results']
+        ]
+        self.assertEqual(
+            names, ['Bakalanga ba Mangwe', 'Bakalanga', 'Basarwa'])
 
 
 class ImageUploadTests(TestCase):
@@ -1,6 +1,7 @@
 """
 Tests for the tags API.
 """
+from core.cache import get_cache
 from core.helpers import create_user
 
 from django.test import TestCase
@@ -8,10 +9,11 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import Tag, EthnicGroup
-from ethnic_group.serializers import TagsSerializer
+from core.models import Culture, Tag, EthnicGroup
+from ethnic_group.serializers import TagUsageSerializer
 
 TAGS_URL = reverse('ethnic_group:tag-list')
+AUTOCOMPLETE_URL = reverse('ethnic_group:tag-autocomplete')
 
 
 def detail_url(tag_id):
@@ -29,6 +31,12 @@ class PublicTagsApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_autocomplete_auth_required(self):
+        """Test authentication is required for the autocomplete"""
+        res = self.client.get(AUTOCOMPLETE_URL, {'prefix': 'da'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
 
 class PrivateTagsApiTests(TestCase):
     """Private tags API tests"""
@@ -51,7 +59,7 @@ class PrivateTagsApiTests(TestCase):
         res = self.client.get(TAGS_URL)
 
         tags = Tag.objects.all().order_by("-name")
-        serializer = TagsSerializer(tags, many=True)
+        serializer = TagUsageSerializer(tags, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
@@ -69,6 +77,18 @@ class PrivateTagsApiTests(TestCase):
         tag.refresh_from_db()
         self.assertEqual(tag.name, payload['name'])
 
+    def test_update_tag_to_existing_name(self):
+        """Test renaming a tag to another tag of the user is rejected"""
+        Tag.objects.create(name='taken', user=self.user)
+        tag = Tag.objects.create(name='test tag 1', user=self.user)
+
+        res = self.client.patch(detail_url(tag.id), {'name': 'taken'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', res.data)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, 'test tag 1')
+
     def test_delete_tag(self):
         """Test deleting tag"""
 
@@ -102,8 +122,9 @@ class PrivateTagsApiTests(TestCase):
 
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
-        s1 = TagsSerializer(tag1)
-        s2 = TagsSerializer(tag2)
+        tag1.refresh_from_db()
+        s1 = TagUsageSerializer(tag1)
+        s2 = TagUsageSerializer(tag2)
         self.assertIn(s1.data, res.data)
         self.assertNotIn(s2.data, res.data)
 
@@ -137,3 +158,158 @@ class PrivateTagsApiTests(TestCase):
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
         self.assertEqual(len(res.data), 1)
+
+    def test_usage_counts(self):
+        """Test usage counts follow the links of groups to tags"""
+        tag = Tag.objects.create(user=self.user, name='tag1')
+        other = Tag.objects.create(user=self.user, name='tag2')
+        groups = [
+            EthnicGroup.objects.create(
+                user=self.user, name=f'Group {number}', population=100)
+            for number in range(3)
+        ]
+
+        def counts():
+            return [
+                Tag.objects.get(pk=tag.pk).ethnic_group_count,
+                Tag.objects.get(pk=other.pk).ethnic_group_count,
+            ]
+
+        groups[0].tags.add(tag, other)
+        groups[0].tags.add(tag)
+        tag.ethnicgroup_set.add(groups[1], groups[2])
+        self.assertEqual(counts(), [3, 1])
+
+        groups[1].tags.remove(tag, other)
+        tag.ethnicgroup_set.remove(groups[2])
+        self.assertEqual(counts(), [1, 1])
+
+        groups[0].tags.set([other])
+        groups[2].tags.set([tag, other])
+        self.assertEqual(counts(), [1, 2])
+
+        groups[0].delete()
+        self.assertEqual(counts(), [1, 1])
+
+        other.ethnicgroup_set.clear()
+        groups[2].tags.clear()
+        self.assertEqual(counts(), [0, 0])
+
+    def test_usage_counts_per_model(self):
+        """Test tags count ethnic groups and cultures apart"""
+        tag = Tag.objects.create(user=self.user, name='tag1')
+        ethnic_group = EthnicGroup.objects.create(
+            user=self.user, name='Group', population=100)
+        ethnic_group.tags.add(tag)
+        Culture.objects.create(user=self.user, name='Culture').tags.add(tag)
+        Culture.objects.create(user=self.user, name='Other').tags.add(tag)
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.data[0]['usage_count'], 1)
+        tag.refresh_from_db()
+        self.assertEqual(tag.culture_count, 2)
+
+    def test_saving_tag_keeps_usage_count(self):
+        """Test saving a tag loaded before it was used keeps its count"""
+        tag = Tag.objects.create(user=self.user, name='tag1')
+        ethnic_group = EthnicGroup.objects.create(
+            user=self.user, name='Group', population=100)
+        ethnic_group.tags.add(tag)
+
+        res = self.client.patch(detail_url(tag.id), {'name': 'renamed'})
+        tag.name = 'renamed again'
+        tag.save()
+
+        self.assertEqual(res.data['usage_count'], 1)
+        tag.refresh_from_db()
+        self.assertEqual(tag.ethnic_group_count, 1)
+
+
+class TagAutocompleteTests(TestCase):
+    """Tests for the tag autocomplete"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123')
+        self.client.force_authenticate(self.user)
+        # a new version of the tags, so no earlier results are served
+        get_cache().clear()
+
+        self.groups = [
+            EthnicGroup.objects.create(
+                user=self.user, name=f'Group {number}', population=100)
+            for number in range(3)
+        ]
+
+    def _tag(self, name, uses):
+        """Create a tag used by the first uses groups"""
+        tag = Tag.objects.create(user=self.user, name=name)
+        tag.ethnicgroup_set.add(*self.groups[:uses])
+        return tag
+
+    def _names(self, params):
+        """Return the names of the tags suggested for params"""
+        res = self.client.get(AUTOCOMPLETE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        return [tag['name'] for tag in res.data]
+
+    def test_most_used_first(self):
+        """Test tags matching the prefix are ranked by usage"""
+        self._tag('Dance', 1)
+        self._tag('dancing', 3)
+        self._tag('Dialect', 0)
+        self._tag('Oral', 2)
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'prefix': 'dan'})
+
+        self.assertEqual(
+            [(tag['name'], tag['usage_count']) for tag in res.data],
+            [('dancing', 3), ('Dance', 1)])
+        self.assertEqual(
+            self._names({'prefix': 'D', 'limit': 2}), ['dancing', 'Dance'])
+
+    def test_prefix_is_literal(self):
+        """Test LIKE wildcards in the prefix match themselves"""
+        self._tag('100% cotton', 0)
+        self._tag('1000 hills', 0)
+
+        self.assertEqual(self._names({'prefix': '100%'}), ['100% cotton'])
+
+    def test_own_tags_only(self):
+        """Test only the tags of the user are suggested, also from memory"""
+        self._tag('Dance', 1)
+        other = create_user(
+            email='other@example.com', password='testpassword123')
+        Tag.objects.create(user=other, name='Dancing')
+        self.assertEqual(self._names({'prefix': 'da'}), ['Dance'])
+
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self._names({'prefix': 'da'}), ['Dancing'])
+
+    def test_invalid_limit(self):
+        """Test limits out of range are rejected"""
+        for limit in ['0', '51', 'ten']:
+            res = self.client.get(AUTOCOMPLETE_URL, {'limit': limit})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_results(self):
+        """Test repeated prefixes are answered from memory until tags change"""
+        tag = self._tag('Dance', 1)
+        self._names({'prefix': 'da'})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._names({'prefix': 'da'}), ['Dance'])
+
+        tag.ethnicgroup_set.add(self.groups[1])
+        self._tag('Dancing', 0)
+        res = self.client.get(AUTOCOMPLETE_URL, {'prefix': 'da'})
+
+        self.assertEqual(
+            [(tag['name'], tag['usage_count']) for tag in res.data],
+            [('Dance', 2), ('Dancing', 0)])
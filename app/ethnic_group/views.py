@@ -3,11 +3,20 @@ View for the ethnic group
 """
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.authentication import TokenAuthentication
+from core.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from ethnic_group import serializers
+from core.cache import CachedListMixin
+from core.conditional import ConditionalMixin
+from core.dynamic_fields import DynamicFieldsMixin
+from core.export import ExportMixin
+from core.lean import LeanListMixin
 from core.models import EthnicGroup, Tag
+from core.query_plans import QueryPlanMixin
+from core.search import SearchMixin
+from core.tags import TagFilterMixin, autocomplete_tags
 
 from drf_spectacular.utils import (
     extend_schema_view,
@@ -16,42 +25,65 @@ from drf_spectacular.utils import (
     OpenApiTypes,
 )
 
+AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+
 
 @extend_schema_view(
     list=extend_schema(
         parameters=[
+            OpenApiParameter(
+                'tags_all',
+                OpenApiTypes.STR,
+                description='Comma separated list of tag IDs, only groups '
+                            'with all of them are returned'
+            ),
+            OpenApiParameter(
+                'tags_any',
+                OpenApiTypes.STR,
+                description='Comma separated list of tag IDs, only groups '
+                            'with at least one of them are returned'
+            ),
             OpenApiParameter(
                 'tags',
                 OpenApiTypes.STR,
-                description='Comma separated list of tag IDs to filter'
+                description='Same as tags_any'
+            ),
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                description='Full text search query, results are ordered '
+                            'by relevance'
             ),
         ]
     )
 )
-class EthnicGroupViewSet(viewsets.ModelViewSet):
+class EthnicGroupViewSet(CachedListMixin,
+                         ConditionalMixin,
+                         QueryPlanMixin,
+                         SearchMixin,
+                         TagFilterMixin,
+                         DynamicFieldsMixin,
+                         LeanListMixin,
+                         ExportMixin,
+                         viewsets.ModelViewSet):
     """View for managing ethnic groups"""
+    cache_models = [EthnicGroup, Tag]
 
     serializer_class = serializers.EthnicGroupDetailSerializer
     queryset = EthnicGroup.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def _params_to_ints(self, qs):
-        """Convert a list of string to integers"""
-        return [int(x) for x in qs.split(',')]
+    query_plan_actions = ['list', 'retrieve', 'upload_image']
 
     def get_queryset(self):
         """Retrieve ethnic group objects for authenticated users"""
-        tags = self.request.query_params.get('tags')
-        queryset = self.queryset
+        queryset = self.search_queryset(self.tag_queryset(self.queryset))
 
-        if tags:
-            tag_ids = self._params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tag_ids)
-
-        return queryset.filter(
+        return self.plan_queryset(queryset.filter(
             user=self.request.user
-            ).order_by('-id').distinct()
+            ).order_by('-id'))
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -96,14 +128,16 @@ class BaseAttrViewSet(mixins.DestroyModelMixin,
                       mixins.ListModelMixin,
                       viewsets.GenericViewSet):
     """Base viewset for ethnicgroup attributes"""
-    authentication_classes = [TokenAuthentication]
-    permissions_classes = [IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    # attributes are short lists ordered by name
+    pagination_class = None
 
 
 class TagsViewSet(BaseAttrViewSet):
     """View set for tags."""
 
-    serializer_class = serializers.TagsSerializer
+    serializer_class = serializers.TagUsageSerializer
     queryset = Tag.objects.all()
 
     def get_queryset(self):
@@ -113,5 +147,41 @@ class TagsViewSet(BaseAttrViewSet):
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(ethnicgroup__isnull=False)
-        return queryset.order_by('-name').distinct()
+            # the counter is kept by core.signals, no join to the groups
+            queryset = queryset.filter(ethnic_group_count__gt=0)
+        return queryset.order_by('-name')
+
+    def _get_limit(self, request):
+        """Return the number of tags asked for with ?limit=."""
+        try:
+            limit = int(
+                request.query_params.get('limit', AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= MAX_AUTOCOMPLETE_LIMIT:
+            raise ValidationError(
+                {'limit': f'Must be between 1 and {MAX_AUTOCOMPLETE_LIMIT}.'})
+
+        return limit
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'prefix', OpenApiTypes.STR,
+                description='Start of the tag names, case insensitive'),
+            OpenApiParameter(
+                'limit', OpenApiTypes.INT,
+                description='Number of tags, at most '
+                            f'{MAX_AUTOCOMPLETE_LIMIT}'),
+        ],
+        responses=serializers.TagUsageSerializer(many=True),
+    )
+    @action(methods=['GET'], detail=False)
+    def autocomplete(self, request):
+        """Return the tags starting with a prefix, most used first."""
+        prefix = request.query_params.get('prefix', '').strip()
+        tags = autocomplete_tags(
+            EthnicGroup, request.user, prefix, self._get_limit(request))
+
+        return Response(
+            serializers.TagUsageSerializer(tags, many=True).data)
@@ -2,14 +2,18 @@
 Serializer for Event API's
 """
 from rest_framework import serializers
+from core.images import schedule_variants
+from core.serializers import ImageVariantsField
 from core.models import Event, EventImages
 
 
 class EventImagesSerializer(serializers.ModelSerializer):
     """Serializer for event images view"""
+    variants = ImageVariantsField(source='images')
+
     class Meta:
         model = EventImages
-        fields = ['id', 'event', 'images']
+        fields = ['id', 'event', 'images', 'variants']
         read_only_fields = ['id']
 
 
@@ -33,10 +37,12 @@ class EventSerializer(serializers.ModelSerializer):
         event = Event.objects.create(**validated_data)
 
         if images is not None:
-            EventImages.objects.bulk_create(
+            created = EventImages.objects.bulk_create(
                 [EventImages(event=event,
                              images=image_data) for image_data in images]
             )
+            schedule_variants(
+                (image.images.name for image in created), EventImages)
 
         return event
 
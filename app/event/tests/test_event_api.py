@@ -81,7 +81,33 @@ class PrivateEventTests(TestCase):
         serializer = EventSerializer(events, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_list_query_count_is_constant(self):
+        """Test listing events prefetches images in one query"""
+        for count in [2, 10]:
+            for _ in range(count):
+                event = create_event(user=self.user)
+                EventImages.objects.create(
+                    event=event, images='uploads/test/event.jpg')
+
+            # one query each for the events and images
+            with self.assertNumQueries(2):
+                res = self.client.get(EVENT_URL)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data['results'][0]['images']), 1)
+
+    def test_filter_by_event_type(self):
+        """Test filtering events by type"""
+        create_event(user=self.user)
+        ritual = Event.objects.create(
+            user=self.user, name='Rain making', event_type='ritual')
+
+        res = self.client.get(EVENT_URL, {'event_type': 'ritual'})
+
+        self.assertEqual(
+            [event['id'] for event in res.data['results']], [ritual.id])
 
     def test_create_event(self):
         """Test creating an event"""
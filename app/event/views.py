@@ -2,24 +2,70 @@
 View for event information
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from core.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from core.models import Event
+from core.choices import EVENT_TYPE_CHOICES
+from core.conditional import ConditionalMixin
+from core.dynamic_fields import DynamicFieldsMixin
+from core.export import ExportMixin
+from core.lean import LeanListMixin
+from core.models import Event, EventImages
+from core.query_plans import QueryPlanMixin
+from core.search import SearchMixin
 from event import serializers
 from rest_framework.parsers import MultiPartParser, FormParser
 
+from drf_spectacular.utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes,
+)
 
-class EventViewSet(viewsets.ModelViewSet):
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                description='Full text search query, results are ordered '
+                            'by relevance'
+            ),
+            OpenApiParameter(
+                'event_type',
+                OpenApiTypes.STR,
+                enum=[value for value, _label in EVENT_TYPE_CHOICES],
+                description='Filter by event type'
+            ),
+        ]
+    )
+)
+class EventViewSet(ConditionalMixin,
+                   QueryPlanMixin,
+                   SearchMixin,
+                   DynamicFieldsMixin,
+                   LeanListMixin,
+                   ExportMixin,
+                   viewsets.ModelViewSet):
     """View for managing event information"""
+    cache_models = [Event, EventImages]
     parser_classes = (MultiPartParser, FormParser)
     serializer_class = serializers.EventDetailsSerializer
     queryset = Event.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Retrieve event objects for authenticated users."""
-        return self.queryset.order_by('-id')
+        queryset = self.queryset
+        event_type = self.request.query_params.get('event_type')
+        if event_type:
+            queryset = queryset.filter(event_type=event_type)
+
+        queryset = self.search_queryset(queryset)
+
+        return self.plan_queryset(queryset.order_by('-id'))
 
     def get_serializer_class(self):
         """Return a serializer class for the request"""
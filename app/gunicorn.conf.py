@@ -0,0 +1,48 @@
+"""
+Gunicorn settings for production
+
+Read by gunicorn from the working directory, start the api from the app
+folder with `gunicorn app.wsgi`. The GUNICORN_* environment variables
+override the defaults derived from the CPU count.
+"""
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# processes run the python code in parallel, threads overlap the time
+# a request waits on the database. Each thread holds a db connection.
+workers = int(os.environ.get('GUNICORN_WORKERS', 2 * cpu_count + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# import django once in the master, workers share the loaded code
+preload_app = True
+
+# recycle workers after a number of requests, jittered so they don't
+# restart together, and give requests in flight time to finish
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+graceful_timeout = 30
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+
+# seconds an idle keep-alive connection is kept open, behind a load
+# balancer set it above the idle timeout of the balancer
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# heartbeat files on a tmpfs, a slow disk would stall the workers
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# empty disables the access log
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+
+def when_ready(server):
+    """Close connections opened by the master before workers fork."""
+    from django.db import connections
+
+    connections.close_all()
@@ -2,24 +2,34 @@
 View for publisher information
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from core.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from core.conditional import ConditionalMixin
+from core.dynamic_fields import DynamicFieldsMixin
+from core.export import ExportMixin
+from core.lean import LeanListMixin
+from core.query_plans import QueryPlanMixin
 from core.models import Publisher
 from publisher import serializers
 from rest_framework.parsers import MultiPartParser, FormParser
 
 
-class PublisherViewSet(viewsets.ModelViewSet):
+class PublisherViewSet(ConditionalMixin,
+                       QueryPlanMixin,
+                       DynamicFieldsMixin,
+                       LeanListMixin,
+                       ExportMixin,
+                       viewsets.ModelViewSet):
     """View for managing publisher information"""
 
     parser_classes = (MultiPartParser, FormParser)
     serializer_class = serializers.PublisherDetailsSerializer
     queryset = Publisher.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.order_by('-id')
+        return self.plan_queryset(self.queryset.order_by('-id'))
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -0,0 +1,12 @@
+"""
+Serializer for the search api
+"""
+from rest_framework import serializers
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Serializer for a search result of any type"""
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    rank = serializers.FloatField()
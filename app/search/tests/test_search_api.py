@@ -0,0 +1,87 @@
+"""
+Test search api
+"""
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.helpers import create_user
+from core.models import Artifacts, Culture, EthnicGroup, Event
+
+
+SEARCH_URL = reverse('search:search')
+
+
+class PublicSearchTestCase(TestCase):
+    """Test unauthenticated search requests"""
+
+    def test_auth_required(self):
+        """Test auth is required to search"""
+        res = APIClient().get(SEARCH_URL, {'q': 'dance'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateSearchTestCase(TestCase):
+    """Test authenticated search requests"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+        self.group = EthnicGroup.objects.create(
+            user=self.user, name='Bakgatla', population=100,
+            description='Known for the dance of the hoe')
+        self.culture = Culture.objects.create(
+            user=self.user, name='Setapa dance')
+        self.event = Event.objects.create(
+            user=self.user, name='Maitisong festival',
+            description='Music and dance')
+        Artifacts.objects.create(
+            user=self.user, artifact_name='Clay pot',
+            artifact_type='pottery')
+
+    def test_search_merges_types_by_rank(self):
+        """Test results of every type are merged best first"""
+        res = self.client.get(SEARCH_URL, {'q': 'dance'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+        self.assertEqual(
+            (res.data[0]['type'], res.data[0]['id']),
+            ('culture', self.culture.id))
+        ranks = [result['rank'] for result in res.data]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_search_types_and_limit(self):
+        """Test results can be limited to some types and a count"""
+        res = self.client.get(
+            SEARCH_URL, {'q': 'dance', 'types': 'event,ethnic_group',
+                         'limit': 1})
+
+        self.assertEqual(len(res.data), 1)
+        self.assertIn(res.data[0]['type'], ['event', 'ethnic_group'])
+
+    def test_other_users_ethnic_groups_are_hidden(self):
+        """Test ethnic groups of other users are not searched"""
+        other_user = create_user(
+            email='other@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(other_user)
+
+        res = self.client.get(SEARCH_URL, {'q': 'hoe'})
+
+        self.assertEqual(res.data, [])
+
+    def test_invalid_params(self):
+        """Test a missing query or unknown type is rejected"""
+        for params in [{}, {'q': 'dance', 'types': 'chief'},
+                       {'q': 'dance', 'limit': 0}]:
+            res = self.client.get(SEARCH_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,11 @@
+"""
+URL mappings for the search app
+"""
+from django.urls import path
+from search import views
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', views.SearchView.as_view(), name='search'),
+]
@@ -0,0 +1,113 @@
+"""
+View for searching across the api's
+"""
+from django.db.models import F
+from core.authentication import CachedTokenAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.models import Artifacts, Culture, EthnicGroup, Event
+from core.search import search
+from search import serializers
+
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes,
+)
+
+# result type, model and the column returned as the result name
+SEARCH_TYPES = {
+    'ethnic_group': (EthnicGroup, 'name'),
+    'culture': (Culture, 'name'),
+    'event': (Event, 'name'),
+    'artifacts': (Artifacts, 'artifact_name'),
+}
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class SearchView(APIView):
+    """Search ethnic groups, cultures, events and artifacts at once"""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def _get_types(self, request):
+        """Return the result types named by ?types=, default all."""
+        types = request.query_params.get('types')
+        if not types:
+            return list(SEARCH_TYPES)
+
+        types = types.split(',')
+        unknown = [name for name in types if name not in SEARCH_TYPES]
+        if unknown:
+            raise ValidationError(
+                {'types': f'Unknown types: {", ".join(unknown)}.'})
+
+        return types
+
+    def _get_limit(self, request):
+        """Return the number of results asked for with ?limit=."""
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= MAX_LIMIT:
+            raise ValidationError(
+                {'limit': f'Must be between 1 and {MAX_LIMIT}.'})
+
+        return limit
+
+    def _get_queryset(self, name, model):
+        """Return the rows of a type the user can see."""
+        queryset = model.objects.all()
+        if name == 'ethnic_group':
+            # ethnic groups are listed per user
+            queryset = queryset.filter(user=self.request.user)
+
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'q', OpenApiTypes.STR, required=True,
+                description='Search query, quoted phrases, OR and '
+                            '-excluded words are supported'),
+            OpenApiParameter(
+                'types', OpenApiTypes.STR,
+                description='Comma separated result types out of '
+                            + ', '.join(SEARCH_TYPES)),
+            OpenApiParameter(
+                'limit', OpenApiTypes.INT,
+                description=f'Number of results, at most {MAX_LIMIT}'),
+        ],
+        responses=serializers.SearchResultSerializer(many=True),
+    )
+    def get(self, request):
+        """Return the best matches of every type merged by rank."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'This parameter is required.'})
+        limit = self._get_limit(request)
+
+        results = []
+        for name in self._get_types(request):
+            model, name_column = SEARCH_TYPES[name]
+            # the best `limit` of each type are enough to merge
+            rows = search(
+                self._get_queryset(name, model), query
+            ).order_by('-search_rank', '-id').values(
+                'id', 'search_rank', result_name=F(name_column)
+            )[:limit]
+            results += [
+                {'type': name, 'id': row['id'],
+                 'name': row['result_name'], 'rank': row['search_rank']}
+                for row in rows
+            ]
+
+        results.sort(key=lambda result: result['rank'], reverse=True)
+        serializer = serializers.SearchResultSerializer(
+            results[:limit], many=True)
+
+        return Response(serializer.data)
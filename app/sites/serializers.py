@@ -2,14 +2,27 @@
 Serializer for sites app api's
 """
 from rest_framework import serializers
+from core.bulk import BulkListSerializer, BulkPrimaryKeyRelatedField
+from core.images import schedule_variants
+from core.serializers import ImageVariantsField
 from core.models import Site, SiteImages
 
 
+class SiteClusterSerializer(serializers.Serializer):
+    """Serializer for map clusters of sites"""
+    geohash = serializers.CharField(source='cell')
+    count = serializers.IntegerField()
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+
+
 class SiteImagesSerializer(serializers.ModelSerializer):
     """Serializer for site images view"""
+    variants = ImageVariantsField(source='images')
+
     class Meta:
         model = SiteImages
-        fields = ['id', 'site', 'images']
+        fields = ['id', 'site', 'images', 'variants']
         read_only_fields = ['id']
 
 
@@ -33,10 +46,12 @@ class SiteSerializer(serializers.ModelSerializer):
         site = Site.objects.create(**validated_data)
 
         if images is not None:
-            SiteImages.objects.bulk_create(
+            created = SiteImages.objects.bulk_create(
                 [SiteImages(site=site,
                             images=image_data) for image_data in images]
             )
+            schedule_variants(
+                (image.images.name for image in created), SiteImages)
 
         return site
 
@@ -58,3 +73,18 @@ class SiteDetailsSerializer(SiteSerializer):
             'latitude', 'longitude',
             'importance', 'sensitivity',
             'description']
+
+
+class SiteBulkSerializer(serializers.ModelSerializer):
+    """Serializer for creating or updating sites in bulk"""
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
+    class Meta:
+        model = Site
+        fields = ['id', 'site_name', 'site_type',
+                  'culture', 'ethnic_group',
+                  'latitude', 'longitude',
+                  'importance', 'sensitivity',
+                  'description']
+        read_only_fields = ['id']
+        list_serializer_class = BulkListSerializer
@@ -5,6 +5,7 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from core.geo import geohash_encode
 from core.helpers import create_user, get_image, os
 from core.models import (
     EthnicGroup,
@@ -15,6 +16,8 @@ from sites.serializers import SiteDetailsSerializer
 
 
 SITES_URL = reverse('sites:sites-list')
+CLUSTERS_URL = reverse('sites:sites-clusters')
+BULK_URL = reverse('sites:sites-bulk-create')
 
 
 def create_site(user, **params):
@@ -103,6 +106,31 @@ class PrivateSitesTestCase(TestCase):
         sites = Site.objects.all()
         self.assertEqual(sites.count(), 1)
 
+    def test_list_query_count_is_constant(self):
+        """Test listing sites prefetches images in one query"""
+        for count in [2, 10]:
+            for _ in range(count):
+                site = create_site(user=self.user)
+                SiteImages.objects.create(
+                    site=site, images='uploads/test/site.jpg')
+
+            # one query each for the sites and images
+            with self.assertNumQueries(2):
+                res = self.client.get(SITES_URL)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data['results'][0]['images']), 1)
+
+    def test_filter_by_site_type(self):
+        """Test filtering sites by type"""
+        create_site(user=self.user)
+        natural = create_site(user=self.user, site_type='natural')
+
+        res = self.client.get(SITES_URL, {'site_type': 'natural'})
+
+        self.assertEqual(
+            [site['id'] for site in res.data['results']], [natural.id])
+
     def test_create_site(self):
         """Test creating a new site"""
 
@@ -238,3 +266,202 @@ class SiteImageUploadTestCase(TestCase):
         site_images = SiteImages.objects.filter(site_id=res.data['id'])
         self.assertIn('images', res.data)
         self.assertTrue(os.path.exists(site_images[0].images.path))
+
+
+class SiteGeoFilterTestCase(TestCase):
+    """Tests for bounding box and radius filters"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+        self.gaborone = Site.objects.create(
+            user=self.user, site_name='Gaborone', site_type='cultural',
+            latitude=-24.653257, longitude=25.906792)
+        self.mochudi = Site.objects.create(
+            user=self.user, site_name='Mochudi', site_type='cultural',
+            latitude=-24.376700, longitude=26.150000)
+        self.tsodilo = Site.objects.create(
+            user=self.user, site_name='Tsodilo', site_type='cultural',
+            latitude=-18.750000, longitude=21.733300)
+
+    def _site_names(self, params):
+        """Return the names of the sites listed with params"""
+        res = self.client.get(SITES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {site['site_name'] for site in res.data['results']}
+
+    def test_filter_by_bbox(self):
+        """Test only sites inside the bounding box are returned"""
+        names = self._site_names({'bbox': '25.5,-25,26.5,-24'})
+
+        self.assertEqual(names, {'Gaborone', 'Mochudi'})
+
+    def test_filter_near_point(self):
+        """Test radius search refines the box with the real distance"""
+        # Mochudi is about 40km from Gaborone
+        near = {'near': '-24.653257,25.906792'}
+
+        self.assertEqual(
+            self._site_names({**near, 'radius_km': 30}), {'Gaborone'})
+        self.assertEqual(
+            self._site_names({**near, 'radius_km': 45}),
+            {'Gaborone', 'Mochudi'})
+
+    def test_radius_excludes_box_corners(self):
+        """Test a site inside the box but outside the circle is dropped"""
+        # the box around a 40km circle reaches ~40km north and ~40km
+        # east, its north east corner is ~56km from the centre
+        Site.objects.create(
+            user=self.user, site_name='Corner', site_type='natural',
+            latitude=-24.653257 + 0.35, longitude=25.906792 + 0.38)
+
+        names = self._site_names(
+            {'near': '-24.653257,25.906792', 'radius_km': 42})
+
+        self.assertNotIn('Corner', names)
+
+    def test_invalid_geo_params(self):
+        """Test malformed coordinates are rejected"""
+        for params in [
+            {'bbox': '1,2,3'},
+            {'bbox': 'a,b,c,d'},
+            {'near': '-95,25'},
+            {'near': '-24,25', 'radius_km': -1},
+        ]:
+            res = self.client.get(SITES_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SiteClusterTestCase(TestCase):
+    """Tests for the map clusters endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+        for name, latitude, longitude in [
+            ('Gaborone', -24.653257, 25.906792),
+            ('Mochudi', -24.376700, 26.150000),
+            ('Tsodilo', -18.750000, 21.733300),
+        ]:
+            Site.objects.create(
+                user=self.user, site_name=name, site_type='cultural',
+                latitude=latitude, longitude=longitude)
+        Site.objects.create(
+            user=self.user, site_name='Unmapped', site_type='cultural',
+            latitude=None, longitude=None)
+
+    def test_geohash_is_kept_in_step(self):
+        """Test saving a site recomputes its geohash"""
+        site = Site.objects.get(site_name='Unmapped')
+        self.assertEqual(site.geohash, '')
+
+        site.latitude = 57.64911
+        site.longitude = 10.40744
+        site.save(update_fields=['latitude', 'longitude'])
+        site.refresh_from_db()
+
+        self.assertEqual(site.geohash[:11], 'u4pruydqqvj')
+
+    def test_low_zoom_merges_nearby_sites(self):
+        """Test nearby sites share a cluster when zoomed out"""
+        with self.assertNumQueries(1):
+            res = self.client.get(CLUSTERS_URL, {'zoom': 4})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [cluster['count'] for cluster in res.data], [2, 1])
+        self.assertAlmostEqual(
+            res.data[0]['latitude'], (-24.653257 - 24.3767) / 2, places=5)
+        self.assertEqual(len(res.data[0]['geohash']), 3)
+
+    def test_high_zoom_splits_clusters(self):
+        """Test sites get their own cluster when zoomed in"""
+        res = self.client.get(CLUSTERS_URL, {'zoom': 12})
+
+        self.assertEqual(
+            [cluster['count'] for cluster in res.data], [1, 1, 1])
+
+    def test_clusters_in_bbox(self):
+        """Test only sites inside the bounding box are clustered"""
+        res = self.client.get(
+            CLUSTERS_URL, {'zoom': 4, 'bbox': '25.5,-25,26.5,-24'})
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]['count'], 2)
+
+    def test_invalid_zoom(self):
+        """Test a missing or out of range zoom is rejected"""
+        for params in [{}, {'zoom': 'far'}, {'zoom': 30}]:
+            res = self.client.get(CLUSTERS_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkSitesTestCase(TestCase):
+    """Tests for bulk create and update of sites"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='testuser@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+        self.ethnic_group = EthnicGroup.objects.create(
+            user=self.user, name='Tswana', population=100)
+
+    def test_bulk_create_looks_up_relations_once(self):
+        """Test related rows of the whole batch are read in one query"""
+        payload = [
+            {'site_name': f'Site {i}', 'site_type': 'cultural',
+             'ethnic_group': self.ethnic_group.id,
+             'latitude': '-24.653257', 'longitude': '25.906792'}
+            for i in range(20)
+        ]
+
+        # relations, then insert inside a savepoint
+        with self.assertNumQueries(4):
+            res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        site = Site.objects.get(id=res.data[0]['id'])
+        self.assertEqual(site.ethnic_group, self.ethnic_group)
+        self.assertEqual(
+            site.geohash, geohash_encode(-24.653257, 25.906792))
+
+    def test_bulk_create_unknown_relation(self):
+        """Test an unknown related id is reported for its item"""
+        payload = [
+            {'site_name': 'Site', 'site_type': 'cultural',
+             'ethnic_group': self.ethnic_group.id + 100},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ethnic_group', res.data['errors'][0])
+
+    def test_bulk_update_moves_geohash(self):
+        """Test moving sites in bulk recomputes their geohash"""
+        site = Site.objects.create(
+            user=self.user, site_name='Tsodilo', site_type='cultural',
+            latitude=None, longitude=None)
+
+        res = self.client.patch(BULK_URL, [
+            {'id': site.id, 'latitude': '-18.75', 'longitude': '21.7333'},
+        ], format='json')
+        site.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(site.geohash, '')
@@ -1,31 +1,205 @@
 """
 View for sites
 """
+from django.db.models import Avg, Count
+from django.db.models.functions import Substr
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from core.authentication import CachedTokenAuthentication
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from sites import serializers
-from core.models import Site
+from culture.serializers import CultureSerializer
+from ethnic_group.serializers import EthnicGroupSerializer
+from core.bulk import BulkMixin
+from core.cache import CachedListMixin
+from core.choices import SITE_TYPE
+from core.conditional import ConditionalMixin
+from core.dynamic_fields import DynamicFieldsMixin
+from core.export import ExportMixin
+from core.lean import LeanListMixin
+from core.geo import within_bbox, within_radius, zoom_to_precision
+from core.models import Culture, EthnicGroup, Site, SiteImages, Tag
+from core.query_plans import QueryPlanMixin
 
+from drf_spectacular.utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes,
+)
 
-class SiteViewSet(viewsets.ModelViewSet):
+# radius used by ?near= and the largest one accepted, about half the
+# earth's circumference
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 20000
+# web map zoom levels accepted by the clusters action
+MAX_ZOOM = 22
+# most clusters returned, the largest first
+MAX_CLUSTERS = 1000
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'bbox',
+                OpenApiTypes.STR,
+                description='Bounding box to filter by as '
+                            'min_lng,min_lat,max_lng,max_lat'
+            ),
+            OpenApiParameter(
+                'near',
+                OpenApiTypes.STR,
+                description='Point to filter around as lat,lng'
+            ),
+            OpenApiParameter(
+                'radius_km',
+                OpenApiTypes.NUMBER,
+                description='Radius around near in kilometres (default 10)'
+            ),
+            OpenApiParameter(
+                'site_type',
+                OpenApiTypes.STR,
+                enum=[value for value, _label in SITE_TYPE],
+                description='Filter by site type'
+            ),
+        ]
+    ),
+    clusters=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'zoom',
+                OpenApiTypes.INT,
+                required=True,
+                description=f'Map zoom level between 0 and {MAX_ZOOM}'
+            ),
+            OpenApiParameter(
+                'bbox',
+                OpenApiTypes.STR,
+                description='Bounding box to cluster as '
+                            'min_lng,min_lat,max_lng,max_lat'
+            ),
+        ],
+        responses=serializers.SiteClusterSerializer(many=True),
+    ),
+)
+class SiteViewSet(CachedListMixin,
+                  ConditionalMixin,
+                  QueryPlanMixin,
+                  DynamicFieldsMixin,
+                  LeanListMixin,
+                  ExportMixin,
+                  BulkMixin,
+                  viewsets.ModelViewSet):
     """View for managing sites"""
+    cache_models = [Site, SiteImages, Culture, EthnicGroup, Tag]
+    bulk_derived_fields = ['geohash']
     serializer_class = serializers.SiteDetailsSerializer
+    expandable_fields = {
+        'culture': CultureSerializer,
+        'ethnic_group': EthnicGroupSerializer,
+    }
     queryset = Site.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def _params_to_floats(self, name, count):
+        """Convert a comma separated query param to count floats."""
+        try:
+            values = [
+                float(x) for x in self.request.query_params[name].split(',')
+            ]
+        except ValueError:
+            values = []
+
+        if len(values) != count:
+            raise ValidationError(
+                {name: f'Expected {count} comma separated numbers.'})
+
+        return values
+
+    def _check_point(self, name, latitude, longitude):
+        """Reject coordinates outside the valid range."""
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({name: 'Coordinates are out of range.'})
+
     def get_queryset(self):
         """Return site objects"""
-        return self.queryset.order_by('-id')
+        queryset = self.queryset
+        params = self.request.query_params
+
+        if params.get('site_type'):
+            queryset = queryset.filter(site_type=params['site_type'])
+
+        if 'bbox' in params:
+            min_lng, min_lat, max_lng, max_lat = self._params_to_floats(
+                'bbox', 4)
+            self._check_point('bbox', min_lat, min_lng)
+            self._check_point('bbox', max_lat, max_lng)
+            queryset = within_bbox(
+                queryset, min_lat, min_lng, max_lat, max_lng)
+
+        if 'near' in params:
+            latitude, longitude = self._params_to_floats('near', 2)
+            self._check_point('near', latitude, longitude)
+            radius_km = DEFAULT_RADIUS_KM
+            if 'radius_km' in params:
+                radius_km = self._params_to_floats('radius_km', 1)[0]
+            if not 0 < radius_km <= MAX_RADIUS_KM:
+                raise ValidationError(
+                    {'radius_km': f'Must be between 0 and {MAX_RADIUS_KM}.'})
+            queryset = within_radius(
+                queryset, latitude, longitude, radius_km)
+
+        return self.plan_queryset(queryset.order_by('-id'))
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
         if self.action == 'list':
             return serializers.SiteSerializer
+        elif self.action == 'clusters':
+            return serializers.SiteClusterSerializer
+        elif self.action in ('bulk_create', 'bulk_update'):
+            return serializers.SiteBulkSerializer
 
         return self.serializer_class
 
+    @action(methods=['GET'], detail=False, url_path='clusters')
+    def clusters(self, request):
+        """
+        Return site counts and centroids per grid cell for a map view.
+
+        Cells are geohash prefixes whose length follows the zoom level, so
+        the grouping runs on the indexed geohash column in one query.
+        """
+        try:
+            zoom = int(request.query_params['zoom'])
+        except (KeyError, ValueError):
+            zoom = None
+        if zoom is None or not 0 <= zoom <= MAX_ZOOM:
+            raise ValidationError(
+                {'zoom': f'Must be an integer between 0 and {MAX_ZOOM}.'})
+
+        precision = zoom_to_precision(zoom)
+        cells = self.filter_queryset(self.get_queryset()).exclude(
+            geohash=''
+        ).annotate(
+            cell=Substr('geohash', 1, precision)
+        ).values('cell').annotate(
+            count=Count('id'),
+            latitude=Avg('latitude'),
+            longitude=Avg('longitude'),
+        ).order_by('-count', 'cell')[:MAX_CLUSTERS]
+
+        serializer = self.get_serializer(cells, many=True)
+        return Response(serializer.data)
+
+    def prepare_bulk_instance(self, instance):
+        """Compute the geohash Site.save would set."""
+        instance.update_geohash()
+
     def perform_create(self, serializer):
         """Create a new site"""
         serializer.save(user=self.request.user)
@@ -3,11 +3,11 @@ Views for the user API.
 """
 from rest_framework import (
     generics,
-    authentication,
     permissions)
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
+from core.authentication import CachedTokenAuthentication
 from user.serializers import UserSerializer, AuthTokenSerializer
 
 
@@ -29,7 +29,7 @@ class ManageProfileView(generics.RetrieveUpdateAPIView):
     """Manage to authenticated user."""
 
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):